@@ -1,8 +1,10 @@
 import cffi
-import collections
 from functools import partial
 import logging
 import os
+import time
+
+import numpy as np
 
 from qcodes.instrument.base import Instrument
 from qcodes.utils import validators as vals
@@ -45,7 +47,8 @@ class Advantech_PCIE_1751(Instrument):
 
     Current version of this driver implements only instant digital input and
     output. Buffered input and output, interrupts and counters are not
-    implemented.
+    implemented. Digital patterns can be output with software timing using
+    write_pattern.
 
     Tested with driver version 3.1.10.0 and ddl version 3.1.12.1.
     """
@@ -61,7 +64,7 @@ class Advantech_PCIE_1751(Instrument):
         header_file = os.path.join(package_directory, '_bdaqctrl.h')
         with open(header_file) as h:
             self.ffi.cdef(h.read())
-        self.dll = self.ffi.dlopen("biodaq.dll")
+        self.dll = self._get_dll()
 
         # create the digital input and output devices
         self.info = self.ffi.new("DeviceInformation *")
@@ -75,6 +78,10 @@ class Advantech_PCIE_1751(Instrument):
         self.do = self.dll.AdxInstantDoCtrlCreate()
         self.check(self.dll.InstantDoCtrl_setSelectedDevice(self.do, self.info))
 
+        # buffers reused for every port read and write
+        self._di_buffer = self.ffi.new('uint8[]', self.port_count())
+        self._do_buffer = self.ffi.new('uint8[]', self.port_count())
+
         # Create QCoDeS parameters
         for i in range(self.port_count()):
             self.add_parameter(
@@ -102,29 +109,107 @@ class Advantech_PCIE_1751(Instrument):
         For n=1 returns a single integer which encodes the 8 bit values,
         for n>1 returns a list of integers.
         """
-        values = self.ffi.new('uint8[]', n)
-        self.check(self.dll.InstantDiCtrl_ReadAny(self.di, i, n, values))
+        self._check_ports(i, n)
+        self.check(self.dll.InstantDiCtrl_ReadAny(self.di, i, n,
+                                                  self._di_buffer))
         if n == 1:
-            return values[0]
+            return self._di_buffer[0]
         else:
-            return list(values)
+            return self.ffi.unpack(self._di_buffer, n)
+
+    def read_output_port(self, i, n=1):
+        """
+        Reads back the values last written to the output ports i, ..., i+n-1
+        and returns them as a uint8 array.
+        """
+        self._check_ports(i, n)
+        self.check(self.dll.InstantDoCtrl_ReadAny(self.do, i, n,
+                                                  self._do_buffer))
+        return np.frombuffer(self.ffi.buffer(self._do_buffer, n),
+                             dtype=np.uint8).copy()
 
-    def write_port(self, i, value):
+    def write_port(self, i, value, mask=None):
         """
         Writes values to output ports. If value is an integer, writes its
         binary representation to the pins of port i. If value is a list of
         integers, writes the binary representations of their values to the pins
         of ports i, ..., i+len(value)-1 respectively.
+
+        If a bit mask is given (an integer or one integer per port), only the
+        pins whose bit is set in the mask are changed, the other pins keep the
+        values they were last set to.
         """
-        if isinstance(value, collections.abc.Iterable):
-            vallist = list(value)
-        else:
-            vallist = [value]
-        data = self.ffi.new('uint8[]', vallist)
-        log.debug('PCIE-1751: Write({}, {}, {})'.format(i, len(vallist),
-                                                        vallist))
-        self.check(self.dll.InstantDoCtrl_WriteAny(self.do, i, len(vallist),
-                                                   data))
+        data = self._to_pattern(value).ravel()
+        self._check_ports(i, data.size)
+        if mask is not None:
+            data = self._apply_mask(data, mask,
+                                    self.read_output_port(i, data.size))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('PCIE-1751: Write({}, {}, {})'.format(i, data.size,
+                                                            data.tolist()))
+        self.ffi.memmove(self._do_buffer, data, data.size)
+        self.check(self.dll.InstantDoCtrl_WriteAny(self.do, i, data.size,
+                                                   self._do_buffer))
+
+    def write_pattern(self, pattern, port=0, mask=None, sample_period=None):
+        """
+        Writes a digital pattern to the output ports port, ..., port+n_ports-1.
+
+        Args:
+            pattern: Array of shape (n_samples, n_ports) with the 8 bit values
+                of the ports for every sample. A one dimensional array is
+                written to a single port.
+            port: First port to write.
+            mask: Bit mask (an integer or one integer per port) of the pins
+                driven by the pattern. The other pins keep the values they had
+                before the pattern was started.
+            sample_period: Time in s between the samples. The samples are
+                written as fast as possible if not given.
+
+        Returns:
+            Dictionary with the number of samples, the duration in s and the
+            sample rate in 1/s of the playback. For a timed playback it also
+            contains the mean, standard deviation and maximum of the delay of
+            the writes with respect to their scheduled times in s, and the
+            number of samples that were late by more than a sample period.
+        """
+        pattern = self._to_pattern(pattern)
+        if pattern.ndim == 1:
+            pattern = pattern[:, np.newaxis]
+        n_samples, n_ports = pattern.shape
+        self._check_ports(port, n_ports)
+        if mask is not None:
+            pattern = self._apply_mask(pattern, mask,
+                                       self.read_output_port(port, n_ports))
+        pattern = np.ascontiguousarray(pattern)
+
+        # write directly from the memory of the pattern
+        data = self.ffi.from_buffer('uint8[]', pattern)
+        write_any = self.dll.InstantDoCtrl_WriteAny
+        errorcode = success = self.dll.Success
+        t_write = np.empty(n_samples)
+        t_start = time.perf_counter()
+        for k in range(n_samples):
+            if sample_period is not None:
+                self._wait_until(t_start + k * sample_period)
+            t_write[k] = time.perf_counter()
+            errorcode = write_any(self.do, port, n_ports, data + k * n_ports)
+            if errorcode != success:
+                break
+        duration = time.perf_counter() - t_start
+        self.check(errorcode)
+
+        statistics = {'samples': n_samples,
+                      'duration': duration,
+                      'rate': n_samples / duration if duration > 0 else np.inf}
+        if sample_period is not None:
+            jitter = t_write - (t_start + sample_period * np.arange(n_samples))
+            statistics.update({'mean_jitter': float(jitter.mean()),
+                               'std_jitter': float(jitter.std()),
+                               'max_jitter': float(jitter.max()),
+                               'late': int(np.count_nonzero(
+                                   jitter > sample_period))})
+        return statistics
 
     def read_pin(self, port, pin):
         """
@@ -147,6 +232,56 @@ class Advantech_PCIE_1751(Instrument):
         """
         return self.dll.InstantDoCtrl_getPortCount(self.do)
 
+    # time in s before a deadline after which write_pattern stops sleeping
+    # and polls the clock instead
+    _spin_time = 2e-3
+
+    def _wait_until(self, deadline):
+        """
+        Waits until time.perf_counter() reaches deadline.
+        """
+        remaining = deadline - time.perf_counter()
+        if remaining > self._spin_time:
+            time.sleep(remaining - self._spin_time)
+        while time.perf_counter() < deadline:
+            pass
+
+    def _check_ports(self, i, n):
+        """
+        Raises a ValueError if the ports i, ..., i+n-1 do not exist.
+        """
+        port_count = len(self._do_buffer)
+        if i < 0 or i + n > port_count:
+            raise ValueError('Ports {} to {} exceed the {} ports of the '
+                             'device.'.format(i, i + n - 1, port_count))
+
+    @staticmethod
+    def _to_pattern(value):
+        """
+        Converts an integer or an array of integers to a uint8 array.
+        """
+        data = np.asarray(value)
+        if data.dtype != np.uint8:
+            if np.any((data < 0) | (data > 0xff)):
+                raise ValueError('Port values have to be in the range 0 to '
+                                 '255.')
+            data = data.astype(np.uint8)
+        return np.atleast_1d(data)
+
+    @staticmethod
+    def _apply_mask(data, mask, current):
+        """
+        Returns data for the pins set in mask and current for the others.
+        """
+        mask = Advantech_PCIE_1751._to_pattern(mask)
+        return (data & mask) | (current & ~mask)
+
+    def _get_dll(self):
+        """
+        Loads the DAQNavi library.
+        """
+        return self.ffi.dlopen("biodaq.dll")
+
     def check(self, errorcode):
         """
         Checks the errorcode and raises an Exception if error occurred.
@@ -1,9 +1,10 @@
 import os, sys
 from typing import Dict, List, Optional, Tuple, Any
 from qcodes import Instrument, Parameter
-from qcodes.utils.validators import Ints
+from qcodes.utils.validators import Arrays, Ints
 from qcodes.utils.helpers import create_on_off_val_mapping
 import ctypes
+import numpy as np
 
 
 class atmcd64d:
@@ -21,6 +22,12 @@ class atmcd64d:
 
     """
 
+    # status code while an acquisition is running
+    DRV_ACQUIRING = 20072
+
+    # buffer for GetAcquiredData, reused as long as it is large enough
+    _c_data: Optional[ctypes.Array] = None
+
     # default dll path
     _dll_path = 'C:\\Program Files\\Andor SDK\\atmcd64d.dll'
 
@@ -79,15 +86,16 @@ class atmcd64d:
         code = self.dll.CoolerON()
         self.error_check(code, 'CoolerON')
 
-    def get_acquired_data(self, size) -> List[int]:
-        c_data_array = ctypes.c_int * size
-        c_data = c_data_array()
-        code = self.dll.GetAcquiredData(ctypes.pointer(c_data), size)
+    def get_acquired_data(self, size) -> np.ndarray:
+        """
+        Returns the data of the last acquisition as a view on a buffer that is
+        reused by the next call, copy it to keep it.
+        """
+        if self._c_data is None or len(self._c_data) < size:
+            self._c_data = (ctypes.c_int * size)()
+        code = self.dll.GetAcquiredData(self._c_data, size)
         self.error_check(code, 'GetAcquiredData')
-        acquired_data = []
-        for i in range(len(c_data)):
-            acquired_data.append(c_data[i])
-        return acquired_data
+        return np.frombuffer(self._c_data, dtype=np.intc, count=size)
 
     def get_acquisition_timings(self) -> Tuple[float, float, float]:
         c_exposure = ctypes.c_float()
@@ -191,6 +199,11 @@ class atmcd64d:
         code = self.dll.SetExposureTime(c_time)
         self.error_check(code, 'SetExposureTime')
 
+    def set_kinetic_cycle_time(self, cycle_time: float) -> None:
+        c_cycle_time = ctypes.c_float(cycle_time)
+        code = self.dll.SetKineticCycleTime(c_cycle_time)
+        self.error_check(code, 'SetKineticCycleTime')
+
     def set_filter_mode(self, mode: int) -> None:
         c_mode = ctypes.c_int(mode)
         code = self.dll.SetFilterMode(c_mode)
@@ -201,6 +214,11 @@ class atmcd64d:
         code = self.dll.SetNumberAccumulations(c_number)
         self.error_check(code, 'SetNumberAccumulations')
 
+    def set_number_kinetics(self, number: int) -> None:
+        c_number = ctypes.c_int(number)
+        code = self.dll.SetNumberKinetics(c_number)
+        self.error_check(code, 'SetNumberKinetics')
+
     def set_read_mode(self, mode: int) -> None:
         code = self.dll.SetReadMode(mode)
         self.error_check(code, 'SetReadMode')
@@ -239,7 +257,7 @@ class atmcd64d:
 class Spectrum(Parameter):
     """
     Parameter class for a spectrum taken with an Andor CCD.
-    The spectrum is saved in a list with the length being set by the number of pixels on the CCD.
+    The spectrum is saved in an array with the length being set by the number of pixels on the CCD.
 
     Args:
         name: Parameter name.
@@ -249,9 +267,12 @@ class Spectrum(Parameter):
         super().__init__(name, instrument=instrument, **kwargs)
         self.ccd = instrument
 
-    def get_raw(self) -> List[int]:
+    def get_raw(self) -> np.ndarray:
         # get acquisition mode
         acquisition_mode = self.ccd.acquisition_mode.get()
+        if acquisition_mode == 'kinetic series':
+            raise RuntimeError("use the kinetic_series parameter in "
+                               "'kinetic series' acquisition mode")
 
         # start acquisition
         self.ccd.atmcd64d.start_acquisition()
@@ -266,7 +287,39 @@ class Spectrum(Parameter):
                 self.ccd.atmcd64d.wait_for_acquisition()
 
         # get and return spectrum
-        return self.ccd.atmcd64d.get_acquired_data(self.ccd.x_pixels)
+        return self.ccd.atmcd64d.get_acquired_data(self.ccd.x_pixels).copy()
+
+    def set_raw(self, value):
+        raise NotImplementedError()
+
+
+class KineticSeries(Parameter):
+    """
+    Parameter class for a kinetic series of spectra taken with an Andor CCD.
+    All spectra of the series are read from the CCD in a single transfer
+    once the series is complete.
+
+    Args:
+        name: Parameter name.
+    """
+
+    def __init__(self, name: str, instrument: "Andor_DU401", **kwargs):
+        super().__init__(name, instrument=instrument, **kwargs)
+        self.ccd = instrument
+
+    def get_raw(self) -> np.ndarray:
+        if self.ccd.acquisition_mode.get() != 'kinetic series':
+            raise RuntimeError("acquisition mode must be 'kinetic series'")
+        number_kinetics = self.ccd.number_kinetics.get()
+
+        # start acquisition and wait for each spectrum of the series
+        self.ccd.atmcd64d.start_acquisition()
+        for i in range(number_kinetics):
+            self.ccd.atmcd64d.wait_for_acquisition()
+
+        # get all spectra at once and return them as (frames, pixels)
+        data = self.ccd.atmcd64d.get_acquired_data(number_kinetics * self.ccd.x_pixels)
+        return data.reshape(number_kinetics, self.ccd.x_pixels).copy()
 
     def set_raw(self, value):
         raise NotImplementedError()
@@ -327,7 +380,8 @@ class Andor_DU401(Instrument):
                            set_cmd=self.atmcd64d.set_acquisition_mode,
                            val_mapping={
                                'single scan': 1,
-                               'accumulate': 2
+                               'accumulate': 2,
+                               'kinetic series': 3
                            },
                            label='acquisition mode')
 
@@ -350,10 +404,23 @@ class Andor_DU401(Instrument):
                            val_mapping=create_on_off_val_mapping(on_val=2, off_val=0),
                            label='filter mode')
 
+        self.add_parameter('kinetic_cycle_time',
+                           get_cmd=self.atmcd64d.get_acquisition_timings,
+                           set_cmd=self.atmcd64d.set_kinetic_cycle_time,
+                           get_parser=lambda ans: float(ans[2]),
+                           unit='s',
+                           label='kinetic cycle time')
+
         self.add_parameter('number_accumulations',
                            set_cmd=self.atmcd64d.set_number_accumulations,
                            label='number accumulations')
 
+        # the shape of kinetic_series depends on it, so it is always set
+        self.add_parameter('number_kinetics',
+                           set_cmd=self.atmcd64d.set_number_kinetics,
+                           initial_value=1,
+                           label='number kinetics')
+
         self.add_parameter('read_mode',
                            set_cmd=self.atmcd64d.set_read_mode,
                            val_mapping={'full vertical binning': 0})
@@ -376,9 +443,14 @@ class Andor_DU401(Instrument):
 
         self.add_parameter('spectrum',
                            parameter_class=Spectrum,
-                           shape=(1, self.x_pixels),
+                           vals=Arrays(shape=(self.x_pixels,)),
                            label='spectrum')
 
+        self.add_parameter('kinetic_series',
+                           parameter_class=KineticSeries,
+                           vals=Arrays(shape=(self.number_kinetics.get_latest, self.x_pixels)),
+                           label='kinetic series')
+
         self.add_parameter('temperature',
                            get_cmd=self.atmcd64d.get_temperature,
                            unit=u"\u00b0"+'C',
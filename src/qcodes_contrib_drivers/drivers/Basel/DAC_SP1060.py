@@ -17,9 +17,10 @@ dac.ramphelper(start=0, stop=1, period=0.3, channel=1, cycles=2) # perform two r
 """
 
 
+import math
 import time
 import pyvisa as visa
-from typing import Sequence, Any
+from typing import Sequence, Mapping, List, Any
 from qcodes import VisaInstrument, InstrumentChannel, ChannelList
 from qcodes.instrument.channel import MultiChannelInstrumentParameter
 from qcodes.utils import validators as vals
@@ -656,7 +657,8 @@ class AWG(InstrumentChannel, SP1060Reader):
         chan = self.parent.channels[awg_num - 1]
         if input == 'START':
             chan.volt.cache._update_with(value=None, raw_value=None)
-            time.sleep(0.2) # HACK: needed in practice before playing a waveform
+            # the wave memory may still be written to the AWG memory
+            self.parent.wait_idle(f'C WAV-{self._arbitrary_generator} BUSY?')
 
         return self.write(f'C AWG-{self._arbitrary_generator} {input}')
 
@@ -1239,16 +1241,35 @@ class WAV(InstrumentChannel, SP1060Reader):
         """
         self.write(f'C WAV-{self._wave_mem} SAVE')
 
-    def toawg(self):
+    def toawg(self, wait=True):
         """
         Command to copy the selected wave memory to the
         corresponding AWG memory (eg WAV-A --> AWG-A)
         and thus this command cannot be used on WAV-S
 
         Args:
-            N/A
+            wait: Poll the busy flag until the copy is done
         """
         self.write(f'C WAV-{self._wave_mem} WRITE')
+        if wait:
+            self.parent.wait_idle(f'C WAV-{self._wave_mem} BUSY?')
+
+    def upload(self, voltages, start_address=0):
+        """
+        Command to write voltages to the wave memory,
+        see SP1060.upload_memory
+
+        Args:
+            voltages: Voltages in V, one per address
+            start_address: Address of the first voltage
+
+        Returns:
+            The upload statistics
+        """
+        mem = self._wave_mem
+        return self.parent.upload_memory(
+            [f'WAV-{mem} {start_address + n:X} {float(volt):.6f}'
+             for n, volt in enumerate(voltages)])
 
 
 
@@ -1362,6 +1383,15 @@ class SP1060(VisaInstrument, SP1060Reader):
     [[[add onto this?]]]
     """
     
+    # maximum number of commands sent by write_batch before reading replies
+    pipeline_depth = 32
+    # commands per batch of upload_memory, tuned during each upload
+    upload_chunk_size = 32
+    max_upload_chunk_size = 1024
+    # intervals of wait_idle, doubled after every busy reply
+    min_poll_interval = 1e-3
+    max_poll_interval = 0.1
+
     def __init__(self, name, address, min_val=-10, max_val=10, baud_rate=115200, 
                  voltage_post_delay=0.02, voltage_step=0.01, num_chans=24,**kwargs):
         """
@@ -1389,6 +1419,13 @@ class SP1060(VisaInstrument, SP1060Reader):
         handle.write_termination = '\r\n'
         handle.read_termination = '\r\n'
 
+        # set when replies may be left in the buffer, e.g. after a timeout
+        self._clear_pending = True
+        # statistics of the last upload_memory, and the time slept in
+        # wait_idle since the instrument was created
+        self.upload_statistics = {}
+        self.wait_time = 0.0
+
 
         """
         Define channels in qcodes corresponding to the channels
@@ -1612,8 +1649,42 @@ class SP1060(VisaInstrument, SP1060Reader):
         """
         Set all dac channels to a specific voltage.
         """
-        for chan in self.channels:
-            chan.volt.set(volt)
+        self.set_voltages({chan._channel: volt for chan in self.channels})
+
+    def set_voltages(self, voltages: Mapping[int, float]):
+        """
+        Set several dac channels at once.
+
+        The channels are stepped together, no channel changes by more than
+        its voltage step per step, and the post delay is waited once per
+        step. The commands of each step are sent with write_batch.
+
+        Args:
+            voltages: Voltage per channel number.
+        """
+        if not voltages:
+            return
+        # not the attributes, add_parameter returns None for qcodes < 0.45
+        params = {chan._channel: chan.parameters['volt']
+                  for chan in self.channels}
+        starts = {}
+        n_steps = 1
+        for ch, volt in voltages.items():
+            param = params[ch]
+            param.validate(volt)
+            starts[ch] = param.get_latest()
+            if param.step:
+                n_steps = max(n_steps,
+                              math.ceil(abs(volt - starts[ch]) / param.step))
+
+        for n in range(1, n_steps + 1):
+            step_voltages = {ch: starts[ch] + (volt - starts[ch]) * n / n_steps
+                             for ch, volt in voltages.items()}
+            self.write_batch(['{:0} {:X}'.format(ch, self._vval_to_dacval(volt))
+                              for ch, volt in step_voltages.items()])
+            for ch, volt in step_voltages.items():
+                params[ch].cache.set(volt)
+            time.sleep(max(params[ch].post_delay for ch in voltages))
     
     def query_all(self):
         """
@@ -1643,17 +1714,141 @@ class SP1060(VisaInstrument, SP1060Reader):
        #     print(self.visa_handle.read_raw())
        #      self.visa_handle.read_raw()
        #     print("... done")
-        self.visa_handle.clear() 
+        if self.visabackend != 'sim':
+            self.visa_handle.clear()
+        self._clear_pending = False
           
     def write(self, cmd):
         """
         Since there is always a return code from the instrument, we use ask instead of write
         TODO: interpret the return code (0: no error)
         """
-        # make sure there is nothing in the buffer
-        self.empty_buffer()  
-        
-        return self.ask(cmd)
+        # the buffer is only cleared if a previous reply may be unread
+        if self._clear_pending:
+            self.empty_buffer()
+
+        self._clear_pending = True
+        reply = self.ask(cmd)
+        self._clear_pending = False
+        return reply
+
+    def wait_idle(self, query, timeout=10.0):
+        """
+        Poll a busy flag until the device replies 0 (idle).
+
+        The flag is polled immediately, then with intervals doubling from
+        min_poll_interval up to max_poll_interval.
+
+        Args:
+            query: The busy query, e.g. 'C WAV-A BUSY?'
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            The time slept in seconds
+        """
+        waited = 0.0
+        interval = self.min_poll_interval
+        t_start = time.perf_counter()
+        while self.write(query).strip() != '0':
+            if time.perf_counter() - t_start > timeout:
+                raise SP1060Exception(f'Still busy after {timeout} s: {query}')
+            time.sleep(interval)
+            waited += interval
+            interval = min(2 * interval, self.max_poll_interval)
+        self.wait_time += waited
+        return waited
+
+    def upload_memory(self, cmds: Sequence[str]):
+        """
+        Write a block of memory commands, e.g. 'WAV-A 1F 1.500000'.
+
+        The commands are sent with write_batch in chunks. The chunk size
+        starts at upload_chunk_size and is doubled while the throughput
+        improves, up to max_upload_chunk_size. If a chunk times out, e.g.
+        because the input buffer of the device overflowed, the chunk size
+        is halved and the chunk is sent again. The final chunk size is kept
+        for the next upload.
+
+        Returns:
+            Statistics of the upload, also stored in upload_statistics:
+            samples, duration [s], samples_per_s, chunk_size and
+            wait_time [s], the time slept while waiting for the device
+        """
+        chunk_size = self.upload_chunk_size
+        best_rate = 0.0
+        retries = 0
+        position = 0
+        wait_time = self.wait_time
+        t_start = time.perf_counter()
+        while position < len(cmds):
+            chunk = cmds[position:position + chunk_size]
+            t_chunk = time.perf_counter()
+            try:
+                self.write_batch(chunk, depth=chunk_size)
+            except visa.errors.VisaIOError:
+                if chunk_size == 1:
+                    raise
+                chunk_size //= 2
+                retries += 1
+                continue
+            position += len(chunk)
+
+            rate = len(chunk) / max(time.perf_counter() - t_chunk, 1e-9)
+            if (len(chunk) == chunk_size and rate > 1.05 * best_rate
+                    and not retries
+                    and 2 * chunk_size <= self.max_upload_chunk_size):
+                chunk_size *= 2
+            best_rate = max(best_rate, rate)
+        duration = time.perf_counter() - t_start
+
+        self.upload_chunk_size = chunk_size
+        self.upload_statistics = {
+            'samples': len(cmds),
+            'duration': duration,
+            'samples_per_s': len(cmds) / duration if duration else 0.0,
+            'chunk_size': chunk_size,
+            'retries': retries,
+            'wait_time': self.wait_time - wait_time,
+        }
+        return self.upload_statistics
+
+    def write_batch(self, cmds: Sequence[str], depth=None) -> List[str]:
+        """
+        Send several commands without waiting for each reply.
+
+        Up to ``pipeline_depth`` commands are sent in one write, then their
+        replies are read. The buffer is only cleared after a failed
+        exchange.
+
+        Args:
+            cmds: Commands, e.g. '1 800000'.
+            depth: Commands per write, defaults to pipeline_depth.
+
+        Returns:
+            The replies in the order of the commands.
+
+        Raises:
+            SP1060Exception: If a set command is not acknowledged with 0.
+        """
+        if self._clear_pending:
+            self.empty_buffer()
+
+        depth = depth or self.pipeline_depth
+        replies: List[str] = []
+        self._clear_pending = True
+        for start in range(0, len(cmds), depth):
+            chunk = cmds[start:start + depth]
+            self.visa_log.debug(f"Writing: {chunk}")
+            self.visa_handle.write('\r\n'.join(chunk))
+            replies.extend(self.visa_handle.read() for _ in chunk)
+        self._clear_pending = False
+
+        errors = [f'{cmd!r}: {reply!r}' for cmd, reply in zip(cmds, replies)
+                  if '?' not in cmd and reply.strip() != '0']
+        if errors:
+            raise SP1060Exception('Commands not acknowledged: '
+                                  + ', '.join(errors))
+        return replies
     
     def get_serial(self):
         """
@@ -1725,32 +1920,21 @@ class SP1060(VisaInstrument, SP1060Reader):
         elif (wavemem == '3'):
             memsave = 'D'
 
-        sleep_time = 0.02
-
+        # every command is acknowledged when the device is ready for the next
         self.write('C WAV-B CLR') # Wave-Memory Clear.
-        time.sleep(sleep_time)
         self.write('C SWG MODE 0') # generate new Waveform.
-        time.sleep(sleep_time)
         self.write('C SWG WF ' + waveform) # set the waveform.
-        time.sleep(sleep_time)
         self.write('C SWG DF ' + frequency) # set frequency.
-        time.sleep(sleep_time)
         self.write('C SWG AMP ' + amplitude) # set the amplitude.
-        time.sleep(sleep_time)
         self.write('C SWG WMEM ' + wavemem) # set the Wave-Memory.
-        time.sleep(sleep_time)
         self.write('C SWG WFUN 0') # COPY to Wave-MEM -> Overwrite.
-        time.sleep(sleep_time)
         self.write('C SWG LIN ' + channel) # COPY to Wave-MEM -> Overwrite.
-        time.sleep(sleep_time)
         self.write('C AWG-' + memsave + ' CH ' + channel) # Write the Selected DAC-Channel for the AWG.
-        time.sleep(sleep_time)
         self.write('C SWG APPLY') # Apply Wave-Function to Wave-Memory Now.
-        time.sleep(sleep_time)
+        time.sleep(0.2) # HACK: no busy flag while the wave memory is filled
         self.write('C WAV-' + memsave + ' SAVE') # Save the selected Wave-Memory (WAV-A/B/C/D) to the internal volatile memory.
-        time.sleep(sleep_time)
         self.write('C WAV-' + memsave + ' WRITE') # Write the Wave-Memory (WAV-A/B/C/D) to the corresponding AWG-Memory (AWG-A/B/C/D).
-        time.sleep(0.5)
+        self.wait_idle('C WAV-' + memsave + ' BUSY?')
         self.write('C AWG-' + memsave + ' START') # Apply Wave-Function to Wave-Memory Now.
 
     def set_bandwidth(self, chan, code):
@@ -4,7 +4,7 @@
 import logging
 import numpy as np
 import cmath, math
-from typing import Tuple, Any
+from typing import List, Optional, Sequence, Tuple, Any
 
 from qcodes import VisaInstrument
 from qcodes.utils.validators import Numbers, Enum, Ints, Bool
@@ -16,6 +16,9 @@ from qcodes.instrument.parameter import (
     ParamRawDataType
 )
 
+from qcodes_contrib_drivers.drivers._ieee_block import (read_ieee_block,
+                                                        read_real32_blocks)
+
 log = logging.getLogger(__name__)
 
 class FrequencySweepMagPhase(MultiParameter):
@@ -101,11 +104,11 @@ class FrequencySweepMagPhase(MultiParameter):
         vna.write('CALC1:TRAC2:FORM PHASE')  # ensure correct format
 
 
-        logmag = vna.ask("CALC1:TRAC1:DATA:FDAT?")
-        logmag = np.fromstring(logmag, dtype=float, sep=',')[::2]
-        phase = vna.ask("CALC1:TRAC2:DATA:FDAT?")
-        phase = np.fromstring(phase, dtype=float, sep=',')[::2]
+        logmag, phase = vna._query_traces(["CALC1:TRAC1:DATA:FDAT?",
+                                           "CALC1:TRAC2:DATA:FDAT?"])
         vna.trigger_source('internal')
+        logmag = logmag[::2]
+        phase = phase[::2]
         return logmag, phase
 
 class PointMagPhase(MultiParameter):
@@ -432,11 +435,20 @@ class M5180(VisaInstrument):
 
         self.add_parameter(name='data_transfer_format',
                            label='Data format during transfer',
-                           get_parser=str,
-                           get_cmd='FORM:DATA?',
-                           set_cmd='FORM:DATA {}',
+                           get_cmd=self._get_data_transfer_format,
+                           set_cmd=self._set_data_transfer_format,
                            vals = Enum('ascii', 'real', 'real32'))
 
+        self.add_parameter(name='binary_transfer',
+                           label='Binary trace transfer',
+                           set_cmd=self._set_binary_transfer,
+                           initial_cache_value=False,
+                           vals=Bool(),
+                           docstring="Transfer traces as little endian 32 bit "
+                           "floats instead of ASCII text. The frequencies "
+                           "are always transferred with full precision. "
+                           "Kept in sync with data_transfer_format.")
+
         self.add_parameter(name='s11',
                            start=self.start(),
                            stop=self.stop(),
@@ -495,6 +507,9 @@ class M5180(VisaInstrument):
             "off if one wants to minimize overhead.",
         )
 
+        # frequencies of the sweep, see _get_frequencies
+        self._frequencies: Optional[np.ndarray] = None
+
         self.connect_message()
 
     def _set_start(self, val: float) -> None:
@@ -597,6 +612,116 @@ class M5180(VisaInstrument):
         """
         self.write('TRIG:SOUR '+trigger.upper())
 
+    def _set_binary_transfer(self, val: bool) -> None:
+        """Sets the format of the trace transfer.
+
+        Args:
+            val (bool): True for 32 bit floats, False for ASCII text.
+        """
+        self.data_transfer_format('real32' if val else 'ascii')
+
+    def _get_data_transfer_format(self) -> str:
+        """Gets the format of the trace transfer, and updates the
+        binary_transfer cache accordingly.
+
+        Returns:
+            str: 'ascii', 'real' or 'real32'
+        """
+        fmt = self.ask('FORM:DATA?').strip().lower()
+        if fmt.startswith('asc'):
+            fmt = 'ascii'
+        self.binary_transfer.cache.set(fmt != 'ascii')
+        return fmt
+
+    def _set_data_transfer_format(self, fmt: str) -> None:
+        """Sets the format of the trace transfer, and updates the
+        binary_transfer cache accordingly. Binary data is transferred in
+        little endian byte order.
+
+        Args:
+            fmt (str): 'ascii', 'real' or 'real32'
+        """
+        self.write(f'FORM:DATA {fmt.upper()}')
+        if fmt != 'ascii':
+            self.write('FORM:BORD SWAP')
+        self.binary_transfer.cache.set(fmt != 'ascii')
+
+    def _query_traces(self, queries: Sequence[str]) -> List[np.ndarray]:
+        """Sends the trace queries as one compound query and reads all
+        responses.
+
+        Args:
+            queries (Sequence[str]): trace queries, e.g.
+                "CALC1:TRAC1:DATA:FDAT?"
+
+        Returns:
+            List[np.ndarray]: one array per query
+        """
+        self.write(';:'.join(queries))
+        if self.binary_transfer.get_latest():
+            if self.data_transfer_format.get_latest() == 'real':
+                return [np.frombuffer(read_ieee_block(self.visa_handle),
+                                      dtype='<f8').copy()
+                        for _ in queries]
+            return read_real32_blocks(self.visa_handle, len(queries))
+        responses = self.visa_handle.read().rstrip().split(';')
+        return [np.fromstring(response, dtype=float, sep=',')
+                for response in responses]
+
+    def _get_frequencies(self) -> np.ndarray:
+        """Frequencies of the sweep. They are queried once per sweep
+        setting, as 64 bit floats in binary mode.
+
+        Returns:
+            np.ndarray: frequencies [Hz]
+        """
+        if self._frequencies is None:
+            if self.binary_transfer.get_latest():
+                fmt = self.data_transfer_format.get_latest().upper()
+                self.write('FORM:DATA REAL;:SENS1:FREQ:DATA?;'
+                           f':FORM:DATA {fmt}')
+                self._frequencies = np.frombuffer(
+                    read_ieee_block(self.visa_handle), dtype='<f8').copy()
+            else:
+                self._frequencies = np.fromstring(
+                    self.ask('SENS1:FREQ:DATA?'), dtype=float, sep=',')
+        return self._frequencies
+
+    def get_traces(self) -> np.ndarray:
+        """
+        Return the formatted data of all traces of the last sweep, read with
+        a single compound query.
+
+        Returns:
+            np.ndarray: structured array with the field "frequency" [Hz] and
+            one field per trace, e.g. "tr1_s21". Traces in smith or polar
+            format are complex.
+        """
+        count = self.nb_traces()
+        settings = self.ask(';:'.join(
+            [f'CALC1:PAR{i}:DEF?' for i in range(1, count + 1)]
+            + [f'CALC1:TRAC{i}:FORM?' for i in range(1, count + 1)]
+        )).split(';')
+        traces = self._query_traces(
+            [f'CALC1:TRAC{i}:DATA:FDAT?' for i in range(1, count + 1)])
+
+        complex_formats = ('SMIT', 'POL')
+        fields = [('frequency', 'float64')]
+        for i in range(count):
+            name = f'tr{i + 1}_{settings[i].strip().lower()}'
+            is_complex = settings[count + i].strip().upper().startswith(
+                complex_formats)
+            fields.append((name, 'complex128' if is_complex else 'float64'))
+
+        data = np.empty(traces[0].size // 2, dtype=fields)
+        data['frequency'] = self._get_frequencies()
+        for (name, dtype), trace in zip(fields[1:], traces):
+            if dtype == 'complex128':
+                data[name] = trace[0::2] + 1j*trace[1::2]
+            else:
+                data[name] = trace[0::2]
+        return data
+
     def get_s(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray,
                              np.ndarray, np.ndarray, np.ndarray, np.ndarray,
                              np.ndarray]:
@@ -623,23 +748,11 @@ class M5180(VisaInstrument):
         self.write('TRIG:SEQ:SING') # Trigger a single sweep
         self.ask('*OPC?') # Wait for measurement to complete
 
-        # Get data as string
-        freq_raw = self.ask("SENS1:FREQ:DATA?")
-        s11_raw = self.ask("CALC1:TRAC1:DATA:FDAT?")
-        s12_raw = self.ask("CALC1:TRAC2:DATA:FDAT?")
-        s21_raw = self.ask("CALC1:TRAC3:DATA:FDAT?")
-        s22_raw = self.ask("CALC1:TRAC4:DATA:FDAT?")
-
-        # Get data as numpy array
-        freq = np.fromstring(freq_raw, dtype=float, sep=',')
-        s11 = np.fromstring(s11_raw, dtype=float, sep=',')
-        s11 = s11[0::2] + 1j*s11[1::2]
-        s12 = np.fromstring(s12_raw, dtype=float, sep=',')
-        s12 = s12[0::2] + 1j*s12[1::2]
-        s21 = np.fromstring(s21_raw, dtype=float, sep=',')
-        s21 = s21[0::2] + 1j*s21[1::2]
-        s22 = np.fromstring(s22_raw, dtype=float, sep=',')
-        s22 = s22[0::2] + 1j*s22[1::2]
+        # Get all traces with one query
+        freq = self._get_frequencies()
+        s11, s12, s21, s22 = (
+            sxx[0::2] + 1j*sxx[1::2] for sxx in self._query_traces(
+                [f"CALC1:TRAC{i}:DATA:FDAT?" for i in range(1, 5)]))
 
         return (np.array(freq), self._db(s11), np.array(np.angle(s11)),
                                 self._db(s12), np.array(np.angle(s12)),
@@ -651,6 +764,7 @@ class M5180(VisaInstrument):
         Updates start, stop and npts of all trace parameters so that the
         setpoints and shape are updated for the sweep.
         """
+        self._frequencies = None
         start = self.start()
         stop = self.stop()
         npts = self.npts()
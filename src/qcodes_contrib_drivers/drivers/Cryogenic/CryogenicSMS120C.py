@@ -13,10 +13,16 @@ This magnet PS driver has been tested with FTDI chip drivers (USB to serial),
     accompanying the magnet. The SMS60C current_rating should be slightly below
     60, as indicated by its name. Examples of values for a 2T magnet using
     SMS60C are: coil_constant=0.0380136, current_rating=52.61
+
+Ramps can be run in the background with the ``ramp_controller`` of the
+instrument, see ``SMS120CRampController``.
 """
 
+from concurrent.futures import Future
+import math
 import re
 import logging
+import threading
 import time
 
 from qcodes.utils.validators import Numbers
@@ -68,13 +74,18 @@ class CryogenicSMS120C(VisaInstrument):
 
         super().__init__(name, address, terminator='\r\n', **kwargs)
 
+        # serializes the communication of the ramp controller thread with
+        # other instrument I/O
+        self._io_lock = threading.RLock()
+
         self.visa_handle.baud_rate = 9600
         self.visa_handle.parity = vi_const.Parity.none
         self.visa_handle.stop_bits = vi_const.StopBits.one
         self.visa_handle.data_bits = 8
         self.visa_handle.flow_control = 0
-        self.visa_handle.flush(vi_const.VI_READ_BUF_DISCARD |
-                               vi_const.VI_WRITE_BUF_DISCARD)  # keep for debugging
+        if self.visabackend != 'sim':  # not implemented by pyvisa-sim
+            self.visa_handle.flush(vi_const.VI_READ_BUF_DISCARD |
+                                   vi_const.VI_WRITE_BUF_DISCARD)  # keep for debugging
 
         idn = self.IDN.get()
         print(idn)
@@ -143,6 +154,7 @@ class CryogenicSMS120C(VisaInstrument):
                            get_cmd=self._get_pauseRamp,
                            val_mapping={False: 0, True: 1})
 
+        self.ramp_controller = SMS120CRampController(self)
 
     def get_idn(self):
         """
@@ -153,6 +165,19 @@ class CryogenicSMS120C(VisaInstrument):
 
         return dict(zip(('vendor', 'model', 'serial', 'firmware'), idparts))
 
+    def ask_raw(self, cmd):
+        with self._io_lock:
+            return super().ask_raw(cmd)
+
+    def write_raw(self, cmd):
+        with self._io_lock:
+            super().write_raw(cmd)
+
+    def close(self):
+        if hasattr(self, 'ramp_controller'):
+            self.ramp_controller.close()
+        super().close()
+
     def query(self, msg):
         """
         Message outputs do not follow the standard SCPI format,
@@ -268,7 +293,7 @@ class CryogenicSMS120C(VisaInstrument):
 
     # Get current magnetic field, returns a float (if unit is Tesla, otherwise raises an exception)
     def _get_field(self):
-        if self._get_unit() != 1:
+        if self.unit.get_latest() != 'TESLA':
             raise Exception('Controller is not in TESLA mode, switch to TESLA to get the field')
 
         _, value = self.query('GET OUTPUT')
@@ -470,38 +495,183 @@ class CryogenicSMS120C(VisaInstrument):
             # Check that field is not outside max.field limit
             if (self._get_unit() == 1 and (val <= self._get_maxField())) or (
                     self._get_unit() == 0 and (val <= self._current_rating)):
-                # pause the controller if it is currently ramping
-                self._set_pauseRamp(1)
-                self.ask('SET MID %0.2f' % val)       # Set target field
-                self._set_pauseRamp(0)               # Unpause the controller
-                # Ramp magnet/field to MID or ZERO (Note: Using standard write
-                # as read returns an error/is non-existent).
-                if val == 0:
-                    self.write('RAMP ZERO')
-                    log.info('Ramping magnetic field to zero...')
-                else:
-                    self.write('RAMP MID')
-                    log.info('Ramping magnetic field...')
+                self._start_ramp(val)
             else:
                 log.error(
                     'Target field is outside max. limits, please lower the target value.')
         else:
             log.error('Cannot set field - check magnet status.')
 
-    def _set_field_bidirectional(self, val):
-        polarity = self._get_polarity()
-        desired_polarity = '-' if val < 0 else '+'
-
-        if ((polarity == '+' and desired_polarity == '-') or
-                (polarity == '-' and desired_polarity == '+')):
-            self._set_field(0)
-            # This is, sadly, blocking
-            self._wait_for_field_zero(0)
-            self._set_polarity(desired_polarity)
+    def _start_ramp(self, val):
+        # pause the controller if it is currently ramping
+        self._set_pauseRamp(1)
+        self.ask('SET MID %0.2f' % val)       # Set target field
+        self._set_pauseRamp(0)               # Unpause the controller
+        self.pauseRamp.cache.set(False)
+        # Ramp magnet/field to MID or ZERO (Note: Using standard write
+        # as read returns an error/is non-existent).
+        if val == 0:
+            self.write('RAMP ZERO')
+            log.info('Ramping magnetic field to zero...')
+        else:
+            self.write('RAMP MID')
+            log.info('Ramping magnetic field...')
 
-        self._set_field(abs(val))
+    def _set_field_bidirectional(self, val, wait=False):
+        """
+        Ramps to a field of either sign, reversing the polarity on the way if
+        needed. Returns the future of the ramp without waiting for it, unless
+        wait is True, see ``SMS120CRampController.ramp_to``.
+        """
+        polarity = self._get_polarity()
+        self.polarity.cache.set({'+': 'POSITIVE', '-': 'NEGATIVE'}[polarity])
+        future = self.ramp_controller.ramp_to(val)
+        if wait:
+            future.result()
+        return future
 
     def _wait_for_field_zero(self, field_threshold=0.003, refresh_time=0.1):
         """Waits for the field to be within a certain threshold"""
         while abs(self.field()) > field_threshold:
             time.sleep(refresh_time)
+
+
+class SMS120CRampController:
+    """
+    Runs magnet ramps of a CryogenicSMS120C in a background thread.
+
+    ``ramp_to`` checks the target against the cached limits of the power
+    supply, starts the ramp and returns a ``concurrent.futures.Future``, which
+    completes once the power supply holds at the target field. Meanwhile the
+    field and ramp status are polled in the background, with an interval that
+    adapts to the expected remaining ramp time, and the ``field`` and
+    ``rampStatus`` parameter caches are kept up to date. The instrument can
+    be used for other queries during the ramp.
+
+    A ramp to a field of the opposite sign first ramps to zero, reverses the
+    polarity and then ramps to the target.
+
+    Args:
+        instrument: The power supply.
+    """
+
+    field_tolerance = 0.003  # [T]
+    min_poll_interval = 0.2  # [s], minimum delay between commands
+    max_poll_interval = 5.0  # [s]
+
+    def __init__(self, instrument):
+        self._instrument = instrument
+        self._thread = None
+        self._future = None
+        self._abort = threading.Event()
+        self._pause_on_abort = True
+
+    @property
+    def busy(self):
+        """
+        True while a ramp is running.
+        """
+        return self._future is not None and not self._future.done()
+
+    def ramp_to(self, field):
+        """
+        Starts a ramp to field (in Tesla, the sign selects the polarity).
+
+        Returns:
+            Future whose result is the field once the power supply holds at
+            the target. Its exception is set if the ramp fails or is aborted.
+
+        Raises:
+            RuntimeError: If a ramp is running, the power supply is not in
+                TESLA mode, the switch heater is off, or the power supply
+                is not ready to ramp.
+            ValueError: If the field or the ramp rate exceed the limits.
+        """
+        instr = self._instrument
+        if self.busy:
+            raise RuntimeError('A ramp is already running.')
+        if instr.unit.get_latest() != 'TESLA':
+            raise RuntimeError('Controller is not in TESLA mode.')
+        if abs(field) > instr.maxField.get_latest():
+            raise ValueError('Target field {} T is outside the max. field '
+                             'limit of {} T.'.format(
+                                 field, instr.maxField.get_latest()))
+        if instr.rampRate.get_latest() > instr._current_ramp_limit:
+            raise ValueError('Ramp rate is over the set limit, please lower.')
+        if not instr.switchHeater.get_latest():
+            raise RuntimeError('Switch heater is off, persistent mode may be '
+                               'active.')
+        status = instr.rampStatus()
+        if status not in ('HOLDING', 'RAMPING'):
+            raise RuntimeError('Cannot ramp, magnet in state: '
+                               '{}'.format(status))
+
+        self._abort.clear()
+        self._future = future = Future()
+        future.set_running_or_notify_cancel()
+        self._thread = threading.Thread(target=self._run,
+                                        args=(future, field),
+                                        name='{}_ramp'.format(instr.name),
+                                        daemon=True)
+        self._thread.start()
+        return future
+
+    def abort(self):
+        """
+        Pauses the power supply and stops the running ramp, whose future
+        raises a RuntimeError.
+        """
+        self._stop(pause=True)
+
+    def close(self):
+        """
+        Stops polling without pausing the power supply.
+        """
+        self._stop(pause=False)
+
+    def _stop(self, pause):
+        self._pause_on_abort = pause
+        self._abort.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, future, field):
+        instr = self._instrument
+        try:
+            polarity = 'NEGATIVE' if field < 0 else 'POSITIVE'
+            if field != 0 and instr.polarity.get_latest() != polarity:
+                log.info('Reversing polarity, ramping to zero first.')
+                self._ramp(0)
+                instr.write('DIRECTION %s' % instr.polarity.val_mapping[polarity])
+                instr.polarity.cache.set(polarity)
+            reached = self._ramp(abs(field))
+            future.set_result(math.copysign(reached, field))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _ramp(self, magnitude):
+        """
+        Ramps to a field of the given magnitude and waits until the power
+        supply holds at it. Returns the measured field magnitude.
+        """
+        instr = self._instrument
+        instr._start_ramp(magnitude)
+        interval = self.min_poll_interval
+        while not self._abort.wait(interval):
+            status = instr.rampStatus()
+            reached = abs(instr.field())
+            remaining = abs(magnitude - reached)
+            if status == 'HOLDING' and remaining <= self.field_tolerance:
+                return reached
+            if status not in ('HOLDING', 'RAMPING'):
+                raise RuntimeError('Ramp stopped, magnet in state: '
+                                   '{}'.format(status))
+            rate = instr.rampRate.get_latest() * instr._coil_constant
+            expected = remaining / rate if rate > 0 else math.inf
+            interval = min(max(expected / 4, self.min_poll_interval),
+                           self.max_poll_interval)
+
+        if self._pause_on_abort:
+            instr.pauseRamp(True)
+        raise RuntimeError('Ramp aborted.')
@@ -0,0 +1,147 @@
+"""
+Emulation of the serial interface of the Cryogenic SMS120C magnet power
+supply, including the evolution of the field during a ramp.
+
+Usage with the pyvisa-sim resource shipped with this package::
+
+    magnet = CryogenicSMS120C(
+        'magnet', 'ASRL1::INSTR',
+        pyvisa_sim_file='qcodes_contrib_drivers.sims:CryogenicSMS120C.yaml')
+    emulator = SMS120CEmulator(speedup=100)
+    emulator.attach(magnet)
+"""
+
+import threading
+import time
+
+
+class SMS120CEmulator:
+    """
+    Emulates the replies of a SMS120C to the commands used by the
+    CryogenicSMS120C driver. The output ramps with the set ramp rate towards
+    the mid or zero setting while the controller is not paused.
+
+    Args:
+        coil_constant: Coil constant in Tesla per ampere.
+        speedup: Factor by which the emulated time runs faster than the
+            real time.
+    """
+
+    def __init__(self, coil_constant=0.113375, speedup=1.0):
+        self.coil_constant = coil_constant
+        self.speedup = speedup
+        self.tesla = True
+        self.heater = True
+        self.paused = False
+        self.polarity = 'POSITIVE'
+        self.max_field = 5.0  # [T]
+        self.mid = 0.0  # [T]
+        self.rate = 0.0506  # [A/s]
+        self.output = 0.0  # [T], magnitude of the field
+        self.target = None
+        self.fault = None
+        self.commands = []
+        self._lock = threading.Lock()
+        self._time = time.perf_counter()
+
+    def attach(self, instrument):
+        """
+        Replaces the communication of a CryogenicSMS120C instance by this
+        emulator.
+        """
+        instrument.visa_handle.query = self.query
+        instrument.visa_handle.write = self.write
+
+    def quench(self):
+        """
+        Emulates a magnet quench, which stops the ramp.
+        """
+        with self._lock:
+            self._update()
+            self.target = None
+            self.fault = 'QUENCH DETECTED'
+
+    def write(self, cmd):
+        with self._lock:
+            self._update()
+            self.commands.append(cmd)
+            if cmd == 'RAMP MID':
+                self.target = self.mid
+            elif cmd == 'RAMP ZERO':
+                self.target = 0.0
+            elif cmd.startswith('DIRECTION ') and self.output == 0:
+                self.polarity = {'+': 'POSITIVE', '-': 'NEGATIVE'}[cmd[-1]]
+        return len(cmd), 0
+
+    def query(self, cmd):
+        with self._lock:
+            self._update()
+            self.commands.append(cmd)
+            return '{} {}'.format(time.strftime('%H:%M:%S'), self._reply(cmd))
+
+    def _update(self):
+        now = time.perf_counter()
+        elapsed = (now - self._time) * self.speedup
+        self._time = now
+        if self.target is None or self.paused:
+            return
+        step = self.rate * self.coil_constant * elapsed
+        if abs(self.target - self.output) <= step:
+            self.output = self.target
+            self.target = None
+        elif self.target > self.output:
+            self.output += step
+        else:
+            self.output -= step
+
+    def _reply(self, cmd):
+        unit = 'TESLA' if self.tesla else 'AMPS'
+        scale = 1 if self.tesla else 1 / self.coil_constant
+        args = cmd.split()
+        if cmd == 'HEATER':
+            return 'HEATER STATUS: {}'.format('ON' if self.heater else 'OFF')
+        if args[0] == 'HEATER':
+            self.heater = args[1] == '1'
+            return 'HEATER STATUS: {}'.format('ON' if self.heater else 'OFF')
+        if cmd == 'TESLA':
+            return 'UNITS: {}'.format(unit)
+        if args[0] == 'TESLA':
+            self.tesla = args[1] == '1'
+            return 'UNITS: {}'.format('TESLA' if self.tesla else 'AMPS')
+        if cmd == 'GET OUTPUT':
+            return 'OUTPUT: {:.4f} {} AT 0.1 VOLTS'.format(
+                self.output * scale, unit)
+        if cmd == 'RAMP STATUS':
+            if self.fault is not None:
+                return 'RAMP STATUS: {}'.format(self.fault)
+            if self.target is not None and not self.paused:
+                return 'RAMP STATUS: RAMPING FROM {:.4f} TO {:.4f} {}'.format(
+                    self.output * scale, self.target * scale, unit)
+            return 'RAMP STATUS: HOLDING ON TARGET AT {:.4f} {}'.format(
+                self.output * scale, unit)
+        if cmd == 'GET SIGN':
+            return 'CURRENT DIRECTION: {}'.format(self.polarity)
+        if cmd == 'GET MAX':
+            return 'MAX SETTING: {:.4f} {}'.format(self.max_field * scale, unit)
+        if cmd == 'GET RATE':
+            return 'RAMP RATE: {:.4f} A/SEC'.format(self.rate)
+        if cmd == 'GET VL':
+            return 'VOLTAGE LIMIT: 3.5 VOLTS'
+        if cmd == 'PAUSE':
+            return 'PAUSE STATUS: {}'.format('ON' if self.paused else 'OFF')
+        if args[0] == 'PAUSE':
+            self.paused = args[1] == '1'
+            return 'PAUSE STATUS: {}'.format('ON' if self.paused else 'OFF')
+        if cmd.startswith('SET MID '):
+            self.mid = float(args[2]) / scale
+            return 'MID SETTING: {:.4f} {}'.format(self.mid * scale, unit)
+        if cmd.startswith('SET MAX '):
+            self.max_field = float(args[2]) / scale
+            return 'MAX SETTING: {:.4f} {}'.format(self.max_field * scale, unit)
+        if cmd.startswith('SET RAMP '):
+            self.rate = float(args[2])
+            return 'RAMP RATE: {:.4f} A/SEC'.format(self.rate)
+        if cmd.startswith('SET TPA '):
+            self.coil_constant = float(args[2])
+            return 'FIELD CONSTANT: {:.6f} T/A'.format(self.coil_constant)
+        return '------->  {}'.format(cmd)
@@ -15,11 +15,13 @@ This module provides the following drivers:
 """
 from __future__ import annotations
 
-from typing import Dict, List, Union, Tuple, Optional
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Union, Tuple, Optional, Sequence
 import time
 import json
 import logging
 
+import numpy as np
 from qcodes import VisaInstrument, Parameter, validators
 
 try:
@@ -103,6 +105,19 @@ class ERASynthBase(VisaInstrument):
         lo.power(10)  # Set the amplitude to 10 dBm
         lo.on()  # Turn on the output
 
+        # Settings changed inside a batch are confirmed with a single read of the
+        # configuration JSON
+        with lo.batch():
+            lo.modulation_type("am")
+            lo.modulation_am_depth(30)
+            lo.modulation_en(True)
+
+    Readable settings are confirmed by reading back the configuration JSON of the
+    instrument. The configuration is cached for ``config_cache_ttl`` seconds, and
+    a setting that does not take effect is written again at most
+    ``max_write_retries`` times with an exponential backoff. Set
+    ``legacy_communication`` to ``True`` to read the configuration for every get,
+    and to confirm every write with an unbounded number of retries.
 
     .. seealso::
 
@@ -113,6 +128,9 @@ class ERASynthBase(VisaInstrument):
         communication.
     """
 
+    _retry_delay = 0.01
+    """Initial delay in s before a write is retried, doubled for every retry."""
+
     @staticmethod
     def print_pyvisa_resources() -> None:
         """Utility to list all."""
@@ -124,7 +142,8 @@ class ERASynthBase(VisaInstrument):
         self.debug_messages_en(False)  # Print less messages to improve communication
         self.wifi_off()  # print less messages to improve communication
 
-    def __init__(self, name: str, address: str, **kwargs):
+    def __init__(self, name: str, address: str, legacy_communication: bool = False,
+                 **kwargs):
         """
         Create an instance of the instrument.
 
@@ -132,9 +151,52 @@ class ERASynthBase(VisaInstrument):
             name: Instrument name.
             address: Used to connect to the instrument.
                 Run :meth:`.ERASynthBase.print_pyvisa_resources` to list available list.
+            legacy_communication: Initial value of the ``legacy_communication``
+                parameter.
         """
         super().__init__(name=name, address=address, terminator="\r\n", **kwargs)
 
+        self._config: Optional[Dict[str, str]] = None
+        self._config_timestamp = 0.0
+        # readable commands written inside `batch`, by JSON key
+        self._pending_writes: Optional[Dict[str, Tuple[str, str]]] = None
+
+        # ##############################################################################
+        # Communication settings
+        # ##############################################################################
+
+        self.legacy_communication = Parameter(
+            name="legacy_communication",
+            instrument=self,
+            vals=validators.Bool(),
+            initial_value=legacy_communication,
+            set_cmd=None,
+        )
+        """
+        Read the configuration JSON for every get and confirm every write until it
+        succeeds, as done by earlier versions of this driver.
+        """
+
+        self.config_cache_ttl = Parameter(
+            name="config_cache_ttl",
+            instrument=self,
+            label="Configuration cache TTL",
+            unit="s",
+            vals=validators.Numbers(min_value=0),
+            initial_value=1.0,
+            set_cmd=None,
+        )
+        """Time during which the configuration JSON is reused for gets."""
+
+        self.max_write_retries = Parameter(
+            name="max_write_retries",
+            instrument=self,
+            vals=validators.Ints(min_value=0),
+            initial_value=5,
+            set_cmd=None,
+        )
+        """Number of times a write that did not take effect is repeated."""
+
         # ##############################################################################
         # Standard LO parameters
         # ##############################################################################
@@ -530,11 +592,13 @@ class ERASynthBase(VisaInstrument):
 
         Commands are prefixed with `">"` as required by the ERASynth.
 
-        NB the read buffer is discarded before and after reading one line.
+        NB the read buffer is discarded before sending the command, and with
+        ``legacy_communication`` also after reading one line.
         """
         self.clear_read_buffer()
         response = super().ask(f">{cmd}")
-        self.clear_read_buffer()
+        if self.legacy_communication.get_latest():
+            self.clear_read_buffer()
 
         return response
 
@@ -558,18 +622,21 @@ class ERASynthBase(VisaInstrument):
 
         Commands are prefixed with `">"` as required by the ERASynth.
 
-        NB the read buffer is discarded before and after reading one line.
+        NB the read buffer is discarded before sending the command, and with
+        ``legacy_communication`` also after writing it.
         """
         self.clear_read_buffer()
         super().write(f">{cmd}")
-        self.clear_read_buffer()
+        if self.legacy_communication.get_latest():
+            self.clear_read_buffer()
 
     def write_raw(self, cmd: str) -> None:
         """
         For some commands we confirm that the value has been set correctly.
 
         This is only possible for configurations that can be retrieved from the
-        instrument.
+        instrument. Inside :meth:`batch` the confirmation is postponed until the
+        end of the batch.
         """
         is_readable_cmd = False
         for command in _CMD_TO_JSON_MAPPING:
@@ -577,16 +644,88 @@ class ERASynthBase(VisaInstrument):
                 is_readable_cmd = True
                 break
 
-        if is_readable_cmd:
-            json_key = _CMD_TO_JSON_MAPPING[command]
-            cmd_arg = cmd[1 + len(command) :]
+        if not is_readable_cmd:
+            super().write_raw(cmd)
+            # e.g. a preset changes the configuration
+            self._config = None
+            return
+
+        json_key = _CMD_TO_JSON_MAPPING[command]
+        cmd_arg = cmd[1 + len(command) :]
+        if self.legacy_communication.get_latest():
             while True:
                 super().write_raw(cmd)
                 self.clear_read_buffer()
                 if self.get_configuration(json_key) == cmd_arg:
                     break
+            return
+
+        super().write_raw(cmd)
+        if self._pending_writes is not None:
+            self._pending_writes[json_key] = (cmd, cmd_arg)
         else:
-            super().write_raw(cmd)
+            self._confirm_writes({json_key: (cmd, cmd_arg)})
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Context manager in which readable settings are written without being
+        confirmed one by one. All of them are confirmed with a single read of the
+        configuration JSON when the context is left.
+
+        Has no effect with ``legacy_communication``.
+        """
+        if self._pending_writes is not None:
+            # nested batch, the outer one confirms the writes
+            yield
+            return
+
+        self._pending_writes = {}
+        try:
+            yield
+            pending_writes = self._pending_writes
+        finally:
+            self._pending_writes = None
+        if pending_writes:
+            self._confirm_writes(pending_writes)
+
+    def _confirm_writes(self, writes: Dict[str, Tuple[str, str]]) -> None:
+        """
+        Reads the configuration JSON until it contains the written values.
+        Commands that did not take effect are written again with an exponentially
+        increasing delay.
+
+        Args:
+            writes: The written commands and arguments by JSON key.
+
+        Raises:
+            RuntimeError: If a command did not take effect after
+                ``max_write_retries`` retries.
+        """
+        delay = self._retry_delay
+        for retry in range(self.max_write_retries.get_latest() + 1):
+            self.clear_read_buffer()
+            config = self.get_configuration(max_age=0)
+            assert isinstance(config, Dict)
+            writes = {
+                json_key: (cmd, cmd_arg)
+                for json_key, (cmd, cmd_arg) in writes.items()
+                if config[json_key] != cmd_arg
+            }
+            if not writes:
+                return
+            if retry == self.max_write_retries.get_latest():
+                break
+            logger.debug(f"Retrying {list(writes)} in {delay} s.")
+            time.sleep(delay)
+            delay *= 2
+            for cmd, _ in writes.values():
+                super().write_raw(cmd)
+
+        raise RuntimeError(
+            f"{self.name}: failed to set {list(writes)} after "
+            f"{self.max_write_retries.get_latest()} retries."
+        )
 
     def _get_json(self, cmd: str, first_key: str) -> str:
         """
@@ -610,13 +749,35 @@ class ERASynthBase(VisaInstrument):
 
     # ERASynth specific methods
 
-    def get_configuration(self, par_name: Optional[str] = None) -> Union[Dict[str, str], str]:
+    def get_configuration(
+        self, par_name: Optional[str] = None, max_age: Optional[float] = None
+    ) -> Union[Dict[str, str], str]:
         """
         Returns the configuration JSON that contains all parameters.
-        """
-        config_json = json.loads(self._get_json("RA", "rfoutput"))
 
-        return config_json if par_name is None else config_json[par_name]
+        Args:
+            par_name: Key of a single parameter to return.
+            max_age: Maximum age in s of a previously read configuration to
+                return. Defaults to ``config_cache_ttl``, or 0 with
+                ``legacy_communication``.
+        """
+        if max_age is None:
+            if self.legacy_communication.get_latest():
+                max_age = 0.0
+            else:
+                max_age = self.config_cache_ttl.get_latest()
+
+        config_json = self._config
+        if (
+            config_json is None
+            or (par_name is not None and par_name not in config_json)
+            or time.perf_counter() - self._config_timestamp > max_age
+        ):
+            config_json = json.loads(self._get_json("RA", "rfoutput"))
+            self._config = config_json
+            self._config_timestamp = time.perf_counter()
+
+        return dict(config_json) if par_name is None else config_json[par_name]
 
     def get_diagnostic_status(self, par_name: Optional[str] = None) -> Union[Dict[str, str], str]:
         """
@@ -655,6 +816,51 @@ class ERASynthBase(VisaInstrument):
         """Turn ESP8266 WiFi module off."""
         self.write("PE00")
 
+    def setup_sweep(
+        self,
+        frequencies: Sequence[float],
+        trigger: str = "external",
+        dwell: Optional[float] = None,
+    ) -> bool:
+        """
+        Programs the internal frequency sweep of the instrument, if the frequencies
+        can be generated by it.
+
+        The internal sweep steps through equidistant, increasing frequencies with a
+        step of an integer number of Hz, which is much faster than setting
+        ``frequency`` for every point. All sweep settings are confirmed with a
+        single read of the configuration JSON.
+
+        Args:
+            frequencies: Frequencies of the sweep in Hz.
+            trigger: ``"external"`` to step on every trigger, or ``"freerun"``.
+            dwell: Time in s spent at every frequency with ``"freerun"``.
+
+        Returns:
+            ``True`` if the internal sweep is enabled. ``False`` if the frequencies,
+            rounded to integer Hz, are not increasing with a constant step, in
+            which case the sweep is disabled and ``frequency`` has to be set for
+            every point instead.
+        """
+        freqs = np.rint(np.asarray(frequencies, dtype=float))
+        steps = np.diff(freqs)
+        # the instrument only sweeps with a step of an integer number of Hz
+        if len(steps) == 0 or steps[0] <= 0 or np.any(steps != steps[0]):
+            self.sweep_en(False)
+            return False
+        step = steps[0]
+
+        with self.batch():
+            self.sweep_en(False)
+            self.sweep_trigger(trigger)
+            if dwell is not None:
+                self.sweep_dwell(dwell)
+            self.sweep_start_frequency(freqs[0])
+            self.sweep_stop_frequency(freqs[-1])
+            self.sweep_step_frequency(step)
+        self.sweep_en(True)
+        return True
+
     def run_self_test(self) -> None:
         """
         Sets all settable parameters to different values.
@@ -682,27 +888,50 @@ class ERASynthBase(VisaInstrument):
     # set commands
     # ##################################################################################
 
-    def _set_and_confirm(self, cmd: str, cmd_arg: str, str_back: Optional[str] = None) -> None:
+    def _set_and_confirm(
+        self, cmd: str, cmd_arg: str, json_key: str, str_back: Optional[str] = None
+    ) -> None:
         """
         Because for this command the instrument replies with a text containing the
         value, we make use of it to ensure we waited enough time for the changes to
         take effect.
         """
         str_back = cmd_arg if str_back is None else str_back
-        while True:
+        # the reply does not tell the format of the value in the configuration JSON
+        if self._config is not None:
+            self._config.pop(json_key, None)
+
+        if self.legacy_communication.get_latest():
+            while True:
+                read_line = self.ask(f"{cmd}{cmd_arg}")
+                if str_back in read_line:
+                    return
+
+        delay = self._retry_delay
+        for retry in range(self.max_write_retries.get_latest() + 1):
+            if retry:
+                time.sleep(delay)
+                delay *= 2
             read_line = self.ask(f"{cmd}{cmd_arg}")
             if str_back in read_line:
-                break
+                return
+
+        raise RuntimeError(
+            f"{self.name}: failed to confirm {cmd}{cmd_arg} after "
+            f"{self.max_write_retries.get_latest()} retries."
+        )
 
     def _set_frequency(self, value: str) -> None:
-        self._set_and_confirm(cmd="F", cmd_arg=value)
+        self._set_and_confirm(cmd="F", cmd_arg=value, json_key="frequency")
 
     def _set_power(self, value: str) -> None:
-        self._set_and_confirm(cmd="A", cmd_arg=value)
+        self._set_and_confirm(cmd="A", cmd_arg=value, json_key="amplitude")
 
     def _set_status(self, value: str) -> None:
         str_back = {"0": "OFF", "1": "ON"}[value]
-        self._set_and_confirm(cmd="P0", cmd_arg=value, str_back=str_back)
+        self._set_and_confirm(
+            cmd="P0", cmd_arg=value, json_key="rfoutput", str_back=str_back
+        )
 
 
 def _mk_frequency(self, max_frequency: float) -> Parameter:
@@ -1,6 +1,5 @@
 import logging
-from typing import Any, Dict
-import struct
+from typing import Any, Dict, Optional, Tuple
 import numpy as np
 import datetime
 import qcodes.validators as vals
@@ -25,7 +24,7 @@ class HP8594E(VisaInstrument):
             "start_freq",
             label="Sweep start frequency",
             unit="Hz",
-            set_cmd="FA {} Hz",
+            set_cmd=lambda x: self._set_freq("FA {} Hz", x),
             get_cmd="FA?",
             get_parser=float,
             vals=vals.Numbers(0, 2900000000.0),
@@ -35,7 +34,7 @@ class HP8594E(VisaInstrument):
             "stop_freq",
             label="Sweep stop frequency",
             unit="Hz",
-            set_cmd="FB {} Hz",
+            set_cmd=lambda x: self._set_freq("FB {} Hz", x),
             get_cmd="FB?",
             get_parser=float,
             vals=vals.Numbers(0, 2900000000.0),
@@ -45,7 +44,7 @@ class HP8594E(VisaInstrument):
             "center_freq",
             label="center frequency",
             unit="Hz",
-            set_cmd="CF {} Hz",
+            set_cmd=lambda x: self._set_freq("CF {} Hz", x),
             get_cmd="CF?",
             get_parser=float,
             vals=vals.Numbers(9000, 1800000000),
@@ -55,7 +54,7 @@ class HP8594E(VisaInstrument):
             "span",
             label="span",
             unit="Hz",
-            set_cmd="SP {} Hz",
+            set_cmd=lambda x: self._set_freq("SP {} Hz", x),
             get_cmd="SP?",
             get_parser=float,
             vals=vals.Numbers(9000, 1800000000),
@@ -111,6 +110,16 @@ class HP8594E(VisaInstrument):
             vals=vals.Numbers(0, 30),
         )
 
+        self.add_parameter(
+            "log_scale",
+            label="Log scale",
+            unit="dB",
+            set_cmd="LG {} DB",
+            get_cmd="LG?",
+            get_parser=float,
+            vals=vals.Numbers(0.1, 20),
+        )
+
         self.add_parameter(
             "freq_axis",
             parameter_class=FreqAxis,
@@ -126,6 +135,12 @@ class HP8594E(VisaInstrument):
             vals=vals.Arrays(shape=(401,)),
         )
 
+    def _set_freq(self, cmd: str, value: float) -> None:
+        # setting one of start, stop, center or span changes two others
+        self.write(cmd.format(value))
+        for param in (self.start_freq, self.stop_freq, self.center_freq, self.span):
+            param.cache.invalidate()
+
     def get_info(self) -> Dict:
         info = {}
 
@@ -154,24 +169,40 @@ class HP8594E(VisaInstrument):
 
 
 class FreqAxis(Parameter):
-    """ """
+    """
+    Frequencies of the 401 trace points. The axis is computed from the cached
+    start and stop frequencies, which are read again after a change of the
+    span or center frequency.
+    """
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
+        self._axis_key: Optional[Tuple[float, float]] = None
+        self._axis = np.empty(0)
 
     def get_raw(self) -> ParamRawDataType:
         assert isinstance(self.root_instrument, HP8594E)
-        start = self.root_instrument.start_freq()
-        stop = self.root_instrument.stop_freq()
-        return np.linspace(start, stop, 401)
+        key = (self.root_instrument.start_freq.get_latest(),
+               self.root_instrument.stop_freq.get_latest())
+        if key != self._axis_key:
+            self._axis = np.linspace(key[0], key[1], 401)
+            self._axis.flags.writeable = False
+            self._axis_key = key
+        return self._axis
 
 
 class Trace(ParameterWithSetpoints):
-    """ """
+    """
+    Trace in dBm. With the "bytes" transfer type the trace is read as 16 bit
+    measurement units, which are converted with an affine scale computed from
+    the cached reference level and log scale.
+    """
 
     def __init__(self, transfer_type: str = "bytes", *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.transfer_type = transfer_type
+        self._scale_key: Optional[Tuple[float, float]] = None
+        self._scale = (0.0, 0.0)
 
         if not isinstance(self.root_instrument, HP8594E):
             raise TypeError("Root instrument must be HP8594E")
@@ -191,14 +222,27 @@ class Trace(ParameterWithSetpoints):
 
     def transfer_ascii(self) -> npt.NDArray[np.float64]:
         data = self.hp8594e.ask("TS;TDF P;TRA?;")
-        return np.array([float(x) for x in data.split(",")])
+        return np.array(data.split(","), dtype=np.float64)
 
     def transfer_bytes(self) -> npt.NDArray[np.float64]:
         self.hp8594e.write("TDF B")
-        self.hp8594e.write("MDS B")
+        self.hp8594e.write("MDS W")
         self.hp8594e.write("TS;TRA?")
         data_bytes = self.hp8594e.visa_handle.read_raw()
-        data_int = struct.unpack(">401B", data_bytes)
-        ref_level = self.hp8594e.reference_level()
-        data_float = [(x * 32 - 8000) * 0.01 + ref_level for x in data_int]
-        return np.array(data_float)
+        data_int = np.frombuffer(data_bytes, dtype=">i2", count=401)
+        gain, offset = self._get_scale()
+        return data_int * gain + offset
+
+    def _get_scale(self) -> Tuple[float, float]:
+        """
+        Gain and offset from measurement units to dBm. 8000 measurement units
+        are the reference level at the top of the 8 divisions of the screen.
+        """
+        key = (self.hp8594e.reference_level.get_latest(),
+               self.hp8594e.log_scale.get_latest())
+        if key != self._scale_key:
+            ref_level, log_scale = key
+            gain = log_scale * 8 / 8000
+            self._scale = (gain, ref_level - 8000 * gain)
+            self._scale_key = key
+        return self._scale
@@ -3,7 +3,6 @@ import types
 import logging
 import numpy as np
 import serial
-import visa
 
 import traceback
 import threading
@@ -13,12 +12,17 @@ from qcodes import VisaInstrument, validators as vals
 from qcodes.instrument.parameter import ManualParameter
 from qcodes.utils.validators import Bool, Numbers
 
+from ._serial import read_bytes
+
 
 Fullrange = 20000
 Halfrange = Fullrange / 2
 
 class IST_20(Instrument):
 
+	# dacs that support the fast write operation
+	_fast_channels = (31,32,3,28)
+
 	def __init__(self, name, interface = 'COM4', reset=False, numdacs=32, dac_step=50,dac_delay=0, safe_version=True,
 				 polarity=['BIP', 'BIP', 'BIP', 'BIP','BIP', 'BIP', 'BIP', 'BIP'],
 				 use_locks=False,**kwargs):
@@ -29,6 +33,11 @@ class IST_20(Instrument):
 
 		self.Fullrange = Fullrange
 		self.Halfrange = Halfrange
+		# deadline in seconds for receiving a complete reply
+		self.read_timeout = 3
+		# full rack readback shared by the dac gets, see _get_dacs_cached
+		self._mvoltages = None
+		self._gets_since_readback = 0
 
 		if numdacs % 4 == 0 and numdacs > 0:
 			self._numdacs = int(numdacs)
@@ -62,6 +71,18 @@ class IST_20(Instrument):
 					inter_delay=dac_delay,
 					max_val_age=10)
 
+		self.add_parameter(
+			'readback_every',
+			label='Gets per readback',
+			get_cmd=None, set_cmd=None,
+			initial_value=self._numdacs,
+			vals=vals.Ints(1),
+			docstring='Number of dac gets served from one readback of all '
+					  'dacs. The rack only supports reading all dacs at '
+					  'once, so with the default a snapshot reads the rack '
+					  'once instead of once per dac. Set to 1 to read the '
+					  'rack on every get.')
+
 		self._open_serial_connection()
 
 	#open serial connection
@@ -226,11 +247,31 @@ class IST_20(Instrument):
 			voltage (float) : dacvalue in mV
 		'''
 		logging.info('Reading dac%s', channel)
-		mvoltages = self._get_dacs()
+		mvoltages = self._get_dacs_cached()
 		logging.info(mvoltages)
 		#return mvoltages[channel - 1]
 		return mvoltages[channel - 1]
 
+	def _get_dacs_cached(self):
+		'''
+		Returns all dacvoltages, reading them from the device only once per
+		``readback_every`` calls.
+		'''
+		if (self._mvoltages is None
+				or self._gets_since_readback >= self.readback_every()):
+			self._mvoltages = self._get_dacs()
+			self._gets_since_readback = 0
+		self._gets_since_readback += 1
+		return self._mvoltages
+
+	def _update_cached(self, channels, mvoltages):
+		'''
+		Updates the cached readback after setting dacs.
+		'''
+		if self._mvoltages is not None:
+			for channel, mvoltage in zip(channels, mvoltages):
+				self._mvoltages[int(channel) - 1] = mvoltage
+
 	def do_set_dac(self, mvoltage, channel):
 		'''
 		Sets the specified dac to the specified voltage
@@ -243,6 +284,7 @@ class IST_20(Instrument):
 			reply (string) : errormessage
 		'''
 		logging.info('Setting dac%s to %.04f mV', channel, mvoltage)
+		self._update_cached([channel], [mvoltage])
 		mvoltage = self._mvoltage_to_bytes(mvoltage)
 		#logging.info('mvoltage after m_to_bytes: ')
 		#logging.info(mvoltage)
@@ -269,11 +311,12 @@ class IST_20(Instrument):
 
 	def do_set_dac_fast(self, mvoltage, channel): #added by Daniel, seems to work
 
-		if channel not in [31,32,3,28] :
+		if channel not in self._fast_channels :
 			print('Error: Only channels 1-4 have fast setting.')
 		else:
 
 			logging.info('Setting dac%s to %.04f mV', channel, mvoltage)
+			self._update_cached([channel], [mvoltage])
 			mvoltage = self._mvoltage_to_bytes(mvoltage)
 			mvoltage_bytes = [0,0,0]
 			mvoltage_bytes = [mvoltage >> i & 0xff for i in (16,8,0)]
@@ -284,6 +327,46 @@ class IST_20(Instrument):
 
 			return reply
 
+	def set_dacs_fast(self, channels, mvoltages):
+		'''
+		Sets any number of dacs with a single write to the rack.
+
+		The fast dacs are set with the fast write operation, all other dacs
+		with the normal write operation. The messages of all dacs are packed
+		into one write and the acknowledges of the normal writes are read
+		back in one go.
+
+		Input:
+			channels (int[])   : 1 based indices of the dacs
+			mvoltages (float[]) : output voltages in mV, one per channel
+
+		Output:
+			reply (int[]) : the acknowledges of the normal writes
+		'''
+		if len(channels) != len(mvoltages):
+			raise ValueError('channels and mvoltages must have the same length')
+		for channel, mvoltage in zip(channels, mvoltages):
+			if not 1 <= channel <= self._numdacs:
+				raise ValueError('channels must be between 1 and {}'.format(self._numdacs))
+			self.parameters['dac{}'.format(channel)].validate(mvoltage)
+
+		message = []
+		n_acks = 0
+		for channel, mvoltage in zip(channels, mvoltages):
+			code = self._mvoltage_to_bytes(mvoltage)
+			if channel in self._fast_channels:
+				op = 0b11000000 #110 is a write fast operation
+			else:
+				op = 0b10000000 #100 is a write operation
+				n_acks += 1
+			message += [(int(channel)-1) | op] + [code >> i & 0xff for i in (16,8,0)]
+
+		reply = self._send_and_read(message, 4*n_acks)
+		self._update_cached(channels, mvoltages)
+		for channel, mvoltage in zip(channels, mvoltages):
+			self.parameters['dac{}'.format(channel)].cache.set(float(mvoltage))
+		return reply
+
 	def do_ramp_dac(self, mvoltage, channel):  #added by Daniel, fucks it up completly right now...
 		if channel>2:
 			print('Error: Only channels 1-2 have ramping.')
@@ -356,35 +439,9 @@ class IST_20(Instrument):
 
 		# clear input buffer
 		self.ser.flushInput()
-		#logging.info('Flushed input')
-		#vpp43.write(self._vi, message) # OLD
 		self.ser.write(message) # NEW
-		#logging.info('Wrote Message')
-
-# In stead of blocking, we could also poll, but it's a bit slower
-#        print visafunc.get_navail(self.lib, self._vi)
-#        if not visafunc.wait_data(self._vi, 2, 0.5):
-#            logging.error('Failed to receive reply from IST_20 rack')
-#            return False
-
-		#data1 = visafunc.readn(self._vi, 2)  # OLD
-		#sleep(2)
-		#logging.info(self.ser.readline())
-		s=0
-		data1 = []
-		while s < bytestoread:
-			data1.append(ord(self.ser.read()))
-			#logging.info(s)
-			s=s+1
-		#data1 = [ord(s) for s in data1]
-		#data2 = np.reshape(data1,(-1,4))
-		#logging.info('finished reading')
-		#data2 = np.uint32(data1) #from string to 32bit
-		data2 = data1
-		#logging.info('converted to uint32')
-		#logging.info('sendAndRead: %s', data2)
-
-		return data2
+
+		return read_bytes(self.ser, bytestoread, self.read_timeout)
 
 	def set_pol_dacrack(self, flag, channels, get_all=True):
 		'''
@@ -22,6 +22,8 @@ from qcodes import VisaInstrument, validators as vals
 from qcodes.instrument.parameter import ManualParameter
 from qcodes.utils.validators import Bool, Numbers
 
+from ._serial import read_bytes
+
 
 Fullrange = 8.192  # #is now +-4.096V as we've changed the voltage reference, pet 4.5.20
 Halfrange = Fullrange / 2
@@ -41,6 +43,11 @@ class FastDAC(Instrument):
 		self.Fullrange = Fullrange
 		self.Halfrange = Halfrange
 		self.communication_bytes = 4
+		# deadline in seconds for receiving a complete reply
+		self.read_timeout = 3
+		# full rack readback shared by the dac gets, see _get_dacs_cached
+		self._mvoltages = None
+		self._gets_since_readback = 0
 
 		if numdacs % 4 == 0 and numdacs > 0:
 			self._numdacs = int(numdacs)
@@ -68,6 +75,18 @@ class FastDAC(Instrument):
 				inter_delay=dac_delay,
 				max_val_age=10)
 
+		self.add_parameter(
+			'readback_every',
+			label='Gets per readback',
+			get_cmd=None, set_cmd=None,
+			initial_value=self._numdacs,
+			vals=vals.Ints(1),
+			docstring='Number of dac gets served from one readback of all '
+					  'dacs. The rack only supports reading all dacs at '
+					  'once, so with the default a snapshot reads the rack '
+					  'once instead of once per dac. Set to 1 to read the '
+					  'rack on every get.')
+
 		self._open_serial_connection()
 
 	# open serial connection
@@ -184,10 +203,30 @@ class FastDAC(Instrument):
 			voltage (float) : dacvalue in mV
 		"""
 		logging.info('Reading dac%s', channel)
-		mvoltages = self._get_dacs()
+		mvoltages = self._get_dacs_cached()
 		logging.info(mvoltages)
 		return mvoltages[channel - 1]
 
+	def _get_dacs_cached(self):
+		"""
+		Returns all dacvoltages, reading them from the device only once per
+		``readback_every`` calls.
+		"""
+		if (self._mvoltages is None
+				or self._gets_since_readback >= self.readback_every()):
+			self._mvoltages = self._get_dacs()
+			self._gets_since_readback = 0
+		self._gets_since_readback += 1
+		return self._mvoltages
+
+	def _update_cached(self, channels, mvoltages):
+		"""
+		Updates the cached readback after setting dacs.
+		"""
+		if self._mvoltages is not None:
+			for channel, mvoltage in zip(channels, mvoltages):
+				self._mvoltages[int(channel) - 1] = mvoltage
+
 	def do_set_dac(self, mvoltage, channel):
 		"""
 		Sets the specified dac to the specified voltage
@@ -200,6 +239,7 @@ class FastDAC(Instrument):
 			reply (string) : errormessage
 		"""
 		logging.info('Setting dac%s to %.04f mV', channel, mvoltage)
+		self._update_cached([channel], [mvoltage])
 		mvoltage = self._mvoltage_to_bytes(mvoltage)
 		mvoltage_bytes = [0, 0, 0]
 		mvoltage_bytes = [mvoltage >> i & 0xff for i in (16, 8, 0)]  # 0xff is 255
@@ -215,6 +255,7 @@ class FastDAC(Instrument):
 		else:
 
 			logging.info('Setting dac%s to %.04f mV', channel, mvoltage)
+			self._update_cached([channel], [mvoltage])
 			mvoltage = self._mvoltage_to_bytes(mvoltage)
 			mvoltage_bytes = [0, 0, 0]
 			mvoltage_bytes = [mvoltage >> i & 0xff for i in (16, 8, 0)]
@@ -237,22 +278,55 @@ class FastDAC(Instrument):
 			print('Error: 4 entries have to be given, 1 for each DAC')
 
 		else:
+			return self.set_dacs_fast([1, 2, 3, 4], mvoltages[:4])
 
-			channel = 1  # the channel for this function is fixed but we don't change the function too much in order to keep it readable
-			channel = (int(channel)-1) | 0b10100000  # 101 is a write fast operation to the first 4 DACS
-			message = [channel]  # probably the channel doesnt even matter
-			# logging.info('Setting dac 1-4 fast to %.04f mV', channel, mvoltage)
-			for index in range(0, 4):
-				mvoltage = self._mvoltage_to_bytes(mvoltages[index])
-				mvoltage_bytes = [0, 0, 0]
-				mvoltage_bytes = [mvoltage >> i & 0xff for i in (16, 8, 0)]
-				message.append(mvoltage_bytes[0])
-				message.append(mvoltage_bytes[1])
-				message.append(mvoltage_bytes[2])
+	def set_dacs_fast(self, channels, mvoltages):
+		"""
+		Sets any number of dacs with a single write to the rack.
 
-			reply = self._send_and_read(message, 0)
+		Dacs 1-4 are set with the fast write operation, all other dacs with
+		the normal write operation. The messages of all dacs are packed into
+		one write and the acknowledges of the normal writes are read back in
+		one go. If exactly dacs 1-4 are given, the dedicated 13 byte message
+		for the first 4 dacs is used.
 
-			return reply
+		Input:
+			channels (int[])   : 1 based indices of the dacs
+			mvoltages (float[]) : output voltages in mV, one per channel
+
+		Output:
+			reply (int[]) : the acknowledges of the normal writes
+		"""
+		if len(channels) != len(mvoltages):
+			raise ValueError('channels and mvoltages must have the same length')
+		for channel, mvoltage in zip(channels, mvoltages):
+			if not 1 <= channel <= self._numdacs:
+				raise ValueError('channels must be between 1 and {}'.format(self._numdacs))
+			self.parameters['dac{}'.format(channel)].validate(mvoltage)
+
+		logging.info('Setting dacs %s to %s mV', channels, mvoltages)
+		codes = [self._mvoltage_to_bytes(mvoltage) for mvoltage in mvoltages]
+		if list(channels) == [1, 2, 3, 4]:
+			message = [0b10100000]  # 101 is a write fast operation to the first 4 DACS
+			for code in codes:
+				message += [code >> i & 0xff for i in (16,8,0)]
+			n_acks = 0
+		else:
+			message = []
+			n_acks = 0
+			for channel, code in zip(channels, codes):
+				if channel <= 4:
+					op = 0b11000000 #110 is a write fast operation
+				else:
+					op = 0b10000000 #100 is a write operation
+					n_acks += 1
+				message += [(int(channel)-1) | op] + [code >> i & 0xff for i in (16,8,0)]
+
+		reply = self._send_and_read(message, n_acks * self.communication_bytes)
+		self._update_cached(channels, mvoltages)
+		for channel, mvoltage in zip(channels, mvoltages):
+			self.parameters['dac{}'.format(channel)].cache.set(float(mvoltage))
+		return reply
 
 	# not yet implemented 
 	# def do_ramp_dac(self, mvoltage, channel):  #added by Daniel, fucks it up completly right now...
@@ -327,38 +401,7 @@ class FastDAC(Instrument):
 		self.ser.flushInput()
 		self.ser.write(message) # NEW
 
-# In stead of blocking, we could also poll, but it's a bit slower
-#        print visafunc.get_navail(self.lib, self._vi)
-#        if not visafunc.wait_data(self._vi, 2, 0.5):
-#            logging.error('Failed to receive reply from IST_20 rack')
-#            return False
-
-		#data1 = visafunc.readn(self._vi, 2)  # OLD
-		#sleep(2)
-		# logging.info(self.ser.readline())
-		s = 0
-		repetition = 0
-		data1 = []
-		while s < bytestoread:
-			if repetition > 2:
-				break
-			char = self.ser.read()
-			if char:  # empty string evaluates to False
-				data1.append(ord(char))
-				# logging.info(s)
-				s = s+1
-				repetition = 0
-			else:
-				repetition += 1
-		#data1 = [ord(s) for s in data1]
-		#data2 = np.reshape(data1,(-1,4))
-		#logging.info('finished reading')
-		#data2 = np.uint32(data1) #from string to 32bit
-		data2 = data1
-		#logging.info('converted to uint32')
-		#logging.info('sendAndRead: %s', data2)
-
-		return data2
+		return read_bytes(self.ser, bytestoread, self.read_timeout)
 
 	def set_pol_dacrack(self, flag, channels, get_all=True):
 		'''
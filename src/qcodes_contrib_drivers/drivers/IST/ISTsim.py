@@ -0,0 +1,141 @@
+"""
+Loopback stand-in for the serial port of the IST DAC racks.
+
+``LoopbackSerial`` implements the subset of ``serial.Serial`` that the
+FastDAC and IST_20 drivers use. Every write is handed to a responder whose
+reply is queued for the following reads, which allows running the drivers
+(e.g. in tests and benchmarks) without a rack by replacing ``serial.Serial``
+in the driver module::
+
+	monkeypatch.setattr(FastDAC_module.serial, 'Serial', FastDACLoopback)
+"""
+from typing import Callable, List, Optional
+
+
+class LoopbackSerial:
+	"""
+	Minimal in-memory replacement for ``serial.Serial``.
+
+	Args:
+		responder: called with the bytes of every write, returns the bytes
+			the device answers with. If None nothing is answered.
+		chunk_size: maximum number of bytes returned by a single ``read``,
+			to emulate replies arriving in pieces.
+	"""
+
+	def __init__(self, responder: Optional[Callable[[bytes], bytes]] = None,
+				 chunk_size: Optional[int] = None):
+		self.responder = responder
+		self.chunk_size = chunk_size
+		self.port = None
+		self.portstr = 'loopback'
+		self.baudrate = None
+		self.bytesize = None
+		self.parity = None
+		self.stopbits = None
+		self.timeout = None
+		self.xonxoff = False
+		self.rtscts = False
+		self.dsrdtr = False
+		self._is_open = False
+		self._buffer = bytearray()
+		self.written: List[bytes] = []
+		self.write_calls = 0
+		self.read_calls = 0
+
+	def open(self):
+		self._is_open = True
+
+	def close(self):
+		self._is_open = False
+
+	def isOpen(self):
+		return self._is_open
+
+	is_open = property(isOpen)
+
+	@property
+	def in_waiting(self):
+		return len(self._buffer)
+
+	def flushInput(self):
+		self._buffer.clear()
+
+	reset_input_buffer = flushInput
+
+	def write(self, data):
+		data = bytes(data)
+		self.write_calls += 1
+		self.written.append(data)
+		if self.responder is not None:
+			self._buffer += self.responder(data)
+		return len(data)
+
+	def read(self, size=1):
+		self.read_calls += 1
+		if self.chunk_size is not None:
+			size = min(size, self.chunk_size)
+		data = bytes(self._buffer[:size])
+		del self._buffer[:size]
+		return data
+
+
+class DACRackEmulator:
+	"""
+	Responder for ``LoopbackSerial`` emulating the command set of the IST
+	DAC racks: read all dacs (``010``), write a dac (``100``, 4 byte
+	acknowledge), fast write a dac (``110``) and fast write dacs 1-4
+	(``101``), both without acknowledge.
+
+	Args:
+		numdacs: number of dacs in the rack
+	"""
+
+	def __init__(self, numdacs: int = 16):
+		self.codes = [0] * numdacs
+
+	def __call__(self, data: bytes) -> bytes:
+		reply = bytearray()
+		i = 0
+		while i < len(data):
+			op = data[i] >> 5
+			channel = data[i] & 0b11111
+			if op == 0b010:
+				reply += bytes(4)
+				for ch, code in enumerate(self.codes):
+					reply += bytes([ch]) + code.to_bytes(3, 'big')
+				i += 1
+			elif op == 0b101:
+				for ch in range(4):
+					start = i + 1 + 3 * ch
+					self.codes[ch] = int.from_bytes(data[start:start + 3],
+													'big')
+				i += 13
+			elif op in (0b100, 0b110):
+				self.codes[channel] = int.from_bytes(data[i + 1:i + 4], 'big')
+				if op == 0b100:
+					reply += data[i:i + 4]
+				i += 4
+			else:
+				i += 1
+		return bytes(reply)
+
+
+class FastDACLoopback(LoopbackSerial):
+	"""
+	``LoopbackSerial`` connected to a 16 dac ``DACRackEmulator``.
+	"""
+
+	def __init__(self, *args, **kwargs):
+		self.rack = DACRackEmulator(16)
+		super().__init__(responder=self.rack)
+
+
+class IST20Loopback(LoopbackSerial):
+	"""
+	``LoopbackSerial`` connected to a 32 dac ``DACRackEmulator``.
+	"""
+
+	def __init__(self, *args, **kwargs):
+		self.rack = DACRackEmulator(32)
+		super().__init__(responder=self.rack)
@@ -0,0 +1,35 @@
+import logging
+import time
+from typing import List
+
+
+log = logging.getLogger(__name__)
+
+
+def read_bytes(ser, bytestoread: int, timeout: float) -> List[int]:
+	"""
+	Reads a reply of known length from a serial port in as few ``read``
+	calls as possible.
+
+	Every ``read`` asks for all the bytes still missing, so the reply is
+	normally collected in one call instead of one call per byte. Reading
+	stops when the reply is complete or ``timeout`` seconds have passed.
+
+	Args:
+		ser: an open ``serial.Serial`` (or compatible) port
+		bytestoread: number of bytes expected
+		timeout: deadline in seconds for the complete reply
+
+	Returns:
+		the received bytes as a list of integers, which is shorter than
+		``bytestoread`` if the deadline was hit
+	"""
+	data = bytearray()
+	deadline = time.perf_counter() + timeout
+	while len(data) < bytestoread:
+		data += ser.read(bytestoread - len(data))
+		if len(data) < bytestoread and time.perf_counter() > deadline:
+			log.warning('Timeout reading reply, received %d of %d bytes',
+						len(data), bytestoread)
+			break
+	return list(data)
@@ -1,7 +1,8 @@
 import logging
 from functools import partial
 from threading import RLock
-from typing import List, Union, Optional, Dict, Any
+from typing import List, Union, Optional, Dict, Any, Iterable
+import numpy as np
 from qcodes import validators as validator
 
 from .SD_Module import SD_Module, result_parser, keysightSD1, is_sd1_3x
@@ -47,6 +48,8 @@ class SD_AWG(SD_Module):
 
         # Lock to avoid concurrent access of waveformLoad()/waveformReLoad()
         self._lock = RLock()
+        # FPGA sandbox registers by name, valid until a new image is loaded
+        self._fpga_registers: Dict[str, Any] = {}
 
         # store card-specifics
         self.channels: int = channels
@@ -1011,10 +1014,24 @@ class SD_AWG(SD_Module):
             filename: name of image file to load
         """
         with self._lock:
+            self._fpga_registers.clear()
             logging.info(f'loading fpga image "{filename}" ...')
             super().load_fpga_image(filename)
             logging.info(f'loaded fpga image.')
 
+    def _get_fpga_register(self, reg_name: str) -> Any:
+        """
+        Returns the sandbox register with the specified name. The register
+        objects are looked up once and reused until a new FPGA image is
+        loaded. Must be called with the lock held.
+        """
+        reg = self._fpga_registers.get(reg_name)
+        if reg is None:
+            reg = result_parser(self.awg.FPGAgetSandBoxRegister(reg_name),
+                                reg_name)
+            self._fpga_registers[reg_name] = reg
+        return reg
+
     def write_fpga(self, reg_name:str, value:int) -> None:
         """
         Writes a single 32-bit value to the specified FPGA register.
@@ -1024,9 +1041,19 @@ class SD_AWG(SD_Module):
             value: 32-bit value
         """
         with self._lock:
-            reg = result_parser(self.awg.FPGAgetSandBoxRegister(reg_name),
-                                reg_name)
-            reg.writeRegisterInt32(value)
+            self._get_fpga_register(reg_name).writeRegisterInt32(value)
+
+    def write_fpga_registers(self, values: Dict[str, int]) -> None:
+        """
+        Writes 32-bit values to several FPGA registers, holding the lock
+        for all writes.
+
+        Args:
+            values: 32-bit values by register name
+        """
+        with self._lock:
+            for reg_name, value in values.items():
+                self._get_fpga_register(reg_name).writeRegisterInt32(value)
 
     def read_fpga(self, reg_name:str) -> int:
         """
@@ -1039,14 +1066,29 @@ class SD_AWG(SD_Module):
             32-bit register value
         """
         with self._lock:
-            reg = result_parser(self.awg.FPGAgetSandBoxRegister(reg_name),
-                                reg_name)
+            reg = self._get_fpga_register(reg_name)
             if reg.Address > 2**24 or reg.Address < 0:
                 raise Exception(f'Register out of range: Reg {reg.Address:6} '
                                 f'({reg.Length:6}) {reg_name}')
             return reg.readRegisterInt32()
 
-    def write_fpga_array(self, reg_name:str, offset:int, data:List[int],
+    def read_fpga_registers(self, reg_names: Iterable[str]) -> Dict[str, int]:
+        """
+        Reads 32-bit values from several FPGA registers, holding the lock
+        for all reads.
+
+        Args:
+            reg_names: names of registers
+
+        Returns:
+            32-bit register values by register name
+        """
+        with self._lock:
+            return {reg_name: self.read_fpga(reg_name)
+                    for reg_name in reg_names}
+
+    def write_fpga_array(self, reg_name:str, offset:int,
+                         data:Union[List[int], np.ndarray],
                          fixed_address:bool=False) -> None:
         """
         Writes a list of 32-bit values to the specified FPGA memory.
@@ -1054,52 +1096,66 @@ class SD_AWG(SD_Module):
         Args:
             reg_name: name of memory
             offset: offset in memory block
-            data: list of 32-bit values
+            data: list or array of 32-bit values. A contiguous np.int32
+                array is passed on without conversion. Unsigned values of
+                2**31 and above wrap around to negative values.
             fixed_address:
                 if True all data will be written sequentially to address specified by offset,
                 else data will be written to consecutive addresses starting at offset
         """
+        if isinstance(data, np.ndarray):
+            buffer = np.ascontiguousarray(data.astype(np.int32, copy=False))
+        else:
+            # wraps unsigned register words, as ctypes did for lists
+            buffer = np.asarray(data, dtype=np.int64).astype(np.int32)
+        addressing_mode = (keysightSD1.SD_AddressingMode.FIXED if fixed_address
+                           else keysightSD1.SD_AddressingMode.AUTOINCREMENT)
         with self._lock:
-            reg = result_parser(self.awg.FPGAgetSandBoxRegister(reg_name),
-                                reg_name)
             result_parser(
-                reg.writeRegisterBuffer(
-                    offset, data,
-                    keysightSD1.SD_AddressingMode.FIXED
-                    if fixed_address else keysightSD1.SD_AddressingMode.AUTOINCREMENT,
+                self._get_fpga_register(reg_name).writeRegisterBuffer(
+                    offset, buffer, addressing_mode,
                     keysightSD1.SD_AccessMode.DMA
                 ),
                 f'write_fpga_array({reg_name})'
             )
 
     def read_fpga_array(self, reg_name:str, offset:int, data_size:int,
-                        fixed_address:bool=False) -> List[int]:
+                        fixed_address:bool=False,
+                        out:Optional[np.ndarray]=None) -> np.ndarray:
         """
         Reads a list of 32-bit values from the specified FPGA memory.
 
         Args:
             reg_name: name of memory
             offset: offset in memory block
+            data_size: number of values to read
             fixed_address:
                 if True all data will be read sequentially from address specified by offset,
                 else data will be read from consecutive addresses starting at offset
+            out: optional preallocated np.int32 array of data_size values
+                to store the data in. The SD1 library still returns a new
+                list, which is copied into out.
 
         Returns:
-            list of 32-bit values
+            np.int32 array of 32-bit values, out if it was specified.
         """
+        if out is not None and (out.dtype != np.int32 or out.size != data_size):
+            raise ValueError(f'out must be an int32 array of {data_size} '
+                             f'values, got {out.dtype} array of {out.size}')
+        addressing_mode = (keysightSD1.SD_AddressingMode.FIXED if fixed_address
+                           else keysightSD1.SD_AddressingMode.AUTOINCREMENT)
         with self._lock:
-            reg = result_parser(self.awg.FPGAgetSandBoxRegister(reg_name),
-                                reg_name)
             data = result_parser(
-                reg.readRegisterBuffer(
-                    offset, data_size,
-                    keysightSD1.SD_AddressingMode.FIXED
-                    if fixed_address else keysightSD1.SD_AddressingMode.AUTOINCREMENT,
+                self._get_fpga_register(reg_name).readRegisterBuffer(
+                    offset, data_size, addressing_mode,
                     keysightSD1.SD_AccessMode.DMA
                 ),
                 f'read_fpga_array({reg_name})'
             )
-            return data
+        if out is None:
+            return np.asarray(data, dtype=np.int32)
+        out[...] = data
+        return out
 
     def config_fpga_trigger(self,
                             trigger:SD_TriggerExternalSources,
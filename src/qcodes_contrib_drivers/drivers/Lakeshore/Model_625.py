@@ -6,6 +6,8 @@ from typing import Union, Tuple, Optional
 from qcodes import VisaInstrument
 from qcodes.utils.validators import  Numbers, Enum
 
+from qcodes_contrib_drivers.drivers._ramp_monitor import RampMonitor
+
 
 class Lakeshore625(VisaInstrument):
     """
@@ -235,6 +237,12 @@ class Lakeshore625(VisaInstrument):
         else:
             self.field_ramp_rate.get()
 
+        # waits for the end of blocking ramps, see set_field
+        self.ramp_monitor = RampMonitor(self._get_field_and_ramping_state,
+                                        rate=lambda: self.field_ramp_rate.get_latest() / 60,
+                                        min_interval=0.3,
+                                        sleep=self._sleep)
+
         # print connect message
         self.connect_message()
 
@@ -444,6 +452,14 @@ class Lakeshore625(VisaInstrument):
             ramping state
         """
         operation_condition_register = self.ask('OPST?')
+        return self._parse_ramping_state(operation_condition_register)
+
+
+    @staticmethod
+    def _parse_ramping_state(operation_condition_register: str) -> str:
+        """
+        Parses the response to OPST? into the ramping state
+        """
         bin_OPST = bin(int(operation_condition_register))[2:]
         if len(bin_OPST)<2:
             rampbit = 1
@@ -456,6 +472,19 @@ class Lakeshore625(VisaInstrument):
             return 'ramping'
 
 
+    def _get_field_and_ramping_state(self) -> Tuple[float, bool]:
+        """
+        Gets the field and whether the power supply is ramping with a single query
+
+        Returns
+        -------
+            field (T), ramping
+        """
+        field, operation_condition_register = self.ask('RDGF?;OPST?').split(';')
+        ramping = self._parse_ramping_state(operation_condition_register) == 'ramping'
+        return float(field), ramping
+
+
     def _get_operational_errors(self) -> str:
         """
         Error Status Query
@@ -588,6 +617,10 @@ class Lakeshore625(VisaInstrument):
         """
         Ramp to a certain field
 
+        While blocking, the field and ramping state are polled by the
+        ``ramp_monitor``, which sleeps for most of the expected remaining ramp
+        time between the polls.
+
         Args:
             value: field setpoint
             block: Whether to wait until the field has finished setting
@@ -601,8 +634,8 @@ class Lakeshore625(VisaInstrument):
         # Otherwise, wait until no longer ramping
         self.log.debug(f'Starting blocking ramp of {self.name} to {value}')
         self._sleep(0.5)    # wait for a short time for the power supply to fall into the ramping state
-        while self.ramping_state() == 'ramping':
-            self._sleep(0.3)
+        self.ramp_monitor.wait(value)
+        self.ramping_state.cache.set('not ramping')
         self._sleep(2.0)
         self.log.debug(f'Finished blocking ramp')
         return
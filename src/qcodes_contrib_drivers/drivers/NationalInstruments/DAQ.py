@@ -6,16 +6,18 @@ This was written for/tested with National Instruments USB-6363 DAQ,
 but the nidaqmx API is pretty general, so I expect it will work with other devices
 with minimal changes.
 
-For an example of synchronously writing data to multiple analog outputs and
-acquiring data on multiple analog inputs, see
+For synchronously writing data to multiple analog outputs and acquiring data
+on multiple analog inputs, see DAQSynchronizedSweep, or the example at
 https://scanning-squid.readthedocs.io/en/latest/_modules/microscope/susceptometer.html#SusceptometerMicroscope.scan_surface
 """
 
-from typing import Dict, Optional, Sequence, Any, Union
+from typing import Dict, Optional, Sequence, Any, Tuple, Union
 import numpy as np
 
 import nidaqmx
 from nidaqmx.constants import AcquisitionType, TaskMode
+from nidaqmx.stream_readers import AnalogMultiChannelReader
+from nidaqmx.stream_writers import AnalogMultiChannelWriter
 from qcodes.instrument.base import Instrument
 from qcodes.instrument.parameter import Parameter, ArrayParameter, ParameterWithSetpoints
 from qcodes.utils.helpers import create_on_off_val_mapping
@@ -39,13 +41,19 @@ class DAQAnalogInputVoltages(ArrayParameter):
         self.nchannels, self.target_points = shape
         self.samples_to_read = samples_to_read
         self.timeout = timeout
-        
+        # The task and the read buffer are reused for every acquisition
+        self._reader = AnalogMultiChannelReader(task.in_stream)
+        self._buffer = np.zeros((self.nchannels, samples_to_read))
+
     def get_raw(self):
         """Averages data to get `self.target_points` points per channel.
         If `self.target_points` == `self.samples_to_read`, no averaging is done.
         """
-        data_raw = np.array(self.task.read(number_of_samples_per_channel=self.samples_to_read, timeout=self.timeout))
-        return np.mean(np.reshape(data_raw, (self.nchannels, self.target_points, -1)), 2)
+        # Like Task.read, this starts the task if it is not running
+        self._reader.read_many_sample(
+            self._buffer, number_of_samples_per_channel=self.samples_to_read,
+            timeout=self.timeout)
+        return np.mean(np.reshape(self._buffer, (self.nchannels, self.target_points, -1)), 2)
     
 class DAQAnalogInputs(Instrument):
     """Instrument to acquire DAQ analog input data in a qcodes Loop or measurement.
@@ -118,6 +126,10 @@ class DAQAnalogOutputVoltage(Parameter):
     """Writes data to one or several DAQ analog outputs. This only writes one channel at a time,
     since Qcodes ArrayParameters are not settable.
 
+    The task of the channel is created on the first write and kept until
+    `release` is called. A voltage equal to the last one written is not
+    written again.
+
     Args:
         name: Name of parameter (usually 'voltage').
         dev_name: DAQ device name (e.g. 'Dev1').
@@ -129,14 +141,27 @@ class DAQAnalogOutputVoltage(Parameter):
         self.dev_name = dev_name
         self.idx = idx
         self._voltage = np.nan
-     
+        self._task: Optional[Any] = None
+
     def set_raw(self, voltage: Union[int, float]) -> None:
-        with nidaqmx.Task('daq_ao_task') as ao_task:
+        if voltage == self._voltage:
+            return
+        if self._task is None:
+            self._task = nidaqmx.Task()
             channel = f'{self.dev_name}/ao{self.idx}'
-            ao_task.ao_channels.add_ao_voltage_chan(channel, self.name)
-            ao_task.write(voltage, auto_start=True)
+            self._task.ao_channels.add_ao_voltage_chan(channel, self.name)
+        # The on-demand task is reserved only while writing, so the channel
+        # can be used by hardware-timed tasks in between.
+        self._task.write(voltage, auto_start=True)
         self._voltage = voltage
 
+    def release(self) -> None:
+        """Closes the task of the channel. The next write creates a new one.
+        """
+        if self._task is not None:
+            self._task.close()
+            self._task = None
+
     def get_raw(self):
         """Returns last voltage array written to outputs.
         """
@@ -166,7 +191,141 @@ class DAQAnalogOutputs(Instrument):
                 label='Voltage',
                 unit='V'
             )
-            
+
+    def close(self) -> None:
+        for param in self.parameters.values():
+            if isinstance(param, DAQAnalogOutputVoltage):
+                param.release()
+        super().close()
+
+
+class DAQSynchronizedSweep(Instrument):
+    """Hardware-timed sweep of DAQ analog outputs with synchronous acquisition
+    of DAQ analog inputs.
+
+    The setpoints of all outputs are written to the AO buffer in one
+    operation, and the inputs are sampled on the AO sample clock, so that
+    input sample k is acquired at the clock edge that outputs setpoint k.
+    The AO and AI tasks are created once and reused for every sweep; their
+    timing is only reconfigured when the number of points or ``rate``
+    changes.
+
+    Args:
+        name: Name of instrument (usually 'daq_sweep').
+        dev_name: NI DAQ device name (e.g. 'Dev1').
+        rate: Sample rate per channel in Hz.
+        ao_channels: Dict of analog output channel configuration.
+        ai_channels: Dict of analog input channel configuration.
+        min_val: minimum of input voltage range.
+        max_val: maximum of input voltage range.
+        outputs: DAQAnalogOutputs instrument of the same device. Its tasks on
+            the swept channels are released before a sweep, and its voltages
+            are updated to the last setpoints after the sweep.
+        timeout: Sweep timeout in seconds, in addition to the sweep duration.
+        kwargs: Keyword arguments to be passed to Instrument constructor.
+    """
+    def __init__(self, name: str, dev_name: str, rate: Union[int, float],
+                 ao_channels: Dict[str, int], ai_channels: Dict[str, int],
+                 min_val: float = -5, max_val: float = 5,
+                 outputs: Optional[DAQAnalogOutputs] = None,
+                 timeout: Union[float, int] = 10, **kwargs) -> None:
+        super().__init__(name, **kwargs)
+        self.dev_name = dev_name
+        self.rate = rate
+        self.timeout = timeout
+        self.outputs = outputs
+        self.ao_channels = ao_channels
+        self.ai_channels = ai_channels
+        self.metadata.update({
+            'dev_name': dev_name,
+            'rate': f'{rate} Hz',
+            'ao_channels': ao_channels,
+            'ai_channels': ai_channels})
+
+        self._ao_task = nidaqmx.Task()
+        for ch, idx in ao_channels.items():
+            self._ao_task.ao_channels.add_ao_voltage_chan(f'{dev_name}/ao{idx}', ch)
+        self._ai_task = nidaqmx.Task()
+        for ch, idx in ai_channels.items():
+            self._ai_task.ai_channels.add_ai_voltage_chan(
+                f'{dev_name}/ai{idx}', ch, min_val=min_val, max_val=max_val)
+        self._writer = AnalogMultiChannelWriter(self._ao_task.out_stream, auto_start=False)
+        self._reader = AnalogMultiChannelReader(self._ai_task.in_stream)
+        self._buffer = np.zeros((len(ai_channels), 0))
+        self._timing: Optional[Tuple[Union[int, float], int]] = None
+
+    def _configure(self, npts: int) -> None:
+        if self._timing == (self.rate, npts):
+            return
+        self._ao_task.timing.cfg_samp_clk_timing(
+            self.rate,
+            sample_mode=AcquisitionType.FINITE,
+            samps_per_chan=npts)
+        self._ai_task.timing.cfg_samp_clk_timing(
+            self.rate,
+            source=f'/{self.dev_name}/ao/SampleClock',
+            sample_mode=AcquisitionType.FINITE,
+            samps_per_chan=npts)
+        if self._buffer.shape[1] != npts:
+            self._buffer = np.zeros((len(self.ai_channels), npts))
+        self._timing = (self.rate, npts)
+
+    def sweep(self, setpoints: Union[Sequence[Sequence[float]], np.ndarray]) -> np.ndarray:
+        """Outputs the setpoints and acquires the inputs synchronously.
+
+        Args:
+            setpoints: Array of shape (number of AO channels, points), in the
+                order of ao_channels. A 1D array for a single AO channel.
+
+        Returns:
+            Array of shape (number of AI channels, points), in the order of
+            ai_channels.
+        """
+        data = np.ascontiguousarray(setpoints, dtype=np.float64)
+        data = data.reshape(len(self.ao_channels), -1)
+        npts = data.shape[1]
+        if npts < 2:
+            raise ValueError('A hardware-timed sweep needs at least 2 points.')
+        if self.outputs is not None:
+            swept = set(self.ao_channels.values())
+            for param in self.outputs.parameters.values():
+                if isinstance(param, DAQAnalogOutputVoltage) and param.idx in swept:
+                    param.release()
+                    # unknown until the sweep completes, so that the next
+                    # write is not skipped if the sweep fails
+                    param._voltage = np.nan
+
+        self._configure(npts)
+        timeout = self.timeout + npts / self.rate
+        self._writer.write_many_sample(data, timeout=timeout)
+        # The inputs wait for the AO sample clock, so they are started first
+        self._ai_task.start()
+        try:
+            self._ao_task.start()
+            try:
+                self._reader.read_many_sample(
+                    self._buffer, number_of_samples_per_channel=npts,
+                    timeout=timeout)
+                self._ao_task.wait_until_done(timeout=timeout)
+            finally:
+                self._ao_task.stop()
+        finally:
+            self._ai_task.stop()
+
+        if self.outputs is not None:
+            last = dict(zip(self.ao_channels.values(), data[:, -1].tolist()))
+            for param in self.outputs.parameters.values():
+                if isinstance(param, DAQAnalogOutputVoltage) and param.idx in last:
+                    param._voltage = last[param.idx]
+                    param.cache.set(last[param.idx])
+        return self._buffer.copy()
+
+    def close(self) -> None:
+        self._ao_task.close()
+        self._ai_task.close()
+        super().close()
+
+
 class DAQDigitalOutputState(Parameter):
     """Writes data to one or several DAQ digital outputs.
 
@@ -48,6 +48,7 @@ class NI_PXIe_2597(NI_Switch):
             self.channels.com.connect_to(ch)
 
     def _get_channel(self) -> Optional[str]:
+        self._ensure_connections()
         com_list = self.channels.com.connection_list
         if len(com_list) == 0:
             return None
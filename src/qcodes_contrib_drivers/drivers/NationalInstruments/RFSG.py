@@ -85,6 +85,16 @@ class NationalInstruments_RFSG(NIDLLInstrument):
     dll_path = r"C:\Program Files\IVI Foundation\IVI\bin\NiRFSG_64.dll"
     # C:\Program Files (x86)\IVI Foundation\IVI\bin\NiRFSG.dll for 32-bit
 
+    # these are read from the device only once per session
+    immutable_attributes = (
+        NIRFSG_ATTR_INSTRUMENT_FIRMWARE_REVISION,
+        NIRFSG_ATTR_INSTRUMENT_MANUFACTURER,
+        NIRFSG_ATTR_INSTRUMENT_MODEL,
+        NIRFSG_ATTR_SPECIFIC_DRIVER_VENDOR,
+        NIRFSG_ATTR_SPECIFIC_DRIVER_REVISION,
+        NIRFSG_ATTR_SERIAL_NUMBER,
+    )
+
     def __init__(self, name: str, resource: str,
                  dll_path: Optional[str] = None,
                  id_query: bool = False,
@@ -240,12 +250,15 @@ class NationalInstruments_RFSG(NIDLLInstrument):
             self.initiate()
 
     def _set_frequency(self, frequency: float, initiate: bool = False):
-        power_level = self.get_attribute(NIRFSG_ATTR_POWER_LEVEL)
-        self._configure_rf(frequency, power_level, initiate)
+        # no other thread may change the power level in between
+        with self.wrapper.session_lock(self._handle):
+            power_level = self.get_attribute(NIRFSG_ATTR_POWER_LEVEL)
+            self._configure_rf(frequency, power_level, initiate)
 
     def _set_power_level(self, power_level: float, initiate: bool = False):
-        frequency = self.get_attribute(NIRFSG_ATTR_FREQUENCY)
-        self._configure_rf(frequency, power_level, initiate)
+        with self.wrapper.session_lock(self._handle):
+            frequency = self.get_attribute(NIRFSG_ATTR_FREQUENCY)
+            self._configure_rf(frequency, power_level, initiate)
 
     @property
     def vendor(self) -> str:
@@ -264,11 +277,17 @@ class NationalInstruments_RFSG(NIDLLInstrument):
         return self.get_attribute(NIRFSG_ATTR_INSTRUMENT_FIRMWARE_REVISION)
 
     def get_idn(self):
+        vendor, model, serial, firmware = self.get_attributes([
+                NIRFSG_ATTR_SPECIFIC_DRIVER_VENDOR,
+                NIRFSG_ATTR_INSTRUMENT_MODEL,
+                NIRFSG_ATTR_SERIAL_NUMBER,
+                NIRFSG_ATTR_INSTRUMENT_FIRMWARE_REVISION,
+        ])
         return {
-                "vendor": self.vendor,
-                "model": self.model,
-                "serial": self.serial,
-                "firmware": self.firmware
+                "vendor": vendor,
+                "model": model,
+                "serial": serial,
+                "firmware": firmware
         }
 
 # class NationalInstruments_RFSG
@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, List, Optional, cast
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union, cast
 
 from niswitch import PathCapability, Session
 from qcodes import ChannelList, Instrument, InstrumentChannel
@@ -18,6 +18,11 @@ class NI_Switch(Instrument):
     Actually making connections between the channels is implemented by the
     ``SwitchChannel`` class.
 
+    The connections between the channels are read from the driver once, and
+    afterwards kept up to date by the methods of this driver. Call
+    ``invalidate_connections`` if the switch may have been changed by other
+    means, then the connections are read again when they are needed next.
+
     Tested with
 
     - NI PXI-2597
@@ -45,6 +50,7 @@ class NI_Switch(Instrument):
             niswitch_kw = {}
         self.session = Session(resource, reset_device=reset_device,
                                **niswitch_kw)
+        self._idn: Optional[Dict[str, str]] = None
 
         new_channels = ChannelList(self, "all_channels", SwitchChannel)
         for i in range(self.session.channel_count):
@@ -54,19 +60,93 @@ class NI_Switch(Instrument):
             new_channels.append(ch)
         new_channels.lock()
         self.add_submodule("channels", new_channels)
-        self.snapshot(update=True)  # make all channels read their conenctions
+        self.sync_connections()
 
         self.connect_message()
 
+    def sync_connections(self) -> None:
+        """
+        Reads the connections between all channels from the driver. Every pair
+        of channels is queried once.
+        """
+        channels = list(self.channels)
+        for ch in channels:
+            ch.connection_list.clear()
+        for i, ch in enumerate(channels):
+            for other in channels[i + 1:]:
+                status = self.session.can_connect(ch.raw_name, other.raw_name)
+                if status == PathCapability.PATH_EXISTS:
+                    ch.connection_list.append(other)
+                    other.connection_list.append(ch)
+        self._connections_synced = True
+
+    def invalidate_connections(self) -> None:
+        """
+        Marks the known connections as outdated, so that they are read from
+        the driver when they are needed next.
+        """
+        self._connections_synced = False
+
+    def _ensure_connections(self) -> None:
+        if not self._connections_synced:
+            self.sync_connections()
+
     def disconnect_all(self) -> None:
         self.session.disconnect_all()
-        self.snapshot(update=True)
+        for ch in self.channels:
+            ch.connection_list.clear()
+            ch.connections.cache.set([])
+        self._connections_synced = True
+
+    def apply_routes(self, routes: Iterable[Tuple[Union["SwitchChannel", str],
+                                                  Union["SwitchChannel", str]]]
+                     ) -> None:
+        """
+        Connects the given pairs of channels, and disconnects all other
+        connections. Connections that already exist are left untouched, so the
+        number of driver calls is proportional to the number of changed
+        connections.
+
+        Args:
+            routes: Pairs of channels, or channel names, to connect.
+        """
+        self._ensure_connections()
+        validator = self.channels.get_validator()
+
+        desired: Set[Tuple["SwitchChannel", "SwitchChannel"]] = set()
+        channel_index = {ch: i for i, ch in enumerate(self.channels)}
+        for route in routes:
+            pair = []
+            for ch in route:
+                if isinstance(ch, str):
+                    ch = getattr(self.channels, ch)
+                validator.validate(ch)
+                pair.append(ch)
+            a, b = sorted(pair, key=channel_index.__getitem__)
+            if a is b:
+                raise ValueError(f"Cannot connect {a.short_name} to itself.")
+            desired.add((a, b))
+
+        current: Set[Tuple["SwitchChannel", "SwitchChannel"]] = set()
+        for a in self.channels:
+            for b in a.connection_list:
+                if channel_index[a] < channel_index[b]:
+                    current.add((a, b))
+
+        for a, b in current - desired:
+            a.disconnect_from(b)
+        for a, b in desired - current:
+            a._connect(b)
 
     def get_idn(self):
-        return {'vendor': self.session.instrument_manufacturer,
+        # the identification does not change during a session
+        if self._idn is None:
+            self._idn = {
+                'vendor': self.session.instrument_manufacturer,
                 'model': self.session.instrument_model,
                 'serial': self.session.serial_number,
                 'firmware': self.session.instrument_firmware_revision}
+        return dict(self._idn)
 
     def close(self):
         if hasattr(self, "session"):
@@ -102,20 +182,11 @@ class SwitchChannel(InstrumentChannel):
                            set_cmd=False,
                            )
 
-    def _update_connection_list(self) -> None:
-        self.connection_list.clear()
-        for ch in self.root_instrument.channels:
-            if ch is self:
-                continue
-            status = self._session.can_connect(self.raw_name, ch.raw_name)
-            if status == PathCapability.PATH_EXISTS:
-                self.connection_list.append(ch)
-
     def _read_connections(self) -> List[str]:
         r"""
         Returns a list of the channels to which this channel is connected to.
         """
-        self._update_connection_list()
+        self.root_instrument._ensure_connections()
         return [ch.short_name for ch in self.connection_list]
 
     def connect_to(self, other: "SwitchChannel") -> None:
@@ -127,18 +198,19 @@ class SwitchChannel(InstrumentChannel):
         the ``niswitch.Session.connect`` documentation for further details.
         """
         self.root_instrument.channels.get_validator().validate(other)
+        self.root_instrument._ensure_connections()
 
-        status = self._session.can_connect(self.raw_name, other.raw_name)
-        if status == PathCapability.PATH_EXISTS:
+        if other in self.connection_list:
             # already connected, do nothing
             return
-        elif status == PathCapability.PATH_AVAILABLE:
-            # not connected
-            pass
-        elif status == PathCapability.RESOURCE_IN_USE:
+        status = self._session.can_connect(self.raw_name, other.raw_name)
+        if status == PathCapability.RESOURCE_IN_USE:
             # connected to something else
             self.disconnect_from_all()
             other.disconnect_from_all()
+        self._connect(other)
+
+    def _connect(self, other: "SwitchChannel") -> None:
         self._session.connect(self.raw_name, other.raw_name)
         self.connection_list.append(other)
         other.connection_list.append(self)
@@ -149,6 +221,7 @@ class SwitchChannel(InstrumentChannel):
         connected, raises a ``DriverError``.
         """
         self.root_instrument.channels.get_validator().validate(other)
+        self.root_instrument._ensure_connections()
         self._session.disconnect(self.raw_name, other.raw_name)
         other.connection_list.remove(self)
         self.connection_list.remove(other)
@@ -157,6 +230,7 @@ class SwitchChannel(InstrumentChannel):
         """
         Disconnect this channel from all channels it is connected to.
         """
+        self.root_instrument._ensure_connections()
         while len(self.connection_list) > 0:
             ch = cast(SwitchChannel, self.connection_list[0])
             self.disconnect_from(ch)
@@ -6,7 +6,10 @@ https://github.com/ni/nimi-python/blob/master/generated/nitclk/nitclk/_library.p
 
 import ctypes
 from ctypes import POINTER
-from typing import NamedTuple, Optional, List, Any, Callable
+from typing import (
+    NamedTuple, Optional, List, Any, Callable, Dict, Sequence, Union
+)
+import threading
 import warnings
 from dataclasses import dataclass
 from .visa_types import (
@@ -42,6 +45,28 @@ class NamedArgType(NamedTuple):
     argtype: Any
 
 
+class _SessionState(object):
+    """
+    Lock and reusable attribute value buffers of one session. The lock is
+    reentrant, so that a driver can hold it across several DLL calls, each of
+    which also takes it.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self.buffers: Dict[Any, Any] = {
+                dtype: dtype() for dtype in (ViBoolean, ViInt32, ViReal64)
+        }
+        self.refs = {dtype: ctypes.byref(buf)
+                     for dtype, buf in self.buffers.items()}
+        self.buffers[ViString] = ctypes.create_string_buffer(
+                STRING_BUFFER_SIZE)
+
+
+def _session_key(session: Union[ViSession, int]) -> int:
+    return session.value if isinstance(session, ViSession) else int(session)
+
+
 class NIDLLWrapper(object):
     """
     This class provides convenience functions for wrapping and checking a DLL
@@ -52,6 +77,9 @@ class NIDLLWrapper(object):
     ``wrap_dll_function_checked``. See the NI_RFSG driver for a concrete
     example.
 
+    Calls of wrapped functions whose first argument is a ``ViSession`` are
+    serialized per session with a reentrant lock, see ``session_lock``.
+
     Args:
         dll_path: path to the DLL file containing the library
         lib_prefix: All function names in the library start with this. For
@@ -62,6 +90,8 @@ class NIDLLWrapper(object):
     def __init__(self, dll_path: str, lib_prefix: str):
         self._dll = ctypes.cdll.LoadLibrary(dll_path)
         self._lib_prefix = lib_prefix
+        self._sessions: Dict[int, _SessionState] = {}
+        self._sessions_lock = threading.Lock()
 
         self._dtype_map = {
                 ViBoolean: "ViBoolean",
@@ -105,6 +135,7 @@ class NIDLLWrapper(object):
                 )
 
         # wrap GetAttribute<DataType> functions (see get_attribute method)
+        self._getters: Dict[Any, Callable] = {}
         for dtype, dtype_name in self._dtype_map.items():
 
             # argtypes for the GetAttribute<DataType> functions
@@ -133,6 +164,8 @@ class NIDLLWrapper(object):
                     getter_name,
                     argtypes=getter_argtypes)
             setattr(self, getter_name, getter_func)
+            # get_attributes holds the session lock itself
+            self._getters[dtype] = getter_func.dll_function  # type: ignore[attr-defined]
 
             setter_argtypes[-1] = NamedArgType("attributeValue", dtype)
 
@@ -156,18 +189,51 @@ class NIDLLWrapper(object):
                 types of the arguments of the function to be wrapped.
             restype: The return type of the library function (most likely
                 ``ViStatus``).
+
+        If the first argument is a ``ViSession``, the returned function holds
+        the lock of that session during the call.
         """
 
         if not name_in_library.startswith(self._lib_prefix):
             name_in_library = f"{self._lib_prefix}_{name_in_library}"
 
-        # TODO( mgunyho ): thread lock? (see nimi-python link at top of file)
         func = getattr(self._dll, name_in_library)
         func.restype = restype
         func.argtypes = [a.argtype for a in argtypes]
         func.argnames = [a.name for a in argtypes]  # just in case
 
-        return func
+        if not argtypes or argtypes[0].argtype is not ViSession:
+            return func
+
+        # like the per-session lock of nimi-python, see the link at the top
+        def locked_func(session: Union[ViSession, int], *args: Any) -> Any:
+            with self.session_lock(session):
+                return func(session, *args)
+
+        locked_func.dll_function = func  # type: ignore[attr-defined]
+        return locked_func
+
+    def _session_state(self, session: Union[ViSession, int]) -> _SessionState:
+        key = _session_key(session)
+        state = self._sessions.get(key)
+        if state is None:
+            with self._sessions_lock:
+                state = self._sessions.setdefault(key, _SessionState())
+        return state
+
+    def session_lock(self, session: Union[ViSession, int]) -> threading.RLock:
+        """
+        The reentrant lock of a session. Hold it to make a sequence of DLL
+        calls on the session atomic with respect to other threads.
+        """
+        return self._session_state(session).lock
+
+    def release_session(self, session: Union[ViSession, int]) -> None:
+        """
+        Forget the lock and buffers of a session, after it has been closed.
+        """
+        with self._sessions_lock:
+            self._sessions.pop(_session_key(session), None)
 
     def _check_error(self, error_code: int):
         """
@@ -195,17 +261,13 @@ class NIDLLWrapper(object):
         ``wrap_dll_function``, except that ``restype`` is always ``ViStatus``.
         """
 
-        func = self.wrap_dll_function(
+        # see https://docs.python.org/3/library/ctypes.html#return-types
+        return self.wrap_dll_function(
                 name_in_library=name_in_library,
                 argtypes=argtypes,
-                restype=ViStatus,
+                restype=self._check_error,
                 )
 
-        # see https://docs.python.org/3/library/ctypes.html#return-types
-        func.restype = self._check_error
-
-        return func
-
     def init(self, resource: str, id_query: bool = True,
              reset_device: bool = False) -> ViSession:
         """
@@ -238,23 +300,37 @@ class NIDLLWrapper(object):
 
         NOTE: channels are not implemented.
         """
-        dtype = attr.dtype
-        if dtype not in self._dtype_map:
-            raise ValueError(f"get_attribute() not implemented for {dtype}")
+        return self.get_attributes(session, [attr])[0]
 
-        dtype_name = self._dtype_map[dtype]
-        func = getattr(self, f"GetAttribute{dtype_name}")
-
-        if dtype == ViString:
-            res = ctypes.create_string_buffer(STRING_BUFFER_SIZE)
-            func(session, b"", attr.value, STRING_BUFFER_SIZE, res)
-            ret: Any = res.value.decode()
-        else:
-            res = dtype()
-            func(session, b"", attr.value, ctypes.byref(res))
-            ret = res.value
+    def get_attributes(self, session: ViSession,
+                       attrs: Sequence[AttributeWrapper]) -> List[Any]:
+        """
+        Get several attributes, see ``get_attribute``. The session lock is
+        taken once for all of them, and the values are read into the value
+        buffers of the session, which are allocated once per session.
 
-        return ret
+        NOTE: channels are not implemented.
+        """
+        for attr in attrs:
+            if attr.dtype not in self._dtype_map:
+                raise ValueError(
+                        f"get_attribute() not implemented for {attr.dtype}")
+
+        state = self._session_state(session)
+        values: List[Any] = []
+        with state.lock:
+            for attr in attrs:
+                dtype = attr.dtype
+                func = self._getters[dtype]
+                if dtype == ViString:
+                    buf = state.buffers[ViString]
+                    func(session, b"", attr.value, STRING_BUFFER_SIZE, buf)
+                    values.append(buf.value.decode())
+                else:
+                    func(session, b"", attr.value, state.refs[dtype])
+                    values.append(state.buffers[dtype].value)
+
+        return values
 
     def set_attribute(self, session: ViSession, attr: AttributeWrapper,
                       set_value: Any) -> Any:
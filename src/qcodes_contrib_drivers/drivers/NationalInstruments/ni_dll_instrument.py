@@ -4,7 +4,7 @@ libraries in the ``NIDLLWrapper`` class with ``qcodes.Instrument``.
 """
 
 from functools import partial
-from typing import Any
+from typing import Any, ClassVar, Dict, List, Sequence
 from qcodes import Instrument
 from .dll_wrapper import NIDLLWrapper, AttributeWrapper
 from .visa_types import ViSession
@@ -19,6 +19,10 @@ class NIDLLInstrument(Instrument):
     has some common methods implemented, such as ``init``, ``close`` and
     ``get_attribute``.
 
+    Attributes listed in ``immutable_attributes`` by a subclass do not change
+    during a session. They are read from the device once and then returned
+    from a cache.
+
     Args:
         name: Name for this instrument
         resource: Identifier for this instrument in NI MAX.
@@ -29,6 +33,8 @@ class NIDLLInstrument(Instrument):
         reset_device: whether to reset the device on initialization
     """
 
+    immutable_attributes: ClassVar[Sequence[AttributeWrapper]] = ()
+
     def __init__(self, name: str, resource: str, dll_path: str,
                  lib_prefix: str, id_query: bool = False,
                  reset_device: bool = False, **kwargs):
@@ -39,6 +45,10 @@ class NIDLLInstrument(Instrument):
 
         self.wrapper = NIDLLWrapper(dll_path=dll_path, lib_prefix=lib_prefix)
 
+        self._immutable_ids = {attr.value.value
+                               for attr in self.immutable_attributes}
+        self._attribute_cache: Dict[int, Any] = {}
+
         self._handle = self.init(id_query=id_query,
                                  reset_device=reset_device)
 
@@ -54,6 +64,7 @@ class NIDLLInstrument(Instrument):
         Returns:
             the ViSession handle of the initialized device
         """
+        self._attribute_cache.clear()
         return self.wrapper.init(self.resource, id_query=id_query,
                                  reset_device=reset_device)
 
@@ -61,7 +72,23 @@ class NIDLLInstrument(Instrument):
         self.wrapper.reset(self._handle)
 
     def get_attribute(self, attr: AttributeWrapper) -> Any:
-        return self.wrapper.get_attribute(self._handle, attr)
+        return self.get_attributes([attr])[0]
+
+    def get_attributes(self, attrs: Sequence[AttributeWrapper]) -> List[Any]:
+        """
+        Get several attributes with one call of
+        ``NIDLLWrapper.get_attributes``. Cached immutable attributes are not
+        read again.
+        """
+        cache = self._attribute_cache
+        missing = [attr for attr in attrs if attr.value.value not in cache]
+        read = dict(zip((attr.value.value for attr in missing),
+                        self.wrapper.get_attributes(self._handle, missing)))
+        for attr_id, value in read.items():
+            if attr_id in self._immutable_ids:
+                cache[attr_id] = value
+        return [read[attr.value.value] if attr.value.value in read
+                else cache[attr.value.value] for attr in attrs]
 
     def set_attribute(self, attr: AttributeWrapper, set_value: Any):
         self.wrapper.set_attribute(self._handle, attr, set_value)
@@ -69,4 +96,5 @@ class NIDLLInstrument(Instrument):
     def close(self):
         if getattr(self, "_handle", None):
             self.wrapper.close(self._handle)
+            self.wrapper.release_session(self._handle)
         super().close()
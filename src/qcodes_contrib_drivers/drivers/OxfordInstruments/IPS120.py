@@ -15,6 +15,8 @@ from qcodes import validators as vals
 from time import sleep
 import pyvisa
 
+from qcodes_contrib_drivers.drivers._ramp_monitor import RampMonitor
+
 
 log = logging.getLogger(__name__)
 
@@ -209,6 +211,12 @@ class OxfordInstruments_IPS120(VisaInstrument):
                            unit='A',
                            get_cmd=self._get_trip_current)
 
+        # waits for the end of sweeps, see run_to_field_wait
+        self.ramp_monitor = RampMonitor(
+            self._get_field_and_sweeping,
+            rate=lambda: self.sweeprate_field.get_latest() / 60,
+            min_interval=0.5)
+
         if not self._use_gpib:
             self.visa_handle.set_visa_attribute(
                     pyvisa.constants.VI_ATTR_ASRL_STOP_BITS,
@@ -481,6 +489,20 @@ class OxfordInstruments_IPS120(VisaInstrument):
         result = self._execute('R7')
         return float(result.replace('R', ''))
 
+    def _get_field_and_sweeping(self):
+        """
+        Demand output field and whether the magnet is sweeping. The protocol
+        does not allow combining commands, so these are two queries.
+
+        Returns:
+            field (float) : magnetic field in Tesla
+            sweeping (bool) : True unless the sweep mode is "At rest"
+        """
+        field = float(self._execute('R7').replace('R', ''))
+        result = self._execute('X')
+        sweeping = int(result[11]) != 0
+        return field, sweeping
+
     def _get_field_setpoint(self):
         """
         Return the set point (target field)
@@ -793,6 +815,10 @@ class OxfordInstruments_IPS120(VisaInstrument):
         """
         Go to field value and wait until it's done sweeping.
 
+        The field and sweep mode are polled by the ``ramp_monitor``, which
+        sleeps for most of the expected remaining sweep time between the
+        polls.
+
         Args:
             field_value (float): the magnetic field value to go to in Tesla
         """
@@ -801,10 +827,7 @@ class OxfordInstruments_IPS120(VisaInstrument):
             self.field_setpoint(field_value)
             self.remote()
             self.to_setpoint()
-            magnet_mode = self.mode2()
-            while magnet_mode != self._GET_STATUS_MODE2[0]:
-                magnet_mode = self.mode2()
-                sleep(0.5)
+            self.ramp_monitor.wait(field_value)
         else:
             print('Switch heater is off, cannot change the field.')
         self.get_all()
@@ -2,10 +2,11 @@
 """ Developed and maintained by Oxford Instruments NanoScience """
 
 from functools import partial
-from typing import Any, Union
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
 import time
 import subprocess
 import platform
+import threading
 import numpy as np
 
 from qcodes.instrument import VisaInstrument
@@ -60,6 +61,153 @@ HE3_FLOW_METER_FITTED=False
 
 #############################################
 
+# oi.DECS commands sampled by the telemetry if none are given
+TELEMETRY_COMMANDS = (
+    "get_PT1_T1", "get_DR1_T", "get_PT2_T1", "get_DR2_T", "get_SRB_T",
+    "get_STILL_T", "get_CP_T", "get_MC_T", "get_SAMPLE_T",
+    "get_OVC_P", "get_P1_P", "get_P2_P", "get_P3_P", "get_P4_P",
+    "get_P5_P", "get_P6_P",
+)
+
+
+class DECSTelemetry:
+    """
+    Samples a set of oi.DECS get commands in a background thread.
+
+    The readings are stored in fixed-size ring buffers, ``values`` with one
+    row per command and ``times`` with the time of each sample. While the
+    telemetry is running, `oiDECS.ask` answers the sampled commands from
+    the latest sample if it is not older than ``max_age``, so that the
+    parameters of the instrument do not query the DECS socket themselves.
+
+    Args:
+        instrument: The oiDECS instrument to sample.
+        commands: oi.DECS get commands to sample, e.g. 'get_MC_T'.
+        interval: Time between samples in seconds.
+        buffer_size: Number of samples kept per command.
+        max_age: Maximum age in seconds of a sample used to answer a get.
+            Defaults to twice the interval.
+    """
+
+    def __init__(self, instrument: 'oiDECS',
+                 commands: Sequence[str] = TELEMETRY_COMMANDS,
+                 interval: float = 1.0,
+                 buffer_size: int = 3600,
+                 max_age: Optional[float] = None):
+        self.instrument = instrument
+        self.commands = tuple(commands)
+        self.interval = interval
+        self.max_age = 2 * interval if max_age is None else max_age
+        self.times = np.full(buffer_size, np.nan)
+        self.values = np.full((len(self.commands), buffer_size), np.nan)
+        self.samples = 0
+        self._rows = {cmd: n for n, cmd in enumerate(self.commands)}
+        self._latest: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def buffer_size(self) -> int:
+        return self.times.size
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Starts sampling in a background thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f'{self.instrument.name}_telemetry',
+            daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops sampling and waits for the background thread to end."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def sample(self) -> None:
+        """
+        Reads all commands once and stores the readings as one sample.
+        """
+        values = np.full(len(self.commands), np.nan)
+        responses = {}
+        for cmd, row in self._rows.items():
+            resp = self.instrument._query(cmd)
+            responses[cmd] = (time.time(), resp)
+            try:
+                values[row] = float(resp)
+            except ValueError:
+                # e.g. vectors, which are only kept as the latest response
+                pass
+        with self._lock:
+            index = self.samples % self.buffer_size
+            self.values[:, index] = values
+            self.times[index] = time.time()
+            self._latest.update(responses)
+            self.samples += 1
+
+    def latest(self, cmd: str, max_age: Optional[float] = None
+               ) -> Optional[str]:
+        """
+        Latest response to a sampled command, or None if the command is
+        not sampled or the response is older than max_age seconds.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            sample = self._latest.get(cmd)
+        if sample is None or time.time() - sample[0] > max_age:
+            return None
+        return sample[1]
+
+    def window(self, cmd: str, length: int) -> np.ndarray:
+        """
+        The last readings of a command, oldest first.
+
+        Args:
+            cmd: A sampled command.
+            length: Number of readings, at most the buffer size. Fewer are
+                returned if fewer samples were taken.
+        """
+        with self._lock:
+            length = min(length, self.samples, self.buffer_size)
+            indices = np.arange(self.samples - length, self.samples) \
+                % self.buffer_size
+            return self.values[self._rows[cmd], indices]
+
+    def is_stable(self, cmd: str, target: float, stable_mean: float,
+                  stable_std: float, length: int) -> bool:
+        """
+        True if the mean of the last readings of cmd deviates less than
+        stable_mean from target and their standard deviation is less than
+        stable_std. False as long as fewer than length samples were taken.
+        """
+        readings = self.window(cmd, length)
+        if readings.size < length:
+            return False
+        return bool(np.std(readings) < stable_std
+                    and np.abs(np.mean(readings) - target) < stable_mean)
+
+    def _run(self) -> None:
+        next_time = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                self.instrument.log.warning(f'Telemetry sample failed: {e}')
+            next_time += self.interval
+            # skip samples rather than catching up after a slow sample
+            now = time.perf_counter()
+            if next_time < now:
+                next_time = now
+            self._stop.wait(next_time - now)
+
 
 class MagneticFieldParameters(MultiParameter):
     """
@@ -160,6 +308,10 @@ class oiDECS(VisaInstrument):
         super().__init__(name, f'TCPIP::{HOST}::{PORT}::SOCKET', 
                          terminator=WRITE_DELIM, **kwargs)
 
+        # the telemetry thread and the caller share the DECS socket
+        self._io_lock = threading.RLock()
+        self.telemetry: Optional[DECSTelemetry] = None
+
         self.add_parameter(
             "PT1_Head_Temperature",
             unit="K",
@@ -372,6 +524,27 @@ class oiDECS(VisaInstrument):
 
         self.connect_message()
 
+    def start_telemetry(self, commands: Sequence[str] = TELEMETRY_COMMANDS,
+                        interval: float = 1.0, buffer_size: int = 3600,
+                        max_age: Optional[float] = None) -> DECSTelemetry:
+        """
+        Starts sampling oi.DECS commands in the background, see
+        `DECSTelemetry`. A running telemetry is stopped and replaced.
+
+        Returns:
+            The telemetry, also available as ``self.telemetry``.
+        """
+        self.stop_telemetry()
+        self.telemetry = DECSTelemetry(self, commands, interval, buffer_size,
+                                       max_age)
+        self.telemetry.start()
+        return self.telemetry
+
+    def stop_telemetry(self) -> None:
+        """Stops the background sampling. The buffers are kept."""
+        if self.telemetry is not None:
+            self.telemetry.stop()
+
     def publish(self, msg, msg_group):
         """Function to publish an 'event'"""
         self._param_setter("PUBLISH", f"{msg},{msg_group}")
@@ -531,50 +704,73 @@ class oiDECS(VisaInstrument):
         Takes a moving average of 30 temperature readings and finds the mean and the std of the last 30 readings,
         until the difference between the mean and target value is below 'stable_mean' and the standard deviation is below 'stable_std'.
 
+        If the telemetry is running and samples 'get_MC_T', its readings are used and
+        'time_between_readings' is ignored, otherwise the temperature is polled.
+
         Args:
             stable_mean: float - difference between the mean and target value to be achieved by the last 30 temperature readings
             stable_std: float - standard deviation to be achieved by the last 30 temperature readings
-            time_between_readings: float - time between taking temperature readings
+            time_between_readings: float - time between taking temperature readings when polling
         
         """
         target_temp = self.Mixing_Chamber_Temperature_Target()
 
         print(f'Waiting for temperature to stablilise at {target_temp} K.')
         
-        #take 30 temperature readings 
         t1 = time.time()
-        t_array = np.zeros(30)
-        for n in range(0,30):
-            time.sleep(time_between_readings)
-            temp = self.Mixing_Chamber_Temperature()
-            t_array[n] = float(temp)
-            
-        stab = False
-        while stab is False:
-            time.sleep(time_between_readings)
-            temp = self.Mixing_Chamber_Temperature()
-            t_array = np.append(t_array, float(temp))
-
-            t_array = t_array[1:]
-            s = np.std(t_array)
-            m = np.abs(np.mean(t_array) - target_temp)
-            
-            if (s < stable_std) and (m < stable_mean):
-                stab = True
-                
+        telemetry = self.telemetry
+        if (telemetry is not None and telemetry.running
+                and 'get_MC_T' in telemetry.commands
+                and telemetry.buffer_size >= 30):
+            while not telemetry.is_stable('get_MC_T', target_temp, stable_mean,
+                                          stable_std, 30):
+                if not telemetry.running:
+                    raise RuntimeError('Telemetry stopped while waiting for '
+                                       'the temperature to stabilise')
+                time.sleep(telemetry.interval)
+            t_array = telemetry.window('get_MC_T', 30)
+            temp = t_array[-1]
+        else:
+            # the last 30 temperature readings in a ring buffer
+            t_array = np.zeros(30)
+            n = 0
+            while True:
+                time.sleep(time_between_readings)
+                temp = self.Mixing_Chamber_Temperature()
+                t_array[n % t_array.size] = float(temp)
+                n += 1
+                if n < t_array.size:
+                    continue
+
+                if (np.std(t_array) < stable_std
+                        and np.abs(np.mean(t_array) - target_temp) < stable_mean):
+                    break
+
+        s = np.std(t_array)
+        m = np.abs(np.mean(t_array) - target_temp)
         t2 = time.time()
         tt = t2-t1
-        print(f'Temperature = {t_array[-1]} K')
+        print(f'Temperature = {temp} K')
         print(f'Temperature stable after {int(tt)} seconds. (Mean-Target = {m} K, StdDev = {s} K)')
 
     def ask(self, cmd: str) -> str:
         """
+        Commands sampled by a running telemetry are answered from its
+        latest sample if it is recent enough.
+
         Args:
             cmd: the command to send to the instrument
         """
-        resp = self.visa_handle.query(cmd)
+        telemetry = self.telemetry
+        if telemetry is not None and telemetry.running:
+            resp = telemetry.latest(cmd)
+            if resp is not None:
+                return resp
+        return self._query(cmd)
 
-        return resp
+    def _query(self, cmd: str) -> str:
+        with self._io_lock:
+            return self.visa_handle.query(cmd)
 
     def _param_setter(self, set_cmd: str, value: Union[float, str]) -> None:
         """
@@ -590,7 +786,9 @@ class oiDECS(VisaInstrument):
         self.ask(dressed_cmd)
 
     def close(self) -> None:
+        self.stop_telemetry()
         # Kill off the WAMP and socket connections
-        self.write(SHUTDOWN)
+        with self._io_lock:
+            self.write(SHUTDOWN)
         return super().close()
 
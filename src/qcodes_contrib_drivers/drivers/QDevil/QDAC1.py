@@ -3,12 +3,14 @@
 # Version 2.2 QDevil 2023-02-20
 
 import logging
+import re
 import time
 from collections import namedtuple
 from enum import Enum
 from functools import partial
 from typing import Any, Dict, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pyvisa
 import pyvisa.constants
 from pyvisa.resources.serial import SerialInstrument
@@ -58,6 +60,88 @@ class Generator:
         self.t_end = 9.9e9
 
 
+# One line of the status table, e.g. '8\t  0.000000\t\tX 1\t\thi cur'. The
+# last group catches any other non-blank line.
+_STATUS_LINE = re.compile(
+    r'^ *(?:(\d+)\t *(\S+)\t\t *X (1|0\.1) *\t\t *(hi|lo) cur|(\S.*?))'
+    r'[ \t\r]*$',
+    re.MULTILINE)
+
+
+def parse_status(status: str
+                 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parses the channel lines of the response to the `status` command in a
+    single regular expression pass.
+
+    Args:
+        status: The channel lines, separated by newlines. Blank lines are
+            ignored.
+
+    Returns:
+        Channel numbers, voltages, voltage ranges (0: X 1, 1: X 0.1) and
+        current ranges (0: lo cur, 1: hi cur), one array entry per line.
+
+    Raises:
+        ValueError: If a non-blank line is not a channel line.
+    """
+    matches = _STATUS_LINE.findall(status)
+    if not matches:
+        raise ValueError('unrecognized status lines: ' + status)
+    chans, voltages, vranges, iranges, unrecognized = zip(*matches)
+    if any(unrecognized):
+        raise ValueError('unrecognized status lines: '
+                         + '\n'.join(filter(None, unrecognized)))
+    return (np.array(chans, dtype=int),
+            np.array(voltages, dtype=float),
+            (np.array(vranges) == '0.1').astype(int),
+            (np.array(iranges) == 'hi').astype(int))
+
+
+def ramp_2d_plan(slow_vstart: Sequence[float],
+                 slow_vend: Sequence[float],
+                 fast_vstart: Sequence[float],
+                 fast_vend: Sequence[float],
+                 step_length_ms: int,
+                 slow_steps: int,
+                 fast_steps: int) -> np.ndarray:
+    """
+    Computes the staircase generator settings of a 2D ramp for all channels
+    at once. The slow channels are listed first, then the fast channels.
+
+    Each fast channel runs its staircase of fast_steps steps of
+    step_length_ms once per slow step, while each slow channel takes one
+    step per fast staircase. Started by the same trigger, the generators
+    thus trace out the full 2D grid.
+
+    Returns:
+        Structured array with one entry per channel and the fields
+        'amplitude', 'offset' (V), 'steps', 'repetitions' and 'delay' (ms),
+        i.e. the arguments of the `wav` and `fun` commands.
+    """
+    n_slow = len(slow_vstart)
+    n_fast = len(fast_vstart)
+    if len(slow_vend) != n_slow or len(fast_vend) != n_fast:
+        raise ValueError(
+                'Number of start voltages do not match number of channels!')
+    plan = np.empty(n_slow + n_fast,
+                    dtype=[('amplitude', 'f8'), ('offset', 'f8'),
+                           ('steps', 'i8'), ('repetitions', 'i8'),
+                           ('delay', 'i8')])
+    plan['offset'] = np.concatenate(
+            (np.asarray(slow_vstart, dtype=float),
+             np.asarray(fast_vstart, dtype=float)))
+    plan['amplitude'] = np.concatenate(
+            (np.asarray(slow_vend, dtype=float),
+             np.asarray(fast_vend, dtype=float))) - plan['offset']
+    is_slow = np.arange(n_slow + n_fast) < n_slow
+    plan['steps'] = np.where(is_slow, slow_steps, fast_steps)
+    plan['repetitions'] = np.where(is_slow, 1, slow_steps)
+    plan['delay'] = np.where(is_slow, fast_steps * step_length_ms,
+                             step_length_ms)
+    return plan
+
+
 class QDacChannel(InstrumentChannel):
     """
     A single output channel of the QDac.
@@ -575,9 +659,14 @@ class QDac(VisaInstrument):
     def _v_vals(self, chan: int, vrange_int: int) -> vals.Numbers:
         """
         Returns the validator for the specified voltage range.
+        The validators are created once per channel and range.
         """
-        return vals.Numbers(self.vranges[chan][vrange_int]['Min'],
-                            self.vranges[chan][vrange_int]['Max'])
+        key = (chan, vrange_int)
+        if key not in self._v_validators:
+            self._v_validators[key] = vals.Numbers(
+                    self.vranges[chan][vrange_int]['Min'],
+                    self.vranges[chan][vrange_int]['Max'])
+        return self._v_validators[key]
 
     def _update_v_validators(self) -> None:
         """
@@ -621,9 +710,6 @@ class QDac(VisaInstrument):
         ... (all 24/48 channels like this)
         (no termination afterward besides the \n ending the last channel)
         """
-        irange_trans = {'hi cur': 1, 'lo cur': 0}
-        vrange_trans = {'X 1': 0, 'X 0.1': 1}
-
         # Status call, check the
         version_line = self.ask('status')
         if version_line.startswith('Software Version: '):
@@ -640,20 +726,26 @@ class QDac(VisaInstrument):
         if headers != expected_headers:
             raise ValueError('unrecognized header line: ' + header_line)
 
-        chans_left = set(self._chan_range)
-        while chans_left:
-            line = self.read().strip()
-            if not line:
-                continue
-            chanstr, v, _, vrange, _, irange = line.split('\t')
-            chan = int(chanstr)
-            vrange_int = int(vrange_trans[vrange.strip()])
-            irange_int = int(irange_trans[irange.strip()])
-            mode = Mode((vrange_int, irange_int))
-            self.channels[chan-1].mode.cache.set(mode)
-            self.channels[chan-1].v.cache.set(float(v))
-            self.channels[chan-1].v.vals = self._v_vals(chan, vrange_int)
-            chans_left.remove(chan)
+        # Collect the channel lines and parse them in one go
+        lines = []
+        while len(lines) < self.num_chans:
+            line = self.read()
+            if line.strip():
+                lines.append(line)
+        chans, voltages, vranges, iranges = parse_status('\n'.join(lines))
+        if sorted(chans.tolist()) != list(self._chan_range):
+            raise ValueError('unrecognized channels in status: '
+                             + ', '.join(map(str, chans)))
+
+        for chan, v, vrange_int, irange_int in zip(
+                chans.tolist(), voltages.tolist(), vranges.tolist(),
+                iranges.tolist()):
+            channel = self.channels[chan-1]
+            channel.mode.cache.set(Mode((vrange_int, irange_int)))
+            channel.v.cache.set(v)
+            validator = self._v_vals(chan, vrange_int)
+            if channel.v.vals is not validator:
+                channel.v.vals = validator
 
         if update_currents:
             for chan in self._chan_range:
@@ -786,6 +878,7 @@ class QDac(VisaInstrument):
         # in firmware version 1.07
         self.write('ver 1')
         self.vranges = {}
+        self._v_validators: Dict[Tuple[int, int], vals.Numbers] = {}
         for chan in self._chan_range:
             self.vranges.update(
                 {chan: {0: self._get_minmax_outputvoltage(chan, 0),
@@ -1110,29 +1203,25 @@ class QDac(VisaInstrument):
                                             sync_delay, sync_duration))
 
         # Now program the channel amplitudes and function generators
-        msg = ''
-        for i in range(no_channels):
-            amplitude = v_endlist[i]-v_startlist[i]
-            # TODO: if amplitute is too large, then split into two parts.
-            # if abs(amplitude) > 10: ...
-            ch = channellist[i]
-            fg = self._assigned_fgs[ch].fg
-            if trigger > 0:  # Trigger 0 is not a trigger
-                self._assigned_triggers[fg] = trigger
-            msg += f"wav {ch} {fg} {amplitude} {v_startlist[i]}"
-            # using staircase = function 4
-            nsteps = slow_steps if ch in slow_chans else fast_steps
-            repetitions = slow_steps if ch in fast_chans else 1
-
-            delay = step_length_ms \
-                if ch in fast_chans else fast_steps*step_length_ms
-            msg += ';fun {} {} {} {} {} {};'.format(
-                        fg, Waveform.staircase, delay, int(nsteps),
-                        repetitions, trigger)
-            # Update latest values to ramp end values
-            # (actually not necessary when called from _set_voltage)
-            self.channels[ch-1].v.cache.set(v_endlist[i])
-        self.write(msg[:-1])  # last semicolon is stripped
+        # (staircase = function 4)
+        # TODO: if an amplitude is too large, then split into two parts.
+        plan = ramp_2d_plan(slow_vstart, slow_vend, fast_vstart, fast_vend,
+                            step_length_ms, slow_steps, fast_steps)
+        fgs = [self._assigned_fgs[ch].fg for ch in channellist]
+        if trigger > 0:  # Trigger 0 is not a trigger
+            self._assigned_triggers.update(dict.fromkeys(fgs, trigger))
+        self.write(';'.join(
+            f'wav {ch} {fg} {amplitude} {offset};'
+            f'fun {fg} {Waveform.staircase} {delay} {steps} {repetitions} '
+            f'{trigger}'
+            for ch, fg, amplitude, offset, steps, repetitions, delay in zip(
+                channellist, fgs, plan['amplitude'].tolist(),
+                plan['offset'].tolist(), plan['steps'].tolist(),
+                plan['repetitions'].tolist(), plan['delay'].tolist())))
+        # Update latest values to ramp end values
+        # (actually not necessary when called from _set_voltage)
+        for ch, v_end in zip(channellist, v_endlist):
+            self.channels[ch-1].v.cache.set(v_end)
 
         # Fire trigger to start generators simultaneously, saving communication
         # time by not using triggers for single channel ramping
@@ -1,12 +1,14 @@
 import re
 import itertools
+from contextlib import contextmanager
 from time import sleep as sleep_s
+import numpy as np
 from qcodes.instrument.parameter import DelegateParameter
 from qcodes.instrument.visa import VisaInstrument
 from qcodes.utils import validators
 from pyvisa.errors import VisaIOError
 from typing import (
-    Tuple, Sequence, List, Dict, Set, Union, Optional)
+    Tuple, Sequence, List, Dict, Set, Union, Optional, Iterator)
 from packaging.version import parse
 
 # Version 0.5.0
@@ -102,11 +104,25 @@ def compress_channel_list(channel_list: str) -> str:
 relay_lines = 24
 relays_per_line = 9
 
+# Relay bitmask, True for closed relays, indexed by [line - 1, tap] where tap
+# 0 is ground and tap 9 the connection to the input.
+Mask = np.ndarray
 
-def _state_diff(before: State, after: State) -> Tuple[State, State, State]:
-    initial = frozenset(before)
-    target = frozenset(after)
-    return list(target - initial), list(initial - target), list(target)
+
+def state_to_mask(state: State) -> Mask:
+    mask = np.zeros((relay_lines, relays_per_line + 1), dtype=bool)
+    for line, tap in state:
+        if not 1 <= line <= relay_lines:
+            raise ValueError(f'Expected line 1-{relay_lines}, got {line}')
+        if not 0 <= tap <= relays_per_line:
+            raise ValueError(f'Expected tap 0-{relays_per_line}, got {tap}')
+        mask[line - 1, tap] = True
+    return mask
+
+
+def mask_to_state(mask: Mask) -> State:
+    # Ordered by tap, then by line, like the compressed channel lists
+    return [(line + 1, tap) for tap, line in np.argwhere(mask.T).tolist()]
 
 
 class QSwitch(VisaInstrument):
@@ -128,6 +144,7 @@ class QSwitch(VisaInstrument):
         self._check_for_wrong_model()
         self._check_for_incompatiable_firmware()
         self._set_default_names()
+        self._set_up_relay_bookkeeping()
         self.state_force_update()
         self.add_parameter(
             name='state',
@@ -194,21 +211,58 @@ class QSwitch(VisaInstrument):
     # -----------------------------------------------------------------------
 
     def close_relays(self, relays: State) -> None:
-        currently = channel_list_to_state(self._state)
-        union = list(itertools.chain(currently, relays))
-        self._effectuate(union)
+        target = self._target_mask() | state_to_mask(relays)
+        self._effectuate_mask(target)
 
     def close_relay(self, line: int, tap: int) -> None:
         self.close_relays([(line, tap)])
 
     def open_relays(self, relays: State) -> None:
-        currently = frozenset(channel_list_to_state(self._state))
-        subtraction = frozenset(relays)
-        self._effectuate(list(currently - subtraction))
+        target = self._target_mask() & ~state_to_mask(relays)
+        self._effectuate_mask(target)
 
     def open_relay(self, line: int, tap: int) -> None:
         self.open_relays([(line, tap)])
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Merge all relay changes into one transaction
+
+        Inside the context, relay changes only update the target state. On
+        exit, the difference to the state before the context is sent as at
+        most one `clos` followed by one `open` command, so relays closed and
+        opened again within the context are never switched.  If an exception
+        is raised inside the context, no changes are sent.
+
+        Example:
+            with qswitch.batch():
+                qswitch.ground(['1', '2'])
+                qswitch.connect('3')
+        """
+        if self._pending_mask is not None:
+            # Nested batch, merged into the outer one
+            yield
+            return
+        self._pending_mask = self._relays.copy()
+        try:
+            yield
+        except BaseException:
+            self._pending_mask = None
+            raise
+        target, self._pending_mask = self._pending_mask, None
+        self._effectuate_mask(target)
+
+    def relay_statistics(self) -> Dict[str, int]:
+        """Count of relay operations since the instrument was created
+
+        Returns:
+            Dict[str, int]: Number of `clos` and `open` transactions sent,
+            and number of relays closed and opened by them.  The number of
+            operations of each individual relay is in
+            `relay_operations[line - 1, tap]`.
+        """
+        return dict(self._relay_statistics)
+
     # -----------------------------------------------------------------------
     # Manipulation by name
     # -----------------------------------------------------------------------
@@ -381,24 +435,46 @@ class QSwitch(VisaInstrument):
         except KeyError:
             raise ValueError(f'Unknown tap "{name}"')
 
+    @property
+    def _state(self) -> str:
+        return state_to_compressed_list(mask_to_state(self._relays))
+
     def _get_state(self) -> str:
         self.state_force_update()
         return self._state
 
     def _set_state_raw(self, channel_list: str) -> None:
-        self._state = channel_list
+        self._relays = state_to_mask(channel_list_to_state(channel_list))
 
     def _set_state(self, channel_list: str) -> None:
         self._effectuate(channel_list_to_state(channel_list))
 
     def _effectuate(self, state: State) -> None:
-        currently = channel_list_to_state(self._state)
-        positive, negative, total = _state_diff(currently, state)
-        if positive:
-            self.write(f'clos {state_to_compressed_list(positive)}')
-        if negative:
-            self.write(f'open {state_to_compressed_list(negative)}')
-        self._set_state_raw(state_to_compressed_list(total))
+        self._effectuate_mask(state_to_mask(state))
+
+    def _target_mask(self) -> Mask:
+        if self._pending_mask is not None:
+            return self._pending_mask
+        return self._relays
+
+    def _effectuate_mask(self, target: Mask) -> None:
+        if self._pending_mask is not None:
+            self._pending_mask = target
+            return
+        positive = target & ~self._relays
+        negative = self._relays & ~target
+        if positive.any():
+            closing = state_to_compressed_list(mask_to_state(positive))
+            self.write(f'clos {closing}')
+            self._relay_statistics['clos_transactions'] += 1
+            self._relay_statistics['relays_closed'] += int(positive.sum())
+        if negative.any():
+            opening = state_to_compressed_list(mask_to_state(negative))
+            self.write(f'open {opening}')
+            self._relay_statistics['open_transactions'] += 1
+            self._relay_statistics['relays_opened'] += int(negative.sum())
+        self.relay_operations += positive | negative
+        self._relays = target
 
     def _set_up_debug_settings(self) -> None:
         self._record_commands = False
@@ -406,6 +482,14 @@ class QSwitch(VisaInstrument):
         self._message_flush_timeout_ms = 1
         self._round_off = None
 
+    def _set_up_relay_bookkeeping(self) -> None:
+        self._relays: Mask = state_to_mask([])
+        self._pending_mask: Optional[Mask] = None
+        self.relay_operations = np.zeros_like(self._relays, dtype=int)
+        self._relay_statistics = dict.fromkeys(
+            ('clos_transactions', 'open_transactions',
+             'relays_closed', 'relays_opened'), 0)
+
     def _set_up_serial(self) -> None:
         # No harm in setting the speed even if the connection is not serial.
         self.visa_handle.baud_rate = 9600  # type: ignore
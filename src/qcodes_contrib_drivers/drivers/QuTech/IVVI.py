@@ -145,6 +145,8 @@ class IVVI(VisaInstrument):
 
         self._update_time = 5  # seconds
         self._time_last_update = 0  # ensures first call will always update
+        # host-side copy of the dac values, updated by every read and set
+        self._mvoltages = None
 
         t1 = time.time()
 
@@ -195,6 +197,75 @@ class IVVI(VisaInstrument):
         for i in range(self._numdacs):
             self.set('dac{}'.format(i + 1), 0)
 
+    def set_dacs(self, mvoltages):
+        '''
+        Sets several dacs in a single serial transaction.
+
+        The set descriptors of all dacs are sent in one write and the replies
+        are read back in one go, instead of a full round trip per dac. Unlike
+        setting the dac parameters this does not ramp, the dacs jump to
+        the new values.
+
+        Args:
+            mvoltages (Dict[int, float]): mapping of 1 based dac index to
+                output voltage in mV
+
+        Returns:
+            reply (bytes): the concatenated replies of the device
+        '''
+        for channel, mvoltage in mvoltages.items():
+            self.parameters['dac{}'.format(channel)].validate(mvoltage)
+        if self.check_setpoints():
+            self._read_shadow()
+            channels = [ch for ch, mvoltage in mvoltages.items()
+                        if not self._is_setpoint(ch, mvoltage)]
+        else:
+            channels = list(mvoltages)
+        if not channels:
+            return b''
+
+        message = b''.join(
+            self._set_dac_message(ch, mvoltages[ch]) for ch in channels)
+        reply = self.ask(message, raw=True, message_len=2 * len(channels))
+        for ch in channels:
+            self._update_shadow(ch, mvoltages[ch])
+            self.parameters['dac{}'.format(ch)].cache.set(mvoltages[ch])
+        return reply
+
+    def linspace_2d(self, dac_x, start_x: float, end_x: float,
+                    samples_x: int, dac_y, start_y: float, end_y: float,
+                    samples_y: int, flexible: bool = False):
+        """
+        Creates the setpoint grid of a 2D sweep over two dacs, with both axes
+        aligned to the DAC quantisation as in :meth:`linspace`.
+
+        Args:
+            dac_x: name or index of the dac stepped along the fast axis
+            start_x: the start of the fast axis, in millivolts
+            end_x: the end of the fast axis, in millivolts
+            samples_x: number of samples along the fast axis
+            dac_y: name or index of the dac stepped along the slow axis
+            start_y: the start of the slow axis, in millivolts
+            end_y: the end of the slow axis, in millivolts
+            samples_y: number of samples along the slow axis
+            flexible: see :meth:`linspace`
+
+        Returns:
+            Two arrays of shape ``(len(y), len(x))`` with the setpoints of
+            the fast and the slow dac at every point of the sweep, suitable
+            to be passed point by point to :meth:`set_dacs`.
+        """
+        x = self.linspace(start_x, end_x, samples_x, flexible,
+                          bip=self._is_bipolar(dac_x))
+        y = self.linspace(start_y, end_y, samples_y, flexible,
+                          bip=self._is_bipolar(dac_y))
+        return np.meshgrid(x, y)
+
+    def _is_bipolar(self, dacname):
+        if isinstance(dacname, str):
+            dacname = int(dacname[3:])
+        return self.get_pol_dac(dacname) == 'BIP'
+
     def linspace(self, start: float, end: float, samples: int, flexible: bool = False, bip: bool = True):
         """
         Creates array of voltages, with correct alignment to the DAC
@@ -273,8 +344,8 @@ class IVVI(VisaInstrument):
         byte_end = int(math.floor(half + end/self.dac_quata))
         delta_bytes =  abs(byte_end - byte_start)-1
         spacing =  max(int(math.floor(delta_bytes / (samples-1))),2)
-        l =  [(el+half)*self.dac_quata
-              for el in range(byte_start, byte_end,spacing)]
+        l = ((np.arange(byte_start, byte_end, spacing) + half)
+             * self.dac_quata).tolist()
         # Adjust the points until the length is correct
         if not flexible:
             if len(l) > samples:
@@ -357,35 +428,60 @@ class IVVI(VisaInstrument):
         proceed = True
 
         if self.check_setpoints():
-            cur_val = self.get('dac{}'.format(channel))
-            # dac range in mV / 16 bits FIXME make range depend on polarity
-            byte_res = self.full_range / 2**16
-            # eps is a magic number to correct for an offset in the values
-            # the IVVI returns (i.e. setting 0 returns byte_res/2 = 0.030518
-            # with rounding
-            eps = 0.0001
-
-            proceed = False
-
-            if (mvoltage > (cur_val + byte_res / 2 + eps) or
-                    mvoltage < (cur_val - byte_res / 2 - eps)):
-                proceed = True
-
-            if self.dac_set_sleep() > 0.0:
-                time.sleep(self.dac_set_sleep())
+            self._read_shadow()
+            proceed = not self._is_setpoint(channel, mvoltage)
 
         # only update the value if it is different from the previous one
         # this saves time in setting values, set cmd takes ~650ms
         if proceed:
-            polarity_corrected = mvoltage - self.pol_num[channel - 1]
-            byte_val = self._mvoltage_to_bytes(polarity_corrected)
-            message = bytes([2, 1, channel]) + byte_val
-
-            reply = self.ask(message)
-            self._time_last_update = 0  # ensures get command will update
+            reply = self.ask(self._set_dac_message(channel, mvoltage))
+            self._update_shadow(channel, mvoltage)
 
             return reply
 
+    def _set_dac_message(self, channel, mvoltage):
+        """
+        Returns the full descriptor (including size and error bytes) that
+        sets a dac, so that several of them can be sent in one write.
+        """
+        polarity_corrected = mvoltage - self.pol_num[channel - 1]
+        byte_val = self._mvoltage_to_bytes(polarity_corrected)
+        message = bytes([2, 1, channel]) + byte_val
+        return bytes([len(message) + 2, 0]) + message
+
+    def _read_shadow(self):
+        """
+        Reads the dac values from the device if none are known yet, so that
+        setpoints can be checked against them.
+        """
+        if self._mvoltages is None:
+            self._get_dacs()
+            if self.dac_set_sleep() > 0.0:
+                time.sleep(self.dac_set_sleep())
+
+    def _is_setpoint(self, channel, mvoltage):
+        """
+        Checks against the known dac values whether a dac is already at
+        the requested voltage, within the resolution of the dac.
+        """
+        cur_val = self._mvoltages[channel - 1]
+        # dac range in mV / 16 bits FIXME make range depend on polarity
+        byte_res = self.full_range / 2**16
+        # eps is a magic number to correct for an offset in the values
+        # the IVVI returns (i.e. setting 0 returns byte_res/2 = 0.030518
+        # with rounding
+        eps = 0.0001
+        return (cur_val - byte_res / 2 - eps <= mvoltage
+                <= cur_val + byte_res / 2 + eps)
+
+    def _update_shadow(self, channel, mvoltage):
+        """
+        Stores the value a dac has after being set to mvoltage.
+        """
+        if self._mvoltages is not None:
+            self._mvoltages[channel - 1] = self.round_dac(mvoltage,
+                                                          channel - 1)
+
     def _get_dacs(self):
         '''
         Reads from device and returns all dacvoltages in a list
@@ -434,11 +530,14 @@ class IVVI(VisaInstrument):
 
         return expected_answer_length
 
-    def ask(self, message, raw=False):
+    def ask(self, message, raw=False, message_len=None):
         '''
         Send <message> to the device and read answer.
         Raises an error if one occurred
         Returns a list of bytes
+
+        For raw messages the expected length of the answer can be passed
+        as message_len.
         '''
         if self.lock:
             max_tries = 10
@@ -450,7 +549,9 @@ class IVVI(VisaInstrument):
             if i + 1 == max_tries:
                 raise Exception('IVVI: lock is stuck')
         # Protocol knows about the expected length of the answer
-        message_len = self.write(message, raw=raw)
+        expected_len = self.write(message, raw=raw)
+        if message_len is None:
+            message_len = expected_len
         reply = self.read(message_len=message_len)
         if self.lock:
             self.lock.release()
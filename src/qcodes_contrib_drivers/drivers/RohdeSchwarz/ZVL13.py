@@ -1,14 +1,16 @@
 from typing import Any
 import logging
 from functools import partial
-from typing import Optional
+from typing import List, Optional, Sequence
 
 import numpy as np
 
-from qcodes.utils.validators import Enum, Strings, Ints
+from qcodes.utils.validators import Bool, Enum, Strings, Ints
 from qcodes import VisaInstrument, Instrument
 from qcodes import MultiParameter, ArrayParameter
 
+from qcodes_contrib_drivers.drivers._ieee_block import read_real32_blocks
+
 
 log = logging.getLogger(__name__)
 
@@ -159,11 +161,12 @@ class ZVL13(VisaInstrument):
                            get_parser=str)
 
         mode = self.mode.get()
-        if mode == 'SAN':
-            n = int(1)
+        n = int(1)
+        if mode == 'sa':
             self._tracename = 'Trc1'
-        if mode == 'NWA':
-            _, trace_name = self._get_trace_name()
+        if mode == 'na':
+            channel, trace_name = self._get_trace_name()
+            n = int(channel)
             self._tracename = trace_name
 
         self.inf_lim = 9e+3
@@ -266,6 +269,14 @@ class ZVL13(VisaInstrument):
                            channel = n,
                            parameter_class=SAFrequencySweep)
         
+        self.add_parameter(name='binary_transfer',
+                           label='Binary trace transfer',
+                           set_cmd=self._set_binary_transfer,
+                           initial_cache_value=False,
+                           vals=Bool(),
+                           docstring='Transfer traces as little endian 32 '
+                                     'bit floats instead of ASCII text.')
+
         self.add_parameter(name='status',
                             get_cmd='CONF:CHAN1:STAT?',
                             set_cmd='CONF:CHAN1:STAT {{}}',
@@ -347,6 +358,13 @@ class ZVL13(VisaInstrument):
     def _get_trace_catalog(self):
         return self.ask("CONFigure:TRACe:CATalog?").split(',')
 
+    def _get_trace_names(self) -> List[str]:
+        """
+        Names of all traces, the catalog lists them as "'1,Trc1,2,Trc2'".
+        """
+        trace_catalog = self.ask("CONFigure:TRACe:CATalog?").strip().strip("'")
+        return trace_catalog.split(',')[1::2]
+
     def _get_trace_name(self):
         trace_catalog = self._get_trace_catalog()
         if len(trace_catalog) == 2:            
@@ -386,6 +404,12 @@ class ZVL13(VisaInstrument):
         else: 
             raise AttributeError('Bandwidth value out of range')
         
+    def _set_binary_transfer(self, val: bool) -> None:
+        if val:
+            self.write('FORM:DATA REAL,32;:FORM:BORD SWAP')
+        else:
+            self.write('FORM:DATA ASC')
+
     def _set_rf_power(self, val: int) -> None:
         if val == 0:
             self.write('OUTP OFF')
@@ -481,12 +505,23 @@ class ZVL13(VisaInstrument):
         else:
             self.write('SOUR:POW ' + str(int(val)))
 
-    def _get_sweep_data(self, force_polar: bool = False):
-        if force_polar:
-            data_format_command = 'SDAT'
-        else:
-            data_format_command = 'FDAT'
-
+    def _query_traces(self, queries: Sequence[str]) -> List[np.ndarray]:
+        """
+        Sends the trace queries as one compound query and reads all
+        responses, either as binary blocks or as ASCII text depending on
+        ``binary_transfer``.
+        """
+        self.write(';:'.join(queries))
+        if self.binary_transfer.get_latest():
+            return read_real32_blocks(self.visa_handle, len(queries))
+        responses = self.visa_handle.read().rstrip().split(';')
+        return [np.array(response.split(','), dtype='float64')
+                for response in responses]
+
+    def _measure(self, queries: Sequence[str]) -> List[np.ndarray]:
+        """
+        Runs a single sweep and reads the traces with the given queries.
+        """
         self.write('SENS:AVER:STAT ON')
         self.write('SENS:AVER:CLE')
 
@@ -499,12 +534,51 @@ class ZVL13(VisaInstrument):
                     self.write('INIT:IMMEDIATE:SCOPE:SINGLE')                        
                     self.write('INIT:CONT OFF')
                     self.write('INIT:IMM; *WAI')
-                    self.write("CALC:PAR:SEL '{self._tracename}'")
-                    data_str = self.ask(f'CALC:DATA? {data_format_command}')
-
-                data = np.array(data_str.rstrip().split(',')).astype('float64')
+                    return self._query_traces(queries)
             finally:
                 self.root_instrument.cont_meas_on()
+
+    def _get_sweep_data(self, force_polar: bool = False):
+        if force_polar:
+            data_format_command = 'SDAT'
+        else:
+            data_format_command = 'FDAT'
+
+        data, = self._measure(
+            [f"CALC:DATA:TRAC? '{self._tracename}', {data_format_command}"])
+        return data
+
+    def get_traces(self, force_polar: bool = False) -> np.ndarray:
+        """
+        Runs a single sweep and reads all traces with one compound query.
+
+        Args:
+            force_polar: Read the unformatted complex data instead of the
+                data in the format of each trace.
+
+        Returns:
+            Structured array with one field per trace, named by the trace
+            name. Traces with two values per point are complex.
+        """
+        if force_polar:
+            data_format_command = 'SDAT'
+        else:
+            data_format_command = 'FDAT'
+
+        names = self._get_trace_names()
+        traces = self._measure(
+            [f"CALC:DATA:TRAC? '{name}', {data_format_command}"
+             for name in names])
+
+        npts = self.npts.get_latest()
+        fields = [(name, 'complex128' if trace.size > npts else 'float64')
+                  for name, trace in zip(names, traces)]
+        data = np.empty(npts, dtype=fields)
+        for name, trace in zip(names, traces):
+            if trace.size > npts:
+                data[name] = trace[0::2] + 1j * trace[1::2]
+            else:
+                data[name] = trace
         return data
 
     def _get_sweep_data_SA(self):
@@ -518,9 +592,10 @@ class ZVL13(VisaInstrument):
                 self.write('INIT:IMMEDIATE:SCOPE:SINGLE')                        
                 self.write('INIT:CONT OFF')
                 self.write('INIT:IMM; *WAI')
-                data_str = self.ask('FORM ASC;TRAC? TRACE1')
-
-            data = np.array(data_str.rstrip().split(',')).astype('float64')
+                if self.binary_transfer.get_latest():
+                    data, = self._query_traces(['TRAC? TRACE1'])
+                else:
+                    data, = self._query_traces(['FORM ASC;TRAC? TRACE1'])
         finally:
             self.root_instrument.cont_meas_on()
         return data
@@ -4,7 +4,9 @@ import ctypes
 import os
 import sys
 import logging
-from typing import Optional
+from typing import Dict, Optional, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -79,7 +81,8 @@ class ShamrockCIF:
         c_number_pixels = ctypes.c_int(number_pixels)
         code = self.dll.ShamrockGetCalibration(c_device, c_calibration, c_number_pixels)
         self.error_check(code, 'ShamrockGetCalibration')
-        return [max(0.0, v) for v in c_calibration]
+        calibration = np.frombuffer(c_calibration, dtype=np.float32)
+        return np.maximum(calibration.astype(np.float64), 0.0)
 
     def get_grating(self, device):
         c_device = ctypes.c_int(device)
@@ -209,6 +212,9 @@ class Shamrock_SR750(Instrument):
         number_gratings: Number of gratings on the spectrometer.
     """
 
+    # number of calibrations kept in memory
+    _calibration_cache_size = 16
+
     def __init__(self, name: str,
                  dll_path: Optional[str] = None, device_id: int = 0,
                  ccd_number_pixels: int = 1024, ccd_pixel_width: int = 26,
@@ -229,9 +235,8 @@ class Shamrock_SR750(Instrument):
         self.serial_number: int = self.ShamrockCIF.get_serial_number(self.device_id)
         self.number_gratings: int = self.ShamrockCIF.get_number_gratings(self.device_id)
 
-        # send CCD info to Shamrock
-        self.ShamrockCIF.set_number_pixels(self.device_id, ccd_number_pixels)
-        self.ShamrockCIF.set_pixel_width(self.device_id, ccd_pixel_width)
+        # calibrations by grating, wavelength, number of pixels and pixel width
+        self._calibrations: Dict[Tuple[int, float, int, float], np.ndarray] = {}
 
         # add the instrument parameters
         self.add_parameter('blaze',
@@ -242,7 +247,29 @@ class Shamrock_SR750(Instrument):
         self.add_parameter('calibration',
                            get_cmd=self._get_calibration,
                            unit='nm',
-                           label='Calibration')
+                           label='Calibration',
+                           docstring='Wavelength of each CCD pixel. The calibration is '
+                                     'only read from the spectrometer once for every '
+                                     'combination of grating, wavelength, number of '
+                                     'pixels and pixel width.')
+
+        # send CCD info to Shamrock
+        self.add_parameter('ccd_number_pixels',
+                           get_cmd=self._get_number_pixels,
+                           set_cmd=self._set_number_pixels,
+                           get_parser=int,
+                           vals=Ints(min_value=1),
+                           label='CCD number of pixels')
+        self.ccd_number_pixels.set(ccd_number_pixels)
+
+        self.add_parameter('ccd_pixel_width',
+                           get_cmd=self._get_pixel_width,
+                           set_cmd=self._set_pixel_width,
+                           get_parser=float,
+                           vals=Numbers(min_value=0),
+                           unit=u"\u03BC"+'m',
+                           label='CCD pixel width')
+        self.ccd_pixel_width.set(ccd_pixel_width)
 
         self.add_parameter('grating',
                            get_cmd=self._get_grating,
@@ -288,7 +315,18 @@ class Shamrock_SR750(Instrument):
         return grating_info[1]
 
     def _get_calibration(self):
-        return self.ShamrockCIF.get_calibration(self.device_id, 1024)
+        number_pixels = self.ccd_number_pixels.get_latest()
+        key = (self.grating.get_latest(), self.wavelength.get_latest(),
+               number_pixels, self.ccd_pixel_width.get_latest())
+        calibration = self._calibrations.get(key)
+        if calibration is None:
+            calibration = self.ShamrockCIF.get_calibration(self.device_id, number_pixels)
+            # the array is shared between gets, so make sure it stays unchanged
+            calibration.setflags(write=False)
+            if len(self._calibrations) >= self._calibration_cache_size:
+                del self._calibrations[next(iter(self._calibrations))]
+            self._calibrations[key] = calibration
+        return calibration
 
     def _get_grating(self):
         return self.ShamrockCIF.get_grating(self.device_id)
@@ -298,6 +336,12 @@ class Shamrock_SR750(Instrument):
         grating_info = self.ShamrockCIF.get_grating_info(self.device_id, grating)
         return grating_info[0]
 
+    def _get_number_pixels(self):
+        return self.ShamrockCIF.get_number_pixels(self.device_id)
+
+    def _get_pixel_width(self):
+        return self.ShamrockCIF.get_pixel_width(self.device_id)
+
     def get_idn(self):
         return {'vendor': 'Shamrock', 'serial': self.serial_number}
 
@@ -313,6 +357,14 @@ class Shamrock_SR750(Instrument):
         self.ShamrockCIF.set_grating(self.device_id, grating)
         min_wavelength, max_wavelength = self.ShamrockCIF.get_wavelength_limits(self.device_id, grating)
         self.wavelength.vals = Numbers(min_value=min_wavelength, max_value=max_wavelength)
+        # the spectrometer may move the wavelength into the range of the new grating
+        self.wavelength.cache.invalidate()
+
+    def _set_number_pixels(self, number_pixels):
+        self.ShamrockCIF.set_number_pixels(self.device_id, number_pixels)
+
+    def _set_pixel_width(self, width):
+        self.ShamrockCIF.set_pixel_width(self.device_id, width)
 
     def _set_slit(self, val):
         self.ShamrockCIF.set_slit(self.device_id, val)
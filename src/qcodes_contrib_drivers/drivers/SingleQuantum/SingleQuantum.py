@@ -140,14 +140,27 @@ class SQTalk(threading.Thread):
 
 
 class SQCounts(threading.Thread):
+    """Receives the stream of counts from the counts port.
+
+    Every line of the stream holds the time stamp followed by the counts of
+    all detectors, separated by commas. Lines are parsed as they arrive,
+    also when they are split over several packets, and stored in a ring
+    buffer holding the last CNTS_BUFFER lines.
+
+    The ring buffer is stored twice in a row, so that the latest lines are
+    always contiguous in memory and get_latest can return a view instead of
+    a copy.
+    """
+
     def __init__(
             self,
             TCP_IP_ADR='localhost',
             TCP_IP_PORT=12345,
             CNTS_BUFFER=100):
         threading.Thread.__init__(self)
-        self.lock = threading.Lock()
         self.rlock = threading.RLock()
+        # notified whenever new lines have been stored
+        self.condition = threading.Condition(self.rlock)
         self.TCP_IP_ADR = TCP_IP_ADR
         self.TCP_IP_PORT = TCP_IP_PORT
 
@@ -158,39 +171,115 @@ class SQCounts(threading.Thread):
         self.BUFFER = 1000000
         self.shutdown = False
 
-        self.cnts = []
         self.CNTS_BUFFER = CNTS_BUFFER
+        # allocated when the first line tells the number of columns
+        self.cnts = None
+        self.times = np.zeros(CNTS_BUFFER)
         self.n = 0
+        self.dropped = 0
+        self._partial = b''
 
     def close(self):
         # print("Closing Socket")
-        self.socket.close()
         self.shutdown = True
+        self.socket.close()
 
-    def get_n(self, n):
-        n0 = self.n
-        while self.n < n0 + n:
-            time.sleep(0.001)
-        cnts = self.cnts
-        return cnts[-n:]
+    def get_n(self, n, timeout=None):
+        """Wait for n new lines and return the latest n lines.
+
+        Args:
+            n (int): number of lines, at most CNTS_BUFFER
+            timeout (float): maximum time to wait in seconds, None waits
+                forever
+        Return (numpy_array): view of shape (n, columns), see get_latest
+        """
+        if not 0 <= n <= self.CNTS_BUFFER:
+            raise ValueError(f"n must be between 0 and CNTS_BUFFER="
+                             f"{self.CNTS_BUFFER}, not {n}")
+        with self.condition:
+            n0 = self.n
+            if not self.condition.wait_for(lambda: self.n >= n0 + n,
+                                           timeout):
+                raise TimeoutError(f"Received {self.n - n0} of {n} counts")
+            return self.get_latest(n)
+
+    def get_latest(self, n):
+        """Return the latest n lines without copying.
+
+        The returned array is a view of the ring buffer and is overwritten
+        by new data after CNTS_BUFFER - n further lines, copy it to keep it.
+
+        Args:
+            n (int): number of lines, at most CNTS_BUFFER
+        Return (numpy_array): array of shape (n, columns), oldest line first,
+            of shape (0, 0) for n=0 before the first line
+        """
+        if n > self.CNTS_BUFFER:
+            raise ValueError(f"Can not return more than CNTS_BUFFER="
+                             f"{self.CNTS_BUFFER} lines")
+        with self.rlock:
+            if n > self.n:
+                raise ValueError(f"Only {self.n} lines received")
+            if self.cnts is None:
+                return np.zeros((0, 0))
+            end = self.n % self.CNTS_BUFFER + self.CNTS_BUFFER
+            return self.cnts[end - n:end]
+
+    @property
+    def rate(self):
+        """Rate in lines per second, averaged over the ring buffer."""
+        with self.rlock:
+            n = min(self.n, self.CNTS_BUFFER)
+            if n < 2:
+                return 0.0
+            newest = self.times[(self.n - 1) % self.CNTS_BUFFER]
+            oldest = self.times[(self.n - n) % self.CNTS_BUFFER]
+            if newest == oldest:
+                return float('inf')
+            return float((n - 1) / (newest - oldest))
+
+    def statistics(self):
+        """Return the number of received and dropped lines and the rate."""
+        return dict(received=self.n, dropped=self.dropped, rate=self.rate)
+
+    def _store(self, line):
+        try:
+            v = np.array(line.split(b','), dtype=float)
+        except ValueError:
+            self.dropped += 1
+            return
+        with self.condition:
+            if self.cnts is None:
+                self.cnts = np.zeros((2 * self.CNTS_BUFFER, len(v)))
+            elif len(v) != self.cnts.shape[1]:
+                self.dropped += 1
+                return
+            i = self.n % self.CNTS_BUFFER
+            self.cnts[i] = v
+            self.cnts[i + self.CNTS_BUFFER] = v
+            self.times[i] = time.perf_counter()
+            self.n += 1
+
+    def _handle_data(self, data_raw):
+        """Store all complete lines, keep an incomplete last line."""
+        lines = (self._partial + data_raw).split(b'\n')
+        self._partial = lines.pop()
+        with self.condition:
+            for line in lines:
+                line = line.strip()
+                if line:
+                    self._store(line)
+            self.condition.notify_all()
 
     def run(self):
         while self.shutdown is False:
-            data_raw = str(self.socket.recv(self.BUFFER), 'utf-8')
-
-            data_newline = data_raw.split('\n')
-
-            v = []
-            for d in data_newline[0].split(','):
-                v.append(float(d))
-
-            with self.lock:
-                self.cnts.append(v)
-                # Keep Size of self.cnts
-                len_ = len(self.cnts)
-                if len_ > self.CNTS_BUFFER:
-                    self.cnts = self.cnts[len_ - self.CNTS_BUFFER:]
-                self.n += 1
+            try:
+                data_raw = self.socket.recv(self.BUFFER)
+            except OSError:
+                break
+            if not data_raw:
+                break
+            self._handle_data(data_raw)
 
 
 class ChannelArray(ParameterWithSetpoints):
@@ -266,8 +355,8 @@ class CommunicationHandler(object):
         Return (numpy_array): Acquired counts with timestamp in first row.
         """
         n = self.root_instrument.npts()
-        cnts = self.cnts.get_n(n)
-        return np.array(cnts).T
+        # copy, as the view returned by get_n is overwritten by new counts
+        return self.cnts.get_n(n).T.copy()
 
     def set_measurement_periode(self, t_in_ms):
         msg = json.dumps(
@@ -187,21 +187,30 @@ class SIM928(VisaInstrument):
             i = self.module_nr[i]
         return float(self.ask_module(i, 'VOLT?'))
 
-    def set_smooth(self, voltagedict, equitime=False):
+    def set_voltages(self, voltagedict):
         """
-        Set the voltages as specified in ``voltagedict` smoothly,
-        by changing the output on each module at a rate
-        ``volt_#_step/smooth_timestep``.
+        Set the output voltages of several modules with a single write to the
+        mainframe.
 
         Args:
             voltagedict (Dict[float]): A dictionary where keys are module slot
                 numbers or names and values are the desired output voltages.
-            equitime (bool): If ``True``, uses smaller step sizes for some of
-                the modules so that all modules reach the desired value at the
-                same time.
         """
+        vdict = self._validate_voltagedict(voltagedict)
+        self._write_voltages(list(vdict), list(vdict.values()))
+
+    def _validate_voltagedict(self, voltagedict):
+        """
+        Convert the keys of ``voltagedict`` to module names and validate the
+        voltages against the ``volt_#`` parameters.
 
-        # convert voltagedict to contain module names only and validate inputs
+        Args:
+            voltagedict (Dict[float]): A dictionary where keys are module slot
+                numbers or names and values are voltages.
+
+        Returns:
+            Dict[float]: The voltages keyed by module name.
+        """
         vdict = {}
         for i in voltagedict:
             if not isinstance(i, int):
@@ -214,47 +223,102 @@ class SIM928(VisaInstrument):
                 name = self.slot_names.get(i, i)
             vdict[name] = voltagedict[i]
             self.parameters['volt_{}'.format(name)].validate(vdict[name])
+        return vdict
+
+    def _write_voltages(self, names, voltages):
+        """
+        Send the ``VOLT`` commands for several modules as one semicolon
+        separated mainframe command line and update the parameter caches.
+
+        Args:
+            names (List): Module names as used in the ``volt_#`` parameters.
+            voltages (Sequence[float]): The voltages to set, one per module.
+        """
+        cmds = []
+        for name, voltage in zip(names, voltages):
+            i = name if isinstance(name, int) else self.module_nr[name]
+            cmds.append('SNDT {},"VOLT {:.3f}"'.format(i, voltage))
+        if not cmds:
+            return
+        self.write(';'.join(cmds))
+        for name, voltage in zip(names, voltages):
+            self.parameters['volt_{}'.format(name)].cache.set(float(voltage))
+
+    def _smooth_ramp(self, vdict, equitime=False):
+        """
+        Compute all intermediate steps of a smooth voltage change.
+
+        Args:
+            vdict (Dict[float]): Target voltages keyed by module name.
+            equitime (bool): If ``True``, scale the step sizes so that all
+                modules reach their target at the same step.
+
+        Returns:
+            numpy.ndarray: An array of shape ``(nsteps, nmodules)`` with the
+            voltages to write at each step, with columns in the order of
+            ``vdict``. Entries are ``nan`` for modules that have already
+            reached their target.
+        """
+        names = list(vdict)
+        target = np.array([vdict[i] for i in names], dtype=float)
+        start = np.array([self.get('volt_{}'.format(i)) for i in names],
+                         dtype=float)
+        stepsize = np.array([self.get('volt_{}_step'.format(i))
+                             for i in names], dtype=float)
+        deltav = target - start
+        with np.errstate(divide='ignore', invalid='ignore'):
+            nsteps = np.ceil(np.abs(deltav) / stepsize)
+        nsteps = np.where(np.isfinite(nsteps), nsteps, 0).astype(int)
 
-        intermediate = []
         if equitime:
-            maxsteps = 0
-            deltav = {}
-            for i in vdict:
-                deltav[i] = vdict[i]-self.get('volt_{}'.format(i))
-                stepsize = self.get('volt_{}_step'.format(i))
-                steps = abs(int(np.ceil(deltav[i]/stepsize)))
-                if steps > maxsteps:
-                    maxsteps = steps
-            for s in range(maxsteps):
-                intermediate.append({})
-                for i in vdict:
-                    intermediate[-1][i] = vdict[i] - \
-                                          deltav[i]*(maxsteps-s-1)/maxsteps
-        else:
-            done = []
-            prevvals = {}
-            for i in vdict:
-                prevvals[i] = self.get('volt_{}'.format(i))
-            while len(done) != len(vdict):
-                intermediate.append({})
-                for i in vdict:
-                    if i in done:
-                        continue
-                    stepsize = self.get('volt_{}_step'.format(i))
-                    deltav = vdict[i]-prevvals[i]
-                    if abs(deltav) <= stepsize:
-                        intermediate[-1][i] = vdict[i]
-                        done.append(i)
-                    elif deltav > 0:
-                        intermediate[-1][i] = prevvals[i] + stepsize
-                    else:
-                        intermediate[-1][i] = prevvals[i] - stepsize
-                    prevvals[i] = intermediate[-1][i]
-
-        for voltages in intermediate:
-            for i in voltages:
-                self.set_voltage(i, voltages[i])
-            time.sleep(self.smooth_timestep())
+            maxsteps = int(nsteps.max(initial=0))
+            s = np.arange(maxsteps)[:, np.newaxis]
+            return target - deltav * (maxsteps - s - 1) / maxsteps
+
+        # every module takes at least one step, even if it is already at the
+        # target, and stops once it is within one step of the target
+        nsteps = np.maximum(nsteps, 1)
+        s = np.arange(1, nsteps.max(initial=0) + 1)[:, np.newaxis]
+        steps = start + np.sign(deltav) * stepsize * s
+        steps = np.where(s >= nsteps, target, steps)
+        return np.where(s > nsteps, np.nan, steps)
+
+    def set_smooth(self, voltagedict, equitime=False):
+        """
+        Set the voltages as specified in ``voltagedict` smoothly,
+        by changing the output on each module at a rate
+        ``volt_#_step/smooth_timestep``.
+
+        All step voltages are computed up front and the commands for all
+        modules of one step are sent in a single write to the mainframe.
+        Steps are scheduled against a fixed timeline starting at the first
+        write, so the time spent communicating does not add to the ramp
+        duration.
+
+        Args:
+            voltagedict (Dict[float]): A dictionary where keys are module slot
+                numbers or names and values are the desired output voltages.
+            equitime (bool): If ``True``, uses smaller step sizes for some of
+                the modules so that all modules reach the desired value at the
+                same time.
+        """
+        vdict = self._validate_voltagedict(voltagedict)
+        names = list(vdict)
+        steps = self._smooth_ramp(vdict, equitime)
+        timestep = self.smooth_timestep()
+
+        t0 = time.perf_counter()
+        for n, voltages in enumerate(steps):
+            delay = t0 + n * timestep - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            active = ~np.isnan(voltages)
+            self._write_voltages([i for i, a in zip(names, active) if a],
+                                 voltages[active])
+        if len(steps):
+            delay = t0 + len(steps) * timestep - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
 
     def get_module_status(self, i):
         """
@@ -1,4 +1,6 @@
-from typing import Any, Tuple, Sequence, cast
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple, Sequence, cast
 
 import numpy as np
 from qcodes import VisaInstrument
@@ -20,6 +22,12 @@ class AFG3000(VisaInstrument):
     def __init__(self, name: str, address: str, **kwargs: Any):
         super().__init__(name, address, terminator='\n', timeout=20, **kwargs)
 
+        # Content hashes of the waveforms in the USER1-4 memories uploaded
+        # by this driver, least recently used first
+        self._user_waveforms: "OrderedDict[int, bytes]" = OrderedDict()
+        self.waveform_cache_statistics: Dict[str, int] = dict.fromkeys(
+            ('hits', 'misses', 'bytes_saved'), 0)
+
         self.add_parameter(
             name='trigger_mode',
             label='Trigger mode',
@@ -655,18 +663,104 @@ class AFG3000(VisaInstrument):
         the `voltage_low1/2` and `voltage_high1/2` parameters; 0 will be
         mapped to `voltage_low` and 1 to `voltage_high`.
 
+        Nothing is sent if the same waveform was uploaded to this memory
+        before, see `load_waveform`.
+
         Args:
             waveform: sequence of points containing the waveform data,
                 containing values from 0 to 1.
             memory: The USER# memory where to to store the waveform, from 1 to 4.
         """
+        if memory not in [1, 2, 3, 4]:
+            raise ValueError(f"Invalid value for memory: '{memory}'")
+
+        wf_codes = self._waveform_codes(waveform)
+        digest = self._waveform_digest(wf_codes)
+        if self._user_waveforms.get(memory) == digest:
+            self._register_hit(memory, wf_codes)
+            return
+        self._upload_codes(wf_codes, digest, memory)
+
+    def load_waveform(self, waveform: Sequence[float],
+                      source: Optional[int] = None) -> int:
+        """
+        Make sure a waveform is in one of the USER1-4 memories, uploading
+        it only if it is not there yet.
+
+        The driver keeps a hash of the waveform in each USER memory it
+        uploaded to. If the waveform is found, no data is sent. Otherwise
+        it is uploaded to an unused memory or, if all are used, to the
+        least recently used one. A memory that another source is set to
+        output, according to the cached function shapes, is not replaced.
+        Memories written by other means than this driver are not tracked,
+        call `clear_waveform_cache` in that case.
+
+        Args:
+            waveform: sequence of points containing the waveform data,
+                containing values from 0 to 1.
+            source: If given, set the function shape of this source (1 or 2)
+                to the USER memory of the waveform.
+
+        Returns:
+            The USER# memory holding the waveform, from 1 to 4.
+
+        Raises:
+            RuntimeError: If the waveform has to be uploaded, but every USER
+                memory is output by a source.
+        """
+        wf_codes = self._waveform_codes(waveform)
+        digest = self._waveform_digest(wf_codes)
+        for memory, memory_digest in self._user_waveforms.items():
+            if memory_digest == digest:
+                self._register_hit(memory, wf_codes)
+                break
+        else:
+            playing = self._playing_memories(exclude_source=source)
+            unused = [memory for memory in [1, 2, 3, 4]
+                      if memory not in self._user_waveforms
+                      and memory not in playing]
+            # least recently used first
+            replaceable = [memory for memory in self._user_waveforms
+                           if memory not in playing]
+            if not unused and not replaceable:
+                raise RuntimeError('All USER memories are output by a '
+                                   f'source: {sorted(playing)}')
+            memory = unused[0] if unused else replaceable[0]
+            self._upload_codes(wf_codes, digest, memory)
+
+        if source is not None:
+            self.parameters[f'function_shape{source}'].set(f'USER{memory}')
+        return memory
+
+    def _playing_memories(self, exclude_source: Optional[int] = None
+                          ) -> Set[int]:
+        """
+        The USER memories selected by the cached function shapes of the
+        sources, except for exclude_source.
+        """
+        playing = set()
+        for src in [1, 2]:
+            if src == exclude_source:
+                continue
+            shape = self.parameters[f'function_shape{src}'].cache.get(
+                get_if_invalid=False)
+            if isinstance(shape, str) and shape.upper().startswith('USER'):
+                # USER is short for USER1
+                playing.add(int(shape[4:] or 1))
+        return playing
+
+    def clear_waveform_cache(self) -> None:
+        """
+        Forget which waveforms are in the USER1-4 memories, so that the next
+        uploads send the data again.
+        """
+        self._user_waveforms.clear()
+
+    def _waveform_codes(self, waveform: Sequence[float]) -> np.ndarray:
         if (len(waveform) < MIN_WAVEFORM_LENGTH or
             len(waveform) > MAX_WAVEFORM_LENGTH):
             raise ValueError(f"Invalid waveform length: {len(waveform)}")
 
-        if memory not in [1, 2, 3, 4]:
-            raise ValueError(f"Invalid value for memory: '{memory}'")
-
         # convert to numpy array and raise ValueError if data contains inf or nan
         wf_array = np.asarray_chkfinite(waveform)
 
@@ -675,10 +769,27 @@ class AFG3000(VisaInstrument):
         if np.any(wf_array < 0.0):
             raise ValueError("Waveform contains data below 0.0")
 
-        self.reset_edit_memory(len(waveform))
-
         # convert waveform to two-byte integer values in the range 0..16382 (= 2**14-2)
-        wf_codes = (wf_array * (2**14-2)).astype(np.uint16)
+        return (wf_array * (2**14-2)).astype(np.uint16)
+
+    @staticmethod
+    def _waveform_digest(wf_codes: np.ndarray) -> bytes:
+        # hash the codes as sent, so that waveforms which only differ below
+        # the DAC resolution are the same
+        return hashlib.blake2b(wf_codes.tobytes(), digest_size=16).digest()
+
+    def _register_hit(self, memory: int, wf_codes: np.ndarray) -> None:
+        self._user_waveforms.move_to_end(memory)
+        self.waveform_cache_statistics['hits'] += 1
+        self.waveform_cache_statistics['bytes_saved'] += wf_codes.nbytes
+
+    def _upload_codes(self, wf_codes: np.ndarray, digest: bytes,
+                      memory: int) -> None:
+        self.waveform_cache_statistics['misses'] += 1
+        # the memory content is unknown if the upload fails
+        self._user_waveforms.pop(memory, None)
+
+        self.reset_edit_memory(len(wf_codes))
 
         # write data to the editable memory
         self.visa_handle.write_binary_values(
@@ -691,6 +802,7 @@ class AFG3000(VisaInstrument):
 
         # copy data from editable memory to USER.
         self.write(f"DATA:COPY USER{memory},EMEM")
+        self._user_waveforms[memory] = digest
 
 
 class AFG3252(AFG3000):
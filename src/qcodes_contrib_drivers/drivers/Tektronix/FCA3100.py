@@ -3,7 +3,7 @@ import numpy as np
 from typing import Any, Tuple
 from qcodes.instrument import VisaInstrument
 from qcodes.parameters import MultiParameter, Parameter, ParameterWithSetpoints
-from qcodes.validators import Arrays, Ints
+from qcodes.validators import Arrays, Enum, Ints
 
 log = logging.getLogger(__name__)
 
@@ -43,7 +43,8 @@ class TimeStatistics(MultiParameter):
 
     def get_raw(self) -> Tuple[float, float, float, float]:
         """
-        Gets data from the instrument
+        Gets data from the instrument. The statistics are always read as
+        ASCII, the ``data_format`` is restored afterwards.
 
         Returns:
             Tuple: Statistical values of the time statistic
@@ -52,7 +53,14 @@ class TimeStatistics(MultiParameter):
         self.instrument.write('CALCulate:AVERage:STAT 1')
         self.instrument.write('INIT') # start measurement
         self.instrument.ask('*OPC?') # wait for it to complete
-        reply = self.instrument.ask("CALCulate:AVERage:ALL?")
+        data_format = self.instrument.data_format.get_latest()
+        if data_format != 'ASCII':
+            self.instrument.write('FORMat ASCII')
+        try:
+            reply = self.instrument.ask("CALCulate:AVERage:ALL?")
+        finally:
+            if data_format != 'ASCII':
+                self.instrument.write(f'FORMat {data_format}')
         mean, stddev, minval, maxval, _ = reply.split(",")
 
         return float(mean), float(stddev), float(minval), float(maxval)
@@ -81,16 +89,51 @@ class CompleteTimeStatistics(ParameterWithSetpoints):
         """
         Gets the data from the instrument.
 
+        If the number of samples exceeds ``samples_per_read``, the
+        measurement is armed and read repeatedly in blocks of at most
+        ``samples_per_read`` samples until all samples are acquired. This
+        is a loop over block reads, not a continuous stream: events between
+        two blocks are not measured.
+
         Returns:
             np.ndarray: Array of swithing times
         """
         assert isinstance(self.instrument, FCA3100)
+        samples = int(self.instrument.samples_number.get_latest())
+        block = int(self.instrument.samples_per_read.get())
         self.instrument.write('CALCulate:AVERage:STATe 0')
-        self.instrument.write('ARM:COUN {}'.format(self.instrument.samples_number.get_latest()))
-        data_str=self.instrument.ask("READ:ARRay? {}".format(self.instrument.samples_number.get_latest()))
-        data = np.array(data_str.rstrip().split(",")).astype("float64")
+        if samples <= block:
+            return self._read_array(samples)
+
+        data = np.empty(samples)
+        for start in range(0, samples, block):
+            count = min(block, samples - start)
+            data[start:start + count] = self._read_array(count)
         return data
 
+    def _read_array(self, count: int) -> np.ndarray:
+        """
+        Arms the counter for count samples and reads them, decoding the
+        reply according to the ``data_format`` of the instrument.
+
+        Raises:
+            ValueError: If the instrument is in the PACKED data format,
+                which is not supported.
+        """
+        assert isinstance(self.instrument, FCA3100)
+        data_format = self.instrument.data_format.get_latest()
+        if data_format not in ('ASCII', 'REAL'):
+            raise ValueError(f"Array transfers in the {data_format} data "
+                             f"format are not supported, set data_format "
+                             f"to 'ASCII' or 'REAL'")
+        self.instrument.write(f'ARM:COUN {count}')
+        query = f'READ:ARRay? {count}'
+        if data_format == 'REAL':
+            return self.instrument.visa_handle.query_binary_values(
+                query, datatype='d', is_big_endian=True, container=np.array)
+        data_str = self.instrument.ask(query)
+        return np.array(data_str.rstrip().split(",")).astype("float64")
+
 class GeneratedSetPoints(Parameter):
     """
     A parameter that generates a setpoint array from start, stop and num points
@@ -136,6 +179,31 @@ class FCA3100(VisaInstrument):
 
         self.write('INIT:CONT 0')
 
+        self.add_parameter(name='data_format',
+                           label='data_format',
+                           get_cmd='FORMat?',
+                           set_cmd='FORMat {}',
+                           get_parser=self._parse_data_format,
+                           vals=Enum('ASCII', 'REAL'),
+                           docstring='Format of array transfers. REAL transfers '
+                                     'binary 64 bit floats, which is faster than '
+                                     'ASCII for large arrays.'
+                           )
+        self.data_format.get()
+
+        self.add_parameter(name='samples_per_read',
+                           label='samples_per_read',
+                           get_cmd=None,
+                           set_cmd=None,
+                           initial_value=int(1e5),
+                           vals=Ints(1, int(2e9)),
+                           docstring='Maximum number of samples acquired and '
+                                     'transferred by a single array read. Larger '
+                                     'time arrays are read in several blocks, '
+                                     'each armed separately, so events between '
+                                     'blocks are missed.'
+                           )
+
         self.add_parameter(name='timestats',
                            parameter_class=TimeStatistics)
 
@@ -180,3 +248,14 @@ class FCA3100(VisaInstrument):
                            )
 
         self.connect_message()
+
+    @staticmethod
+    def _parse_data_format(reply: str) -> str:
+        """
+        Converts the short or long form reply of FORMat? to the long form.
+        """
+        reply = reply.strip().upper()
+        for data_format in ('ASCII', 'REAL', 'PACKED'):
+            if data_format.startswith(reply[:3]):
+                return data_format
+        return reply
@@ -1,7 +1,8 @@
 from functools import partial
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Tuple
 
 from qcodes.instrument import InstrumentChannel
+from qcodes.parameters import MultiParameter
 
 if TYPE_CHECKING:
     from .Keithley_6500 import Keithley_6500
@@ -57,9 +58,60 @@ class Keithley_2000_Scan_Channel(InstrumentChannel):
         Returns: Measurement result
 
         """
-        if self.dmm.active_terminal.get() == 'REAR':
+        if self.dmm.active_terminal.get_latest() == 'REAR':
             self.write(f"SENS:FUNC '{quantity}', (@{self.channel:d})")
             self.write(f"ROUT:CLOS (@{self.channel:d})")
             return self.ask("READ?")
         else:
             raise RuntimeError("Front terminal is active instead of rear terminal.")
+
+
+class Keithley_2000_Scan(MultiParameter):
+    """
+    Reads all channels of the scan list of the 2000-SCAN scanner card at once.
+    The scan list is configured with ``configure`` (or
+    ``Keithley_6500.configure_scan``). A get triggers one scan over all
+    channels and fetches all readings from the reading buffer with a single
+    ``TRAC:DATA?`` query.
+    """
+    _units = {'VOLT': 'V', 'CURR': 'A', 'RES': 'Ohm', 'FRES': 'Ohm'}
+
+    def __init__(self, name: str, instrument: "Keithley_6500", **kwargs) -> None:
+        super().__init__(name, instrument=instrument, names=(), shapes=(), **kwargs)
+        self.scan_channels: Tuple[int, ...] = ()
+
+    def configure(self, functions: Dict[int, str]) -> None:
+        """
+        Configure the measurement function of each channel and create the
+        scan list. Channels are scanned in ascending order.
+        Args:
+            functions: Mapping of channel number to quantity to be measured
+                ('VOLT', 'CURR', 'RES' or 'FRES')
+        """
+        functions = {ch: quantity.upper() for ch, quantity in functions.items()}
+        for quantity in functions.values():
+            if quantity not in self._units:
+                raise ValueError(f"Quantity must be one of the following: {', '.join(self._units)}")
+        channels = tuple(sorted(functions))
+
+        for quantity in dict.fromkeys(functions.values()):
+            channel_list = ','.join(str(ch) for ch in channels if functions[ch] == quantity)
+            self.instrument.write(f"SENS:FUNC '{quantity}', (@{channel_list})")
+        self.instrument.write(f"ROUT:SCAN:CRE (@{','.join(str(ch) for ch in channels)})")
+        self.instrument.write("ROUT:SCAN:COUN:SCAN 1")
+
+        self.scan_channels = channels
+        self.names = tuple(f"ch{ch}" for ch in channels)
+        self.labels = tuple(f"{functions[ch]} CH{ch}" for ch in channels)
+        self.units = tuple(self._units[functions[ch]] for ch in channels)
+        self.shapes = tuple(() for _ in channels)
+
+    def get_raw(self) -> Tuple[float, ...]:
+        if not self.scan_channels:
+            raise RuntimeError("No scan list configured, call configure_scan first.")
+        if self.instrument.active_terminal.get_latest() != 'REAR':
+            raise RuntimeError("Front terminal is active instead of rear terminal.")
+        self.instrument.write("TRAC:CLE")
+        readings = self.instrument.ask(
+            f'INIT;*WAI;:TRAC:DATA? 1, {len(self.scan_channels)}, "defbuffer1", READ')
+        return tuple(float(value) for value in readings.split(','))
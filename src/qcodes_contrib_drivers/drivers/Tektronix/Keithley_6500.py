@@ -2,7 +2,8 @@ from qcodes.instrument.visa import VisaInstrument
 from qcodes.instrument import InstrumentChannel
 from qcodes.utils.validators import Numbers
 from functools import partial
-from .Keithley_2000_Scan import Keithley_2000_Scan_Channel
+from typing import Dict
+from .Keithley_2000_Scan import Keithley_2000_Scan_Channel, Keithley_2000_Scan
 
 
 class Keithley_Sense(InstrumentChannel):
@@ -94,7 +95,9 @@ class Keithley_6500(VisaInstrument):
         self.add_parameter('active_terminal',
                            label='active terminal',
                            get_cmd="ROUTe:TERMinals?",
-                           docstring="Active terminal of instrument. Can only be switched via knob on front panel.")
+                           max_val_age=10,
+                           docstring="Active terminal of instrument. Can only be switched via knob on front panel. "
+                                     "Measurements use the value cached within the last 10 s.")
 
         self.add_parameter('resistance',
                            unit='Ohm',
@@ -145,6 +148,22 @@ class Keithley_6500(VisaInstrument):
                 scan_channel = Keithley_2000_Scan_Channel(self, ch_number)
                 self.add_submodule(f"ch{ch_number:d}", scan_channel)
 
+            self.add_parameter('scan',
+                               parameter_class=Keithley_2000_Scan,
+                               docstring="Readings of all channels in the scan list, "
+                                         "see configure_scan.")
+
+    def configure_scan(self, functions: Dict[int, str]) -> None:
+        """
+        Configure the scan list of the scanner card, which is read with the ``scan`` parameter.
+        Args:
+            functions: Mapping of channel number to quantity to be measured
+                ('VOLT', 'CURR', 'RES' or 'FRES')
+        """
+        if 'scan' not in self.parameters:
+            raise RuntimeError("No scanner card detected.")
+        self.scan.configure(functions)
+
     # only measure if front terminal is active
     def _measure(self, quantity: str) -> str:
         """
@@ -156,7 +175,7 @@ class Keithley_6500(VisaInstrument):
         Returns: Measurement result
 
         """
-        if self.active_terminal.get() == 'FRON':
+        if self.active_terminal.get_latest() == 'FRON':
             return self.ask(f"MEAS:{quantity}?")
         else:
             raise RuntimeError("Rear terminal is active instead of front terminal.")
@@ -56,6 +56,8 @@ class Vaunix_LDA(Instrument):
 
         self.serial_number = serial_number
         self.reference = None
+        # channel currently selected in the DLL, None if unknown
+        self._selected_channel: Optional[int] = None
 
         if channel_names is None:
             channel_names = {}
@@ -148,6 +150,53 @@ class Vaunix_LDA(Instrument):
             self.dll.fnLDA_CloseDevice(self.reference)
         super().close()
 
+    def select_channel(self, channel_number: int) -> None:
+        """
+        Select the channel that subsequent DLL calls act on. The DLL is only
+        called if another channel is currently selected.
+
+        Args:
+            channel_number: the channel to select, starting from 1
+
+        Raises:
+            KeyError: if the instrument has no channel of this number
+        """
+        if channel_number != self._selected_channel:
+            self._channel_by_number(channel_number)
+            self.dll.fnLDA_SetChannel(self.reference, channel_number)
+            self._selected_channel = channel_number
+
+    def set_attenuations(self,
+                         attenuations: Dict[Union[int, str], float]) -> None:
+        """
+        Set the attenuation of several channels. The currently selected
+        channel is set first, so that every channel is selected at most once.
+
+        Args:
+            attenuations: attenuation in dB by channel number or channel name
+        """
+        channels = {}
+        for key, value in attenuations.items():
+            if isinstance(key, str):
+                channel = cast(LdaChannel, self.submodules[key])
+            else:
+                channel = self._channel_by_number(key)
+            channels[channel.channel_number] = (channel, value)
+
+        order = sorted(channels,
+                       key=lambda number: number != self._selected_channel)
+        for number in order:
+            channel, value = channels[number]
+            channel.attenuation.set(value)
+
+    def _channel_by_number(self, channel_number: int) -> "LdaChannel":
+        channel = next((ch for ch in self.submodules.values()
+                        if getattr(ch, "channel_number", None)
+                        == channel_number), None)
+        if channel is None:
+            raise KeyError(f"{self.name} has no channel {channel_number}")
+        return cast(LdaChannel, channel)
+
     def save_settings(self) -> None:
         """
         Save current settings to memory. Settings are automatically loaded
@@ -271,12 +320,12 @@ class LdaParameter(Parameter):
 
     def _switch_channel(self) -> None:
         """
-        Switch to this channel.
+        Switch to this channel, if it is not selected already.
         """
         if hasattr(self.instrument, "channel_number"):
-            instr = cast(Instrument, self.instrument)
-            instr.root_instrument.dll.fnLDA_SetChannel(self._reference,
-                                                       instr.channel_number)
+            instr = cast(LdaChannel, self.instrument)
+            root = cast(Vaunix_LDA, instr.root_instrument)
+            root.select_channel(instr.channel_number)
 
     def get_raw(self) -> float:
         """
@@ -0,0 +1,57 @@
+"""
+Reading of IEEE 488.2 definite length binary blocks, e.g. traces transferred
+with ``FORM:DATA REAL,32``.
+
+Shared by the network analyzer drivers of this package.
+"""
+from typing import List
+
+import numpy as np
+
+
+def read_ieee_block(visa_handle) -> bytes:
+    """
+    Reads one definite length block ``#<n><length><data>`` and the separator
+    or terminator following it.
+
+    The block is read by length, so that data bytes equal to the termination
+    character do not end the read. A terminator of several characters, e.g.
+    ``'\\r\\n'``, is read completely, according to the ``read_termination`` of
+    the resource.
+
+    Args:
+        visa_handle: pyvisa resource to read from.
+
+    Returns:
+        The data bytes of the block.
+    """
+    header = visa_handle.read_bytes(2)
+    if header[:1] != b'#' or not header[1:2].isdigit() or header[1:2] == b'0':
+        raise ValueError(f'Expected a definite length block, got {header!r}')
+    length = int(visa_handle.read_bytes(int(header[1:2])))
+    data = visa_handle.read_bytes(length)
+    # ';' between the responses of a compound query, else the terminator
+    if visa_handle.read_bytes(1) != b';':
+        termination = getattr(visa_handle, 'read_termination', None) or '\n'
+        if len(termination) > 1:
+            visa_handle.read_bytes(len(termination) - 1)
+    return data
+
+
+def read_real32_blocks(visa_handle, count: int,
+                       swapped: bool = True) -> List[np.ndarray]:
+    """
+    Reads the responses to a compound query of count traces transferred as
+    32 bit floats.
+
+    Args:
+        visa_handle: pyvisa resource to read from.
+        count: Number of blocks in the response.
+        swapped: True for little endian data (``FORM:BORD SWAP``).
+
+    Returns:
+        One float64 array per block.
+    """
+    dtype = '<f4' if swapped else '>f4'
+    return [np.frombuffer(read_ieee_block(visa_handle), dtype=dtype)
+            .astype(np.float64) for _ in range(count)]
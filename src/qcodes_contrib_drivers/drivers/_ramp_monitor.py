@@ -0,0 +1,101 @@
+"""
+Waiting for the end of a magnet ramp with as few queries as possible.
+
+Shared by the magnet power supply drivers of this package.
+"""
+import math
+import time
+from typing import Callable, Optional, Tuple, Union
+
+
+class RampMonitor:
+    """
+    Waits until a power supply finished ramping to a target value.
+
+    Instead of polling at a fixed interval, the time to reach the target is
+    estimated from the remaining distance and the ramp rate, and the monitor
+    sleeps for most of that time before the next poll. Close to the target
+    the interval shrinks to ``min_interval``.
+
+    Args:
+        read_state: Returns the present value and whether the power supply is
+            ramping. Drivers should read both with a single query where the
+            protocol allows it.
+        rate: Ramp rate in units of the value per second, or a callable
+            returning it.
+        tolerance: Maximum distance from the target at which the ramp is
+            done. If ``None``, the ramp is done as soon as the power supply
+            stops ramping.
+        min_interval: Minimum time between polls in seconds.
+        max_interval: Maximum time between polls in seconds, which bounds
+            the delay in noticing an unexpected stop of the ramp.
+        eta_fraction: Fraction of the estimated remaining ramp time to sleep
+            before the next poll.
+        sleep: Function used to wait, e.g. to skip waiting in simulation
+            or to interrupt a wait.
+    """
+
+    def __init__(self,
+                 read_state: Callable[[], Tuple[float, bool]],
+                 rate: Union[float, Callable[[], float]],
+                 tolerance: Optional[float] = None,
+                 min_interval: float = 0.2,
+                 max_interval: float = 60.0,
+                 eta_fraction: float = 0.9,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.read_state = read_state
+        self.rate = rate
+        self.tolerance = tolerance
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.eta_fraction = eta_fraction
+        self.sleep = sleep
+        self.polls = 0
+
+    def eta(self, value: float, target: float) -> float:
+        """
+        Estimated time in seconds to ramp from value to target.
+        """
+        rate = self.rate() if callable(self.rate) else self.rate
+        if rate <= 0:
+            return math.inf
+        return abs(target - value) / rate
+
+    def interval(self, value: float, target: float) -> float:
+        """
+        Time in seconds to wait before the next poll.
+        """
+        interval = self.eta_fraction * self.eta(value, target)
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def wait(self, target: float, timeout: Optional[float] = None) -> float:
+        """
+        Waits until the ramp to target is done.
+
+        Args:
+            target: Target value of the ramp.
+            timeout: Maximum time to wait in seconds.
+
+        Returns:
+            The value read by the last poll.
+
+        Raises:
+            TimeoutError: If the ramp is not done within timeout.
+        """
+        t_start = time.perf_counter()
+        while True:
+            value, ramping = self.read_state()
+            self.polls += 1
+            if not ramping and (self.tolerance is None
+                                or abs(target - value) <= self.tolerance):
+                return value
+
+            interval = self.interval(value, target)
+            if timeout is not None:
+                remaining = t_start + timeout - time.perf_counter()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        'Ramp to {} not done within {} s, last value '
+                        '{}.'.format(target, timeout, value))
+                interval = min(interval, remaining)
+            self.sleep(interval)
@@ -0,0 +1,121 @@
+import cffi
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Advantech.PCIE_1751 import (
+    Advantech_PCIE_1751, DAQNaviException)
+
+PORT_COUNT = 6
+ERROR_PARAM_OUT_OF_RANGE = 0xE0000001
+
+
+class FakeDAQNavi:
+    """
+    Stand-in for biodaq.dll. The output ports are looped back to the inputs
+    and every write to the output ports is recorded.
+    """
+    Success = 0
+    ModeWriteWithReset = 2
+
+    def __init__(self):
+        self.ffi = cffi.FFI()
+        self.outputs = np.zeros(PORT_COUNT, dtype=np.uint8)
+        self.writes = []
+
+    def __getattr__(self, name):
+        # functions that only return a status code
+        return lambda *args: self.Success
+
+    def InstantDoCtrl_getPortCount(self, do):
+        return PORT_COUNT
+
+    def _check(self, start, count):
+        return start < 0 or start + count > PORT_COUNT
+
+    def InstantDoCtrl_WriteAny(self, do, start, count, data):
+        if self._check(start, count):
+            return ERROR_PARAM_OUT_OF_RANGE
+        values = np.frombuffer(self.ffi.buffer(data, count), dtype=np.uint8)
+        self.outputs[start:start + count] = values
+        self.writes.append((start, values.tolist()))
+        return self.Success
+
+    def InstantDoCtrl_ReadAny(self, do, start, count, data):
+        if self._check(start, count):
+            return ERROR_PARAM_OUT_OF_RANGE
+        self.ffi.memmove(data, self.outputs[start:start + count].tobytes(),
+                         count)
+        return self.Success
+
+    InstantDiCtrl_ReadAny = InstantDoCtrl_ReadAny
+
+
+@pytest.fixture(scope="function")
+def dio(monkeypatch):
+    dll = FakeDAQNavi()
+    monkeypatch.setattr(Advantech_PCIE_1751, "_get_dll", lambda self: dll)
+    instrument = Advantech_PCIE_1751("pcie_1751_sim")
+    yield instrument
+
+    instrument.close()
+
+
+def test_write_and_read_port(dio):
+    dio.write_port(1, 0xa5)
+    dio.write_port(2, [1, 2, 3])
+
+    assert dio.read_port(1) == 0xa5
+    assert dio.read_port(1, 4) == [0xa5, 1, 2, 3]
+    with pytest.raises(ValueError):
+        dio.write_port(0, 256)
+    with pytest.raises(ValueError):
+        dio.write_port(4, [1, 2, 3])
+
+
+@pytest.mark.parametrize("i, n", [(4, 3), (-1, 1), (PORT_COUNT, 1)])
+def test_read_ports_out_of_range(dio, i, n):
+    # checked before the DLL may write past the read buffers
+    with pytest.raises(ValueError):
+        dio.read_port(i, n)
+    with pytest.raises(ValueError):
+        dio.read_output_port(i, n)
+
+
+def test_write_port_mask(dio):
+    dio.write_port(0, [0xff, 0x00])
+    dio.write_port(0, [0x00, 0xff], mask=0x0f)
+
+    np.testing.assert_array_equal(dio.read_output_port(0, 2), [0xf0, 0x0f])
+
+
+def test_write_pattern(dio):
+    pattern = np.arange(30, dtype=np.uint8).reshape(10, 3)
+    dio.write_port(0, [0xff] * PORT_COUNT)
+
+    statistics = dio.write_pattern(pattern, port=2, mask=[0x0f, 0xff, 0xf0])
+
+    assert statistics['samples'] == 10
+    expected = np.array([(pattern[k] & [0x0f, 0xff, 0xf0])
+                         | [0xf0, 0x00, 0x0f] for k in range(10)])
+    np.testing.assert_array_equal(
+        [values for port, values in dio.dll.writes[1:]], expected)
+    assert all(port == 2 for port, values in dio.dll.writes[1:])
+
+
+def test_timed_pattern(dio):
+    statistics = dio.write_pattern(np.arange(20), sample_period=1e-3)
+
+    assert statistics['samples'] == 20
+    assert statistics['duration'] >= 19e-3
+    assert 0 <= statistics['mean_jitter'] <= statistics['max_jitter']
+    assert dio.read_output_port(0)[0] == 19
+
+
+def test_write_pattern_error(dio):
+    with pytest.raises(ValueError):
+        dio.write_pattern(np.zeros((5, 3)), port=4)
+
+    # the playback stops at the first failed write
+    dio.dll.InstantDoCtrl_WriteAny = lambda *args: ERROR_PARAM_OUT_OF_RANGE
+    with pytest.raises(DAQNaviException):
+        dio.write_pattern(np.zeros((5, 1)))
@@ -0,0 +1,129 @@
+import ctypes
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Andor import DU401
+
+DRV_SUCCESS = 20002
+DRV_IDLE = 20073
+X_PIXELS = 1024
+
+
+class FakeAtmcdDLL:
+    """
+    Stand-in for atmcd64d.dll. Every acquired pixel holds the index of its
+    frame times X_PIXELS plus the pixel index.
+    """
+
+    def __init__(self):
+        self.acquisition_mode = 1
+        self.number_kinetics = 1
+        self.calls = {}
+
+    def __getattr__(self, name):
+        # functions that only return a status code
+        return lambda *args: self._count(name)
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        return DRV_SUCCESS
+
+    def GetDetector(self, x_pixels, y_pixels):
+        x_pixels._obj.value = X_PIXELS
+        y_pixels._obj.value = 1
+        return DRV_SUCCESS
+
+    def GetTemperatureRange(self, min_temp, max_temp):
+        min_temp._obj.value = -100
+        max_temp._obj.value = 20
+        return DRV_SUCCESS
+
+    def GetHeadModel(self, head_model):
+        head_model.value = b'DU401_BU2'
+        return DRV_SUCCESS
+
+    def GetStatus(self, status):
+        status._obj.value = DRV_IDLE
+        return DRV_SUCCESS
+
+    def SetAcquisitionMode(self, mode):
+        self.acquisition_mode = mode.value
+        return DRV_SUCCESS
+
+    def SetNumberKinetics(self, number):
+        self.number_kinetics = number.value
+        return DRV_SUCCESS
+
+    def GetAcquiredData(self, c_data, size):
+        self._count('GetAcquiredData')
+        data = np.arange(size, dtype=np.intc)
+        ctypes.memmove(c_data, data.ctypes.data, data.nbytes)
+        return DRV_SUCCESS
+
+
+@pytest.fixture(scope="function")
+def ccd(monkeypatch):
+    dll = FakeAtmcdDLL()
+    atmcd64d = DU401.atmcd64d
+
+    def fake_atmcd64d(dll_path=None):
+        wrapper = atmcd64d.__new__(atmcd64d)
+        wrapper.dll = dll
+        wrapper.verbose = False
+        return wrapper
+
+    monkeypatch.setattr(DU401, "atmcd64d", fake_atmcd64d)
+    instrument = DU401.Andor_DU401("andor_sim")
+    yield instrument
+
+    instrument.close()
+
+
+def test_spectrum(ccd):
+    spectrum = ccd.spectrum.get()
+    assert isinstance(spectrum, np.ndarray)
+    np.testing.assert_array_equal(spectrum, np.arange(X_PIXELS))
+
+
+def test_acquired_data_buffer_is_reused(ccd):
+    first = ccd.atmcd64d.get_acquired_data(X_PIXELS)
+    second = ccd.atmcd64d.get_acquired_data(X_PIXELS)
+    assert np.shares_memory(first, second)
+    # the spectrum parameter returns a copy that is not overwritten
+    assert not np.shares_memory(ccd.spectrum.get(), second)
+
+
+def test_kinetic_series_single_transfer(ccd):
+    ccd.acquisition_mode.set('kinetic series')
+    ccd.number_kinetics.set(100)
+    n_transfers = ccd.atmcd64d.dll.calls.get('GetAcquiredData', 0)
+
+    series = ccd.kinetic_series.get()
+
+    assert ccd.atmcd64d.dll.acquisition_mode == 3
+    assert series.shape == (100, X_PIXELS)
+    np.testing.assert_array_equal(
+        series[7], np.arange(7 * X_PIXELS, 8 * X_PIXELS))
+    assert ccd.atmcd64d.dll.calls['GetAcquiredData'] == n_transfers + 1
+    # blocks in the driver once per spectrum instead of polling the status
+    assert ccd.atmcd64d.dll.calls['WaitForAcquisition'] == 100
+
+
+def test_kinetic_series_requires_kinetic_mode(ccd):
+    with pytest.raises(RuntimeError):
+        ccd.kinetic_series.get()
+
+
+def test_kinetic_series_shape_defined_by_default(ccd):
+    assert ccd.number_kinetics.get() == 1
+    assert ccd.atmcd64d.dll.number_kinetics == 1
+    ccd.acquisition_mode.set('kinetic series')
+
+    assert ccd.kinetic_series.get().shape == (1, X_PIXELS)
+
+
+def test_spectrum_rejects_kinetic_mode(ccd):
+    ccd.acquisition_mode.set('kinetic series')
+    with pytest.raises(RuntimeError, match='kinetic_series'):
+        ccd.spectrum.get()
@@ -0,0 +1,244 @@
+from collections import deque
+
+import pytest
+from pyvisa import constants
+from pyvisa.errors import VisaIOError
+
+from qcodes_contrib_drivers.drivers.Basel import DAC_SP1060
+from qcodes_contrib_drivers.drivers.Basel.DAC_SP1060 import (SP1060,
+                                                            SP1060Exception)
+
+
+class FakeSP1060Serial:
+    """
+    Stand-in for the serial resource of a SP1060. Instead of waiting, the
+    transfer time of every byte and the latency of every turnaround, i.e.
+    a read waiting for the reply to the last write, are added to
+    ``elapsed``. Messages longer than the input buffer are lost.
+    """
+
+    def __init__(self, baud_rate=115200, turnaround=2e-3, clear_time=10e-3,
+                 input_buffer=None):
+        self.byte_time = 10 / baud_rate
+        self.turnaround = turnaround
+        self.clear_time = clear_time
+        self.input_buffer = input_buffer
+        self.elapsed = 0.0
+        self.dac = {ch: 0x800000 for ch in range(1, 25)}
+        self.wav = {}
+        # number of busy replies to the next BUSY? queries
+        self.busy_polls = 0
+        self.messages = []
+        self.clears = 0
+        self.timeout_next_read = False
+        self._replies = deque()
+        self._waiting = False
+
+    def attach(self, instrument):
+        instrument.visa_handle.write = self.write
+        instrument.visa_handle.read = self.read
+        instrument.visa_handle.query = self.query
+        instrument.visa_handle.clear = self.clear
+        instrument.visabackend = 'fake'
+
+    def write(self, message):
+        self.messages.append(message)
+        self.elapsed += (len(message) + 2) * self.byte_time
+        if self.input_buffer is not None and len(message) > self.input_buffer:
+            return len(message) + 2, constants.StatusCode.success
+        for cmd in message.split('\r\n'):
+            self._replies.append(self._execute(cmd))
+        self._waiting = True
+        return len(message) + 2, constants.StatusCode.success
+
+    def read(self):
+        if self.timeout_next_read or not self._replies:
+            self.timeout_next_read = False
+            raise VisaIOError(constants.StatusCode.error_timeout)
+        if self._waiting:
+            self.elapsed += self.turnaround
+            self._waiting = False
+        reply = self._replies.popleft()
+        self.elapsed += (len(reply) + 2) * self.byte_time
+        return reply
+
+    def query(self, message):
+        self.write(message)
+        return self.read()
+
+    def clear(self):
+        self.elapsed += self.clear_time
+        self.clears += 1
+        self._replies.clear()
+
+    def _execute(self, cmd):
+        if cmd.endswith('BUSY?'):
+            busy = self.busy_polls > 0
+            self.busy_polls = max(self.busy_polls - 1, 0)
+            return '1' if busy else '0'
+        if cmd.startswith('C '):
+            return '0'
+        if cmd.startswith('WAV-'):
+            mem, address, voltage = cmd.split()
+            self.wav[(mem[-1], int(address, 16))] = float(voltage)
+            return '0'
+        channel, arg = cmd.split(' ', 1)
+        if not channel.isdigit() or int(channel) not in self.dac:
+            return '1'
+        if arg == 'V?':
+            return f'{self.dac[int(channel)]:X}'
+        value = int(arg, 16)
+        if not 0 <= value <= 0xFFFFFF:
+            return '3'
+        self.dac[int(channel)] = value
+        return '0'
+
+
+@pytest.fixture(scope="function")
+def dac_serial():
+    instrument = SP1060(
+        "sp1060_sim", "ASRL1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:Basel_SP1060.yaml")
+    serial = FakeSP1060Serial()
+    serial.attach(instrument)
+    yield instrument, serial
+
+    instrument.close()
+
+
+def test_write_batch(dac_serial):
+    dac, serial = dac_serial
+
+    replies = dac.write_batch(['1 A00000', '2 600000', '1 V?'])
+
+    assert replies == ['0', '0', 'A00000']
+    assert len(serial.messages) == 1
+    assert serial.dac[2] == 0x600000
+    assert serial.clears == 0
+
+
+def test_write_batch_not_acknowledged(dac_serial):
+    dac, serial = dac_serial
+
+    with pytest.raises(SP1060Exception, match="'25 800000': '1'"):
+        dac.write_batch(['1 A00000', '25 800000'])
+    # all replies were read, the buffer does not need to be cleared
+    assert dac.write('1 V?') == 'A00000'
+    assert serial.clears == 0
+
+
+def test_clear_after_timeout(dac_serial):
+    dac, serial = dac_serial
+    dac.write('1 A00000')
+    dac.write('2 A00000')
+    assert serial.clears == 0
+
+    serial.timeout_next_read = True
+    with pytest.raises(VisaIOError):
+        dac.write('1 V?')
+
+    assert dac.write('2 V?') == 'A00000'
+    assert serial.clears == 1
+
+
+def test_set_all_steps_channels_together(dac_serial):
+    dac, serial = dac_serial
+    dac.set_all(0)
+    serial.messages.clear()
+
+    dac.set_all(0.05)
+
+    # 5 steps of 0.01 V with one message for all 24 channels each
+    assert len(serial.messages) == 5
+    assert all(len(message.split('\r\n')) == 24
+               for message in serial.messages)
+    assert dac.ch24.parameters['volt'].cache.get() == pytest.approx(0.05)
+    assert serial.dac[24] == dac._vval_to_dacval(0.05)
+
+
+def test_write_batch_single_turnaround(dac_serial):
+    """
+    Modelled transfer time of one command per channel, sent one by one and
+    pipelined.
+    """
+    dac, serial = dac_serial
+    cmds = [f'{ch} {0x800000 + ch:X}' for ch in range(1, 25)]
+
+    serial.elapsed = 0
+    for cmd in cmds:
+        dac.write(cmd)
+    sequential = serial.elapsed
+
+    serial.elapsed = 0
+    dac.write_batch(cmds)
+    pipelined = serial.elapsed
+
+    # the pipelined batch waits for a single turnaround
+    assert pipelined < sequential / 2
+    assert pipelined == pytest.approx(
+        sum(len(cmd) + 2 + 3 for cmd in cmds) * serial.byte_time
+        + serial.turnaround)
+
+
+@pytest.fixture(scope="function")
+def sleeps(monkeypatch):
+    """
+    Records the calls of time.sleep by the driver instead of sleeping.
+    """
+    calls = []
+    monkeypatch.setattr(DAC_SP1060.time, "sleep", calls.append)
+    return calls
+
+
+def test_wait_idle_backoff(dac_serial, sleeps):
+    dac, serial = dac_serial
+    serial.busy_polls = 3
+
+    waited = dac.wait_idle('C WAV-A BUSY?')
+
+    assert sleeps == pytest.approx([1e-3, 2e-3, 4e-3])
+    assert waited == pytest.approx(7e-3)
+
+
+def test_upload_without_wasted_sleep(dac_serial, sleeps):
+    dac, serial = dac_serial
+    voltages = [n / 1000 for n in range(2000)]
+
+    statistics = dac.wma.upload(voltages)
+    dac.wma.toawg()
+
+    assert sleeps == []
+    assert statistics['wait_time'] == 0
+    assert statistics['samples'] == 2000
+    assert statistics['samples_per_s'] > 0
+    assert serial.wav[('a', 0x7CF)] == pytest.approx(1.999)
+    assert len(serial.wav) == 2000
+
+
+def test_new_waveform_waits_after_apply(dac_serial, monkeypatch):
+    dac, serial = dac_serial
+    sleeps = []
+    monkeypatch.setattr(DAC_SP1060.time, "sleep",
+                        lambda delay: sleeps.append((delay,
+                                                     serial.messages[-1])))
+
+    dac.set_newWaveform(channel='3', wavemem='1')
+
+    # the wave memory is filled before it is saved and written
+    assert sleeps == [(0.2, 'C SWG APPLY')]
+    assert serial.messages.index('C WAV-B SAVE') == \
+        serial.messages.index('C SWG APPLY') + 1
+
+
+def test_upload_chunk_size_tuning(dac_serial):
+    dac, serial = dac_serial
+    serial.input_buffer = 2048
+    dac.upload_chunk_size = 256
+
+    statistics = dac.wma.upload([0.5] * 3000)
+
+    assert len(serial.wav) == 3000
+    assert statistics['retries'] >= 1
+    # about 22 bytes per command
+    assert statistics['chunk_size'] * 22 <= 2048
+    assert dac.upload_chunk_size == statistics['chunk_size']
@@ -0,0 +1,193 @@
+import re
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.CopperMountain.M5180 import M5180
+
+
+class M5180Emulator:
+    """
+    Replies to the trace queries of the M5180 driver in the transfer format
+    set with FORM:DATA, and counts the bytes read by the driver. The encoded
+    replies are cached, so that timing the driver measures the decoding.
+    """
+
+    def __init__(self, npts, start=1e9, stop=2e9):
+        rng = np.random.default_rng(0)
+        self.frequencies = np.linspace(start, stop, npts)
+        # re, im pairs of four traces
+        self.traces = rng.normal(size=(4, 2 * npts))
+        self.definitions = ['S11', 'S12', 'S21', 'S22']
+        self.formats = ['SMIT', 'MLOG', 'SMIT', 'PHAS']
+        self.format = 'ASCII'
+        self.bytes_read = 0
+        self.writes = []
+        self._encoded = {}
+        self._out = bytearray()
+
+    def attach(self, instrument):
+        instrument.visa_handle.write = self.write
+        instrument.visa_handle.read = self.read
+        instrument.visa_handle.read_bytes = self.read_bytes
+        instrument.visa_handle.query = lambda cmd: (self.write(cmd),
+                                                    self.read())[1]
+
+    def write(self, cmd):
+        self.writes.append(cmd)
+        replies = []
+        for part in re.split(r';:?', cmd):
+            if part.startswith('FORM:DATA '):
+                self.format = part.split(' ', 1)[1]
+            elif '?' in part:
+                replies.append(self._reply(part))
+        if replies:
+            self._out += b';'.join(replies) + b'\n'
+        return len(cmd), 0
+
+    def read(self):
+        end = self._out.index(b'\n') + 1
+        return self.read_bytes(end).decode().rstrip('\n')
+
+    def read_bytes(self, count):
+        data = bytes(self._out[:count])
+        del self._out[:count]
+        self.bytes_read += len(data)
+        return data
+
+    def _reply(self, query):
+        match = re.fullmatch(r'CALC1:(PAR|TRAC)(\d)(:DEF|:FORM|:DATA:FDAT)\?',
+                             query)
+        if match is not None and match.group(3) == ':DEF':
+            return self.definitions[int(match.group(2)) - 1].encode()
+        if match is not None and match.group(3) == ':FORM':
+            return self.formats[int(match.group(2)) - 1].encode()
+        if match is not None:
+            data = self.traces[int(match.group(2)) - 1]
+        elif query == 'SENS1:FREQ:DATA?':
+            data = self.frequencies
+        else:
+            return {'*OPC?': '1',
+                    'CALC1:PAR:COUN?': str(len(self.definitions)),
+                    'SENS1:FREQ:STAR?': str(self.frequencies[0]),
+                    'SENS1:FREQ:STOP?': str(self.frequencies[-1]),
+                    'SENS1:SWE:POIN?': str(self.frequencies.size),
+                    'TRIG:SOUR?': 'BUS',
+                    'FORM:DATA?': self.format}[query].encode()
+
+        key = (query, self.format)
+        if key not in self._encoded:
+            if self.format.startswith('REAL'):
+                dtype = '<f4' if self.format == 'REAL32' else '<f8'
+                raw = data.astype(dtype).tobytes()
+                length = str(len(raw)).encode()
+                self._encoded[key] = (b'#' + str(len(length)).encode()
+                                      + length + raw)
+            else:
+                self._encoded[key] = ','.join(
+                    f'{v:.12e}' for v in data).encode()
+        return self._encoded[key]
+
+
+@pytest.fixture(scope="function")
+def vna_emulator():
+    instrument = M5180(
+        "m5180_sim", "TCPIP::192.168.0.1::5025::SOCKET",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:CopperMountainM5180.yaml")
+    emulator = M5180Emulator(instrument.npts())
+    emulator.attach(instrument)
+    yield instrument, emulator
+
+    instrument.close()
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_get_s(vna_emulator, binary):
+    vna, emulator = vna_emulator
+    vna.binary_transfer(binary)
+    emulator.writes.clear()
+
+    freq, s11_mag, s11_phase, *_, s22_mag, s22_phase = vna.get_s()
+
+    trace_queries = [cmd for cmd in emulator.writes if 'DATA' in cmd]
+    assert len(trace_queries) == 2
+    # the frequencies keep their precision in binary mode
+    np.testing.assert_array_equal(freq, emulator.frequencies)
+    s22 = emulator.traces[3][0::2] + 1j * emulator.traces[3][1::2]
+    np.testing.assert_allclose(s22_mag, 20 * np.log10(np.abs(s22)),
+                               rtol=1e-5)
+    np.testing.assert_allclose(s22_phase, np.angle(s22), rtol=1e-5)
+    assert vna.data_transfer_format.cache.get() == ('real32' if binary
+                                                     else 'ascii')
+
+
+def test_frequencies_are_cached(vna_emulator):
+    vna, emulator = vna_emulator
+    vna.get_s()
+    vna.get_s()
+    assert emulator.writes.count('SENS1:FREQ:DATA?') == 1
+
+    # e.g. after setting the number of points
+    vna.update_lin_traces()
+    vna.get_s()
+    assert emulator.writes.count('SENS1:FREQ:DATA?') == 2
+
+
+def test_get_traces(vna_emulator):
+    vna, emulator = vna_emulator
+    vna.binary_transfer(True)
+
+    data = vna.get_traces()
+
+    assert data.dtype.names == ('frequency', 'tr1_s11', 'tr2_s12',
+                                'tr3_s21', 'tr4_s22')
+    assert data['tr1_s11'].dtype == np.complex128
+    assert data['tr2_s12'].dtype == np.float64
+    np.testing.assert_allclose(data['tr2_s12'], emulator.traces[1][0::2],
+                               rtol=1e-6)
+
+
+def test_transfer_format_and_binary_transfer_agree(vna_emulator):
+    vna, emulator = vna_emulator
+
+    vna.data_transfer_format('real32')
+    assert vna.binary_transfer.cache.get() is True
+    vna.binary_transfer(False)
+    assert vna.data_transfer_format.cache.get() == 'ascii'
+    assert emulator.format == 'ASCII'
+
+    # 64 bit floats are read as such
+    vna.data_transfer_format('real')
+    assert vna.binary_transfer.cache.get() is True
+    data = vna.get_traces()
+    np.testing.assert_array_equal(data['tr2_s12'], emulator.traces[1][0::2])
+    assert emulator.format == 'REAL'
+
+    emulator.format = 'ASCII'
+    assert vna.data_transfer_format() == 'ascii'
+    assert vna.binary_transfer.cache.get() is False
+
+
+def test_binary_transfer_reads_fewer_bytes(vna_emulator):
+    """
+    Bytes on the wire of four 10k point traces, in both formats.
+    """
+    vna, _ = vna_emulator
+    emulator = M5180Emulator(npts=10001)
+    emulator.attach(vna)
+
+    results = {}
+    for binary in (False, True):
+        vna.binary_transfer(binary)
+        # fill the reply cache of the emulator and the frequency cache
+        vna.get_s()
+        emulator.bytes_read = 0
+        data = vna.get_s()
+        results[binary] = (emulator.bytes_read, data)
+
+    assert results[True][0] < results[False][0] / 4
+    # magnitudes and phases of 32 bit floats
+    for binary_values, ascii_values in zip(results[True][1],
+                                           results[False][1]):
+        np.testing.assert_allclose(binary_values, ascii_values, rtol=1e-5,
+                                   atol=1e-5)
@@ -0,0 +1,96 @@
+import pytest
+
+from qcodes_contrib_drivers.drivers.Cryogenic.CryogenicSMS120C import \
+    CryogenicSMS120C
+from qcodes_contrib_drivers.drivers.Cryogenic.CryogenicSMS120Csim import \
+    SMS120CEmulator
+
+
+@pytest.fixture(scope="function")
+def magnet_emulator():
+    instrument = CryogenicSMS120C(
+        "sms120c_sim", "ASRL1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:CryogenicSMS120C.yaml")
+    emulator = SMS120CEmulator(speedup=200)
+    emulator.attach(instrument)
+    instrument.ramp_controller.min_poll_interval = 0.01
+    instrument.ramp_controller.max_poll_interval = 0.05
+    yield instrument, emulator
+
+    instrument.close()
+
+
+def test_ramp_returns_future(magnet_emulator):
+    magnet, emulator = magnet_emulator
+    future = magnet.ramp_controller.ramp_to(0.5)
+
+    assert magnet.ramp_controller.busy
+    # other instrument I/O is possible during the ramp
+    assert magnet.rampStatus() in ('RAMPING', 'HOLDING')
+    assert future.result(timeout=10) == pytest.approx(0.5, abs=0.003)
+    assert emulator.output == pytest.approx(0.5)
+    assert magnet.field.cache.get() == pytest.approx(0.5, abs=0.003)
+    assert not magnet.ramp_controller.busy
+
+
+def test_limits_are_cached(magnet_emulator):
+    magnet, emulator = magnet_emulator
+    magnet.ramp_controller.ramp_to(0.1).result(timeout=10)
+    emulator.commands.clear()
+
+    magnet.ramp_controller.ramp_to(0.2).result(timeout=10)
+
+    for cmd in ('GET MAX', 'GET RATE', 'HEATER', 'TESLA'):
+        assert cmd not in emulator.commands
+    with pytest.raises(ValueError):
+        magnet.ramp_controller.ramp_to(6)
+
+
+def test_polarity_reversal(magnet_emulator):
+    magnet, emulator = magnet_emulator
+    magnet.ramp_controller.ramp_to(0.1).result(timeout=10)
+
+    field = magnet.ramp_controller.ramp_to(-0.1).result(timeout=10)
+
+    assert field == pytest.approx(-0.1, abs=0.003)
+    assert emulator.polarity == 'NEGATIVE'
+    assert magnet.polarity.cache.get() == 'NEGATIVE'
+    commands = emulator.commands
+    assert commands.index('RAMP ZERO') < commands.index('DIRECTION -')
+
+
+def test_quench_fails_ramp(magnet_emulator):
+    magnet, emulator = magnet_emulator
+    emulator.speedup = 1
+    future = magnet.ramp_controller.ramp_to(1)
+    emulator.quench()
+
+    with pytest.raises(RuntimeError, match='QUENCH'):
+        future.result(timeout=10)
+
+
+def test_abort(magnet_emulator):
+    magnet, emulator = magnet_emulator
+    emulator.speedup = 1
+    future = magnet.ramp_controller.ramp_to(1)
+    magnet.ramp_controller.abort()
+
+    with pytest.raises(RuntimeError, match='aborted'):
+        future.result(timeout=10)
+    assert emulator.paused
+
+
+def test_set_field_bidirectional_does_not_block(magnet_emulator):
+    magnet, emulator = magnet_emulator
+    emulator.speedup = 1
+
+    future = magnet._set_field_bidirectional(1)
+
+    assert not future.done()
+    magnet.ramp_controller.abort()
+    with pytest.raises(RuntimeError, match='aborted'):
+        future.result(timeout=10)
+
+    emulator.speedup = 200
+    field = magnet._set_field_bidirectional(-0.1, wait=True).result(timeout=0)
+    assert field == pytest.approx(-0.1, abs=0.003)
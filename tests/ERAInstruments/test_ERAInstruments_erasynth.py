@@ -0,0 +1,191 @@
+import json
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.ERAInstruments import erasynth
+from qcodes_contrib_drivers.drivers.ERAInstruments.erasynth import (
+    _CMD_TO_JSON_MAPPING, ERASynthPlus)
+
+
+class FakeERASynthSerial:
+    """
+    Stand-in for the serial resource of an ERASynth+. Readable settings are
+    stored in the configuration JSON; a command listed in ``ignore`` does not
+    take effect for the given number of writes. Every command is followed by
+    a debug line that the driver has to discard.
+    """
+
+    def __init__(self):
+        self.config = {"rfoutput": "0", "amplitude": "0.00",
+                       "frequency": "1000000000"}
+        self.config.update({key: "0" for key in _CMD_TO_JSON_MAPPING.values()})
+        self.diagnostic = {"temperature": "31.2", "model": "1",
+                           "serial_number": "0123", "em": "1.0.18"}
+        self.ignore = {}
+        self.commands = []
+        # bytes left in the read buffer when a command was sent
+        self.stale_bytes = []
+        self.read_termination = self.write_termination = "\r\n"
+        self.timeout = 10000
+        self._buffer = bytearray()
+
+    @property
+    def bytes_in_buffer(self):
+        return len(self._buffer)
+
+    def read_bytes(self, count):
+        data = bytes(self._buffer[:count])
+        del self._buffer[:count]
+        return data
+
+    def clear(self):
+        pass
+
+    def close(self):
+        pass
+
+    def write(self, message):
+        cmd = message[1:]
+        self.commands.append(cmd)
+        self.stale_bytes.append(len(self._buffer))
+        self._buffer += b"debug: " + cmd.encode() + b"\r\n"
+        for prefix, key in sorted(_CMD_TO_JSON_MAPPING.items(),
+                                  key=lambda item: -len(item[0])):
+            if cmd.startswith(prefix):
+                if self.ignore.get(prefix, 0) > 0:
+                    self.ignore[prefix] -= 1
+                else:
+                    self.config[key] = cmd[len(prefix):]
+                break
+        return len(message), 0
+
+    def query(self, message):
+        cmd = message[1:]
+        self.commands.append(cmd)
+        self.stale_bytes.append(len(self._buffer))
+        if cmd == "RA":
+            return json.dumps(self.config, separators=(",", ":"))
+        if cmd == "RD":
+            return json.dumps(self.diagnostic, separators=(",", ":"))
+        if cmd.startswith("F"):
+            self.config["frequency"] = cmd[1:]
+            return f"Frequency: {cmd[1:]} Hz"
+        if cmd.startswith("A"):
+            self.config["amplitude"] = cmd[1:]
+            return f"Amplitude: {cmd[1:]} dBm"
+        if cmd.startswith("P0"):
+            self.config["rfoutput"] = cmd[2:]
+            return "RF Output " + {"0": "OFF", "1": "ON"}[cmd[2:]]
+        raise ValueError(f"unexpected query {cmd!r}")
+
+
+@pytest.fixture(scope="function")
+def erasynth_serial(monkeypatch):
+    serial = FakeERASynthSerial()
+    monkeypatch.setattr(ERASynthPlus, "_open_resource",
+                        lambda self, address, visalib: (serial, "fake", None))
+    instrument = ERASynthPlus("erasynth_fake", "ASRL1::INSTR")
+    serial.commands.clear()
+    yield instrument, serial
+
+    instrument.close()
+
+
+@pytest.fixture(scope="function")
+def sleeps(monkeypatch):
+    """
+    Records the calls of time.sleep by the driver instead of sleeping.
+    """
+    calls = []
+    monkeypatch.setattr(erasynth.time, "sleep", calls.append)
+    return calls
+
+
+def test_configuration_cache(erasynth_serial):
+    synth, serial = erasynth_serial
+    synth.config_cache_ttl(100)
+
+    assert synth.modulation_type() == "narrowband_fm"
+    assert synth.sweep_trigger() == "freerun"
+    assert serial.commands.count("RA") == 1
+
+    # a setting changed by other means is only seen once the cache expires
+    serial.config["modulation_type"] = "2"
+    assert synth.modulation_type() == "narrowband_fm"
+    synth.config_cache_ttl(0)
+    assert synth.modulation_type() == "am"
+    assert serial.commands.count("RA") == 2
+
+
+def test_write_confirmation_retries(erasynth_serial, sleeps):
+    synth, serial = erasynth_serial
+    serial.ignore["M0"] = 2
+
+    synth.modulation_type("pulse")
+
+    assert serial.config["modulation_type"] == "3"
+    assert serial.commands.count("M03") == 3
+    assert sleeps == pytest.approx([0.01, 0.02])
+    # the debug lines are discarded before every command
+    assert not any(serial.stale_bytes)
+
+
+def test_write_confirmation_gives_up(erasynth_serial, sleeps):
+    synth, serial = erasynth_serial
+    synth.max_write_retries(3)
+    serial.ignore["M0"] = 100
+
+    with pytest.raises(RuntimeError, match="modulation_type"):
+        synth.modulation_type("am")
+
+    assert serial.commands.count("M02") == 4
+    assert sleeps == pytest.approx([0.01, 0.02, 0.04])
+
+
+def test_batch_confirms_once(erasynth_serial):
+    synth, serial = erasynth_serial
+
+    with synth.batch():
+        synth.modulation_type("am")
+        synth.modulation_am_depth(30)
+        with synth.batch():
+            synth.modulation_en(True)
+        assert serial.commands.count("RA") == 0
+
+    assert serial.commands.count("RA") == 1
+    assert serial.config["modulation_type"] == "2"
+    assert serial.config["modulation_on_off"] == "1"
+
+
+def test_batch_confirms_nothing_on_error(erasynth_serial):
+    synth, serial = erasynth_serial
+
+    with pytest.raises(KeyError):
+        with synth.batch():
+            synth.modulation_type("am")
+            raise KeyError("user error")
+
+    assert serial.commands == ["M02"]
+
+
+def test_setup_sweep(erasynth_serial):
+    synth, serial = erasynth_serial
+
+    assert synth.setup_sweep(np.linspace(1e9, 2e9, 101))
+
+    assert serial.config["sweep_start"] == "1000000000"
+    assert serial.config["sweep_stop"] == "2000000000"
+    assert serial.config["sweep_step"] == "10000000"
+    assert serial.config["sweep_start_stop"] == "1"
+
+
+def test_setup_sweep_rejects_fractional_step(erasynth_serial):
+    synth, serial = erasynth_serial
+
+    # a step of 10/3 Hz cannot be swept by the instrument
+    assert not synth.setup_sweep(np.linspace(1e9, 1e9 + 10, 4))
+    assert not synth.setup_sweep([2e9, 1e9])
+
+    assert serial.config["sweep_start_stop"] == "0"
+    assert serial.config["sweep_step"] == "0"
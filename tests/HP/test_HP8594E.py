@@ -29,3 +29,79 @@ def test_freq_axis(driver):
     driver.start_freq(9000)
     driver.stop_freq(2900000000.0)
     assert (driver.freq_axis() == np.linspace(9000, 2900000000.0, 401)).all
+
+
+@pytest.fixture(scope="function")
+def trace_words(driver):
+    """
+    Trace in measurement units as returned by "TRA?" with "TDF B" and
+    "MDS W", and the queries sent to the instrument.
+    """
+    words = np.random.default_rng(0).integers(0, 8000, 401)
+    driver.visa_handle.read_raw = lambda: words.astype(">i2").tobytes()
+
+    queries = []
+    query = driver.visa_handle.query
+
+    def recording_query(cmd):
+        queries.append(cmd)
+        if cmd == "TS;TDF P;TRA?;":
+            return ",".join(str(x) for x in (words - 8000) * 0.01 + 10)
+        return query(cmd)
+
+    driver.visa_handle.query = recording_query
+    return words, queries
+
+
+def test_trace_bytes(driver, trace_words):
+    words, _ = trace_words
+    driver.reference_level(10)
+    driver.log_scale(10)
+
+    trace = driver.trace()
+
+    # 0.01 dB per measurement unit at 10 dB/div
+    expected = [(x - 8000) * 0.01 + 10 for x in words]
+    assert trace == pytest.approx(expected)
+
+    driver.trace.transfer_type = "ASCII"
+    assert driver.trace() == pytest.approx(trace)
+
+
+def test_trace_scale_is_cached(driver, trace_words):
+    words, queries = trace_words
+    driver.reference_level(10)
+    driver.log_scale(10)
+    driver.trace()
+
+    driver.reference_level(20)
+    driver.log_scale(5)
+    trace = driver.trace()
+
+    assert trace == pytest.approx((words - 8000) * 0.005 + 20)
+    assert "RL?" not in queries
+    assert "LG?" not in queries
+
+
+def test_freq_axis_follows_span(driver):
+    driver.freq_axis()
+    assert driver.start_freq.cache.valid
+
+    driver.span(1e6)
+
+    assert not driver.start_freq.cache.valid
+    assert not driver.stop_freq.cache.valid
+    assert driver.freq_axis()[0] == driver.start_freq.get_latest()
+
+
+def test_repeated_traces_do_not_query_scale(driver, trace_words):
+    """
+    Repeated trace reads use the cached scale.
+    """
+    _, queries = trace_words
+    first = driver.trace()
+    queries.clear()
+
+    for _ in range(10):
+        np.testing.assert_array_equal(driver.trace(), first)
+    assert queries == []
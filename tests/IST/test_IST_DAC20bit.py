@@ -0,0 +1,53 @@
+import pytest
+
+from qcodes_contrib_drivers.drivers.IST import DAC20bit as dac20bit_module
+from qcodes_contrib_drivers.drivers.IST.DAC20bit import IST_20
+from qcodes_contrib_drivers.drivers.IST.ISTsim import IST20Loopback
+
+
+@pytest.fixture(scope="function")
+def driver(monkeypatch):
+    monkeypatch.setattr(dac20bit_module.serial, "Serial", IST20Loopback)
+    dac = IST_20("IST_20_sim", interface="loopback")
+    yield dac
+
+    dac.close()
+
+
+def test_set_dacs_fast_single_write(driver):
+    ser = driver.ser
+    channels = [3, 7, 28, 30]
+    mvoltages = [-1000.0, 250.0, 2000.0, 9000.0]
+    n_writes = ser.write_calls
+
+    reply = driver.set_dacs_fast(channels, mvoltages)
+
+    assert ser.write_calls == n_writes + 1
+    message = ser.written[-1]
+    assert len(message) == 4 * len(channels)
+    # dacs 3 and 28 are fast and not acknowledged
+    assert [message[i] >> 5 for i in range(0, 16, 4)] == [
+        0b110, 0b100, 0b110, 0b100]
+    assert len(reply) == 4 * 2
+    for channel, mvoltage in zip(channels, mvoltages):
+        assert ser.rack.codes[channel - 1] == \
+            driver._mvoltage_to_bytes(mvoltage)
+    driver.readback_every(1)
+    for channel, mvoltage in zip(channels, mvoltages):
+        assert driver.parameters[f"dac{channel}"].get() == pytest.approx(
+            mvoltage, abs=0.1)
+        assert driver.parameters[f"dac{channel}"].cache.get() == \
+            pytest.approx(mvoltage, abs=0.1)
+
+
+def test_set_dacs_fast_validates(driver):
+    ser = driver.ser
+    n_writes = ser.write_calls
+
+    with pytest.raises(ValueError):
+        driver.set_dacs_fast([1, 2], [0.0, 10001.0])
+    with pytest.raises(ValueError):
+        driver.set_dacs_fast([33], [0.0])
+
+    assert ser.write_calls == n_writes
+    assert ser.rack.codes[0] == 0
@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+
+from qcodes_contrib_drivers.drivers.IST import FastDAC as fastdac_module
+from qcodes_contrib_drivers.drivers.IST.FastDAC import FastDAC
+from qcodes_contrib_drivers.drivers.IST.ISTsim import (FastDACLoopback,
+                                                       LoopbackSerial)
+from qcodes_contrib_drivers.drivers.IST._serial import read_bytes
+
+
+@pytest.fixture(scope="function")
+def driver(monkeypatch):
+    monkeypatch.setattr(fastdac_module.serial, "Serial", FastDACLoopback)
+    dac = FastDAC("FastDAC_sim", interface="loopback")
+    yield dac
+
+    dac.close()
+
+
+def test_read_bytes_in_bulk():
+    ser = LoopbackSerial(responder=lambda data: bytes(range(68)),
+                         chunk_size=32)
+    ser.write(b"\x40")
+    assert read_bytes(ser, 68, timeout=1) == list(range(68))
+    assert ser.read_calls == 3
+
+
+def test_read_bytes_deadline():
+    ser = LoopbackSerial(responder=lambda data: b"\x01\x02")
+    ser.write(b"\x40")
+    assert read_bytes(ser, 4, timeout=0) == [1, 2]
+
+
+def test_set_and_get_dac(driver):
+    driver.dac5(1.5)
+    driver.readback_every(1)
+    assert driver.dac5.get() == pytest.approx(1.5, abs=1e-5)
+
+
+def test_readback_shared_between_gets(driver):
+    ser = driver.ser
+    driver.snapshot(update=True)
+    reads = [m for m in ser.written if m == b"\x40"]
+    assert len(reads) == 1
+
+
+def test_set_dacs_fast_single_write(driver):
+    ser = driver.ser
+    channels = [2, 7, 12, 16]
+    mvoltages = np.array([-1.0, 0.25, 2.0, 3.5])
+    n_writes = ser.write_calls
+
+    reply = driver.set_dacs_fast(channels, mvoltages)
+
+    assert ser.write_calls == n_writes + 1
+    assert len(ser.written[-1]) == 4 * len(channels)
+    # dac 2 is fast and not acknowledged
+    assert len(reply) == 4 * 3
+    driver.readback_every(1)
+    for channel, mvoltage in zip(channels, mvoltages):
+        assert driver.parameters[f"dac{channel}"].get() == pytest.approx(
+            mvoltage, abs=1e-5)
+
+
+def test_do_set_dacs_fast_uses_first_four_message(driver):
+    driver.do_set_dacs_fast([0.1, 0.2, 0.3, 0.4])
+    message = driver.ser.written[-1]
+    assert len(message) == 13
+    assert message[0] == 0b10100000
+    assert driver.ser.rack.codes[:4] == [
+        driver._mvoltage_to_bytes(v) for v in (0.1, 0.2, 0.3, 0.4)]
+
+
+def test_set_dacs_fast_validates(driver):
+    ser = driver.ser
+    n_writes = ser.write_calls
+
+    with pytest.raises(ValueError):
+        driver.set_dacs_fast([1, 5], [0.0, driver.Halfrange + 2])
+
+    assert ser.write_calls == n_writes
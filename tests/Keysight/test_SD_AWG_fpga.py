@@ -0,0 +1,172 @@
+'''
+Test FPGA sandbox register access of SD_AWG with a fake keysightSD1 module:
+* register lookups are cached until an FPGA image is loaded
+* array transfers with np.int32 buffers
+* batched register writes
+'''
+import sys
+import types
+from enum import IntEnum
+
+import numpy as np
+import pytest
+
+
+class FakeRegister:
+
+    def __init__(self, name, address, length):
+        self.Name = name
+        self.Address = address
+        self.Length = length
+        self.memory = np.zeros(length, dtype=np.int32)
+        self.buffers_written = []
+
+    def writeRegisterInt32(self, value):
+        self.memory[0] = value
+        return 0
+
+    def readRegisterInt32(self):
+        return int(self.memory[0])
+
+    def writeRegisterBuffer(self, indexOffset, buffer, addressMode,
+                            accessMode):
+        self.buffers_written.append(buffer)
+        if addressMode == FakeSD1.SD_AddressingMode.FIXED:
+            self.memory[indexOffset] = buffer[-1]
+        else:
+            self.memory[indexOffset:indexOffset + len(buffer)] = buffer
+        return 0
+
+    def readRegisterBuffer(self, indexOffset, bufferSize, addressMode,
+                           accessMode):
+        if addressMode == FakeSD1.SD_AddressingMode.FIXED:
+            return [int(self.memory[indexOffset])] * bufferSize
+        return self.memory[indexOffset:indexOffset + bufferSize].tolist()
+
+
+class FakeAOU:
+
+    def __init__(self):
+        self.registers = {
+            'control': FakeRegister('control', 0x100, 1),
+            'gain': FakeRegister('gain', 0x104, 1),
+            'table': FakeRegister('table', 0x1000, 4096)}
+        self.register_lookups = 0
+
+    def getProductNameBySlot(self, chassis, slot):
+        return 'M3202A'
+
+    def openWithSlot(self, name, chassis, slot):
+        return 1
+
+    def close(self):
+        return 0
+
+    def FPGAload(self, filename):
+        return 0
+
+    def FPGAgetSandBoxRegister(self, name):
+        self.register_lookups += 1
+        # SD1 returns a negative error code for unknown registers
+        return self.registers.get(name, -8000)
+
+
+def _make_fake_sd1():
+    module = types.ModuleType('keysightSD1')
+    for name in ['SD_Wave', 'SD_Waveshapes', 'SD_TriggerExternalSources',
+                 'SD_FpgaTriggerDirection', 'SD_DigitalFilterModes',
+                 'SD_Module', 'SD_AIN', 'SD_SandBoxRegister']:
+        setattr(module, name, type(name, (), {}))
+    module.SD_TriggerPolarity = IntEnum('SD_TriggerPolarity',
+                                        'ACTIVE_LOW ACTIVE_HIGH', start=0)
+    module.SD_SyncModes = IntEnum('SD_SyncModes', 'SYNC_NONE SYNC_CLK10',
+                                  start=0)
+    module.SD_AddressingMode = IntEnum('SD_AddressingMode',
+                                       'AUTOINCREMENT FIXED', start=0)
+    module.SD_AccessMode = IntEnum('SD_AccessMode', 'NONDMA DMA', start=0)
+    module.SD_Error = types.SimpleNamespace(
+        getErrorMessage=lambda value: 'fake error')
+    module.SD_AOU = FakeAOU
+    return module
+
+
+FakeSD1 = _make_fake_sd1()
+
+
+@pytest.fixture
+def awg(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'keysightSD1', FakeSD1)
+    # import the drivers with the fake module and forget them afterwards
+    modules_before = set(sys.modules)
+    from qcodes_contrib_drivers.drivers.Keysight.SD_common.SD_AWG import SD_AWG
+    instrument = SD_AWG('fake_awg', chassis=1, slot=2, channels=4,
+                        triggers=8)
+    yield instrument
+    instrument.close()
+    for name in set(sys.modules) - modules_before:
+        del sys.modules[name]
+
+
+def test_register_lookups_are_cached(awg, tmp_path):
+    awg.write_fpga('control', 3)
+    for _ in range(99):
+        assert awg.read_fpga('control') == 3
+    awg.write_fpga_array('table', 0, [1, 2, 3])
+
+    assert awg.awg.register_lookups == 2
+
+    image = tmp_path / 'image.sbp'
+    image.write_bytes(b'')
+    awg.load_fpga_image(str(image))
+    awg.read_fpga('control')
+    assert awg.awg.register_lookups == 3
+
+
+def test_unknown_register(awg):
+    for _ in range(2):
+        with pytest.raises(Exception, match='fake error'):
+            awg.write_fpga('missing', 1)
+    # failed lookups are not cached
+    assert awg.awg.register_lookups == 2
+
+
+def test_write_fpga_registers(awg):
+    awg.write_fpga_registers({'control': 1, 'gain': -5})
+    awg.write_fpga_registers({'control': 2, 'gain': 7})
+
+    assert awg.read_fpga_registers(['control', 'gain']) == {'control': 2,
+                                                            'gain': 7}
+    assert awg.awg.register_lookups == 2
+
+
+def test_fpga_arrays(awg):
+    data = np.arange(-1000, 1000, dtype=np.int32)
+    awg.write_fpga_array('table', 16, data)
+
+    # an int32 array is passed to the driver without copy
+    assert awg.awg.registers['table'].buffers_written[-1] is data
+
+    out = np.empty(len(data), dtype=np.int32)
+    result = awg.read_fpga_array('table', 16, len(data), out=out)
+    assert result is out
+    np.testing.assert_array_equal(out, data)
+
+    result = awg.read_fpga_array('table', 16, 4, fixed_address=True)
+    assert result.dtype == np.int32
+    np.testing.assert_array_equal(result, [-1000] * 4)
+
+    with pytest.raises(ValueError):
+        awg.read_fpga_array('table', 0, 4, out=np.empty(4))
+
+    # lists are still accepted
+    awg.write_fpga_array('table', 0, [5, 6])
+    np.testing.assert_array_equal(awg.read_fpga_array('table', 0, 2), [5, 6])
+
+
+def test_fpga_array_unsigned_words(awg):
+    awg.write_fpga_array('table', 0, [0xFFFFFFFF, 2**31, 5])
+    np.testing.assert_array_equal(awg.read_fpga_array('table', 0, 3),
+                                  [-1, -2**31, 5])
+
+    awg.write_fpga_array('table', 0, np.array([0xFFFFFFFE], dtype=np.uint32))
+    assert awg.read_fpga_array('table', 0, 1)[0] == -2
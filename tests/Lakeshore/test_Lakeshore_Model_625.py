@@ -0,0 +1,112 @@
+import pytest
+
+from qcodes_contrib_drivers.drivers.Lakeshore.Model_625 import Lakeshore625
+
+
+class Model625Emulator:
+    """
+    Answers the commands of the driver. A field set with SETF is reached
+    by a linear ramp which advances only while the driver sleeps.
+    """
+
+    def __init__(self):
+        self.settings = {'LIMIT': '60.1, 5, 10', 'PSHS': '0, 0, 0',
+                         'QNCH': '1, 1', 'FLDS': '0, 0.1', 'RATE': '0.1',
+                         'RSEG': '0'}
+        self.field = 0.0
+        self.setpoint = 0.0
+        self.queries = []
+
+    @property
+    def ramping(self):
+        return self.field != self.setpoint
+
+    def field_rate(self):
+        unit, coil_constant = self.settings['FLDS'].split(',')
+        return float(self.settings['RATE']) * float(coil_constant)
+
+    def ask(self, cmd):
+        self.queries.append(cmd)
+        replies = []
+        for query in cmd.split(';'):
+            if query == 'RDGF?':
+                replies.append('{:+.4E}'.format(self.field))
+            elif query == 'OPST?':
+                # bit 1 is cleared while ramping
+                replies.append('4' if self.ramping else '6')
+            elif query == '*IDN?':
+                replies.append('LSCI,MODEL625,1234,1.0')
+            else:
+                replies.append(self.settings[query.rstrip('?')])
+        return ';'.join(replies)
+
+    def write(self, cmd):
+        header, value = cmd.split(' ', 1)
+        if header == 'SETF':
+            self.setpoint = float(value)
+        else:
+            self.settings[header] = value
+
+    def sleep(self, interval):
+        step = self.field_rate() * interval
+        if abs(self.setpoint - self.field) <= step:
+            self.field = self.setpoint
+        elif self.setpoint > self.field:
+            self.field += step
+        else:
+            self.field -= step
+
+
+@pytest.fixture
+def emulator(monkeypatch):
+    emulator = Model625Emulator()
+    monkeypatch.setattr(Lakeshore625, 'ask_raw',
+                        lambda self, cmd: emulator.ask(cmd))
+    monkeypatch.setattr(Lakeshore625, 'write_raw',
+                        lambda self, cmd: emulator.write(cmd))
+    monkeypatch.setattr(Lakeshore625, '_sleep',
+                        lambda self, interval: emulator.sleep(interval))
+    return emulator
+
+
+@pytest.fixture
+def magnet(emulator):
+    instrument = Lakeshore625('lakeshore625_sim', coil_constant=0.1,
+                              field_ramp_rate=0.6, address='GPIB::8::INSTR',
+                              visalib='@sim')
+    yield instrument
+
+    instrument.close()
+
+
+@pytest.mark.parametrize('register, state', [('4', 'ramping'),
+                                             ('6', 'not ramping'),
+                                             ('2', 'not ramping'),
+                                             ('0', 'not ramping')])
+def test_parse_ramping_state(register, state):
+    assert Lakeshore625._parse_ramping_state(register) == state
+
+
+def test_field_and_ramping_state(magnet, emulator):
+    emulator.field = 0.25
+    emulator.setpoint = 1.0
+    emulator.queries.clear()
+
+    assert magnet._get_field_and_ramping_state() == (0.25, True)
+    assert emulator.queries == ['RDGF?;OPST?']
+
+    emulator.setpoint = 0.25
+    assert magnet._get_field_and_ramping_state() == (0.25, False)
+
+
+def test_set_field_returns_when_ramp_stops(magnet, emulator):
+    assert magnet.field_ramp_rate() == pytest.approx(0.6)
+    emulator.queries.clear()
+
+    magnet.set_field(1.0)
+
+    assert emulator.field == 1.0
+    assert magnet.ramping_state.cache.get(get_if_invalid=False) == 'not ramping'
+    # a ramp of 100 s polled every 0.3 s would take about 330 queries
+    assert 1 < magnet.ramp_monitor.polls < 20
+    assert emulator.queries == ['RDGF?;OPST?'] * magnet.ramp_monitor.polls
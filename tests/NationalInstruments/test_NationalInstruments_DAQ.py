@@ -0,0 +1,275 @@
+'''
+Test the NI DAQ drivers with a fake nidaqmx module:
+* analog outputs keep one task per channel and skip unchanged writes
+* analog inputs read into a preallocated buffer
+* synchronized AO/AI sweeps are sample aligned
+'''
+import sys
+import types
+from enum import Enum
+
+import numpy as np
+import pytest
+
+
+class FakeDevice:
+    """
+    DAQ with the analog outputs wired to the analog inputs of the same
+    index. Inputs clocked by ao/SampleClock take one sample per AO update.
+    """
+
+    def __init__(self):
+        self.ao = {}
+        self.clocked_inputs = []
+        self.tasks_created = 0
+        self.ao_writes = 0
+        self.fail_next_read = False
+
+
+class FakeChannels:
+
+    def __init__(self, task):
+        self.task = task
+
+    def add_ai_voltage_chan(self, physical_channel, name_to_assign_to_channel,
+                            min_val=-5, max_val=5):
+        self.task.channels.append(int(physical_channel.split('/ai')[1]))
+
+    def add_ao_voltage_chan(self, physical_channel, name_to_assign_to_channel):
+        self.task.channels.append(int(physical_channel.split('/ao')[1]))
+
+
+class FakeTiming:
+
+    def __init__(self):
+        self.source = None
+        self.samps_per_chan = None
+        self.configurations = 0
+
+    def cfg_samp_clk_timing(self, rate, source=None, sample_mode=None,
+                            samps_per_chan=1000):
+        self.rate = rate
+        self.source = source
+        self.samps_per_chan = samps_per_chan
+        self.configurations += 1
+
+
+class FakeTask:
+
+    def __init__(self, new_task_name=''):
+        DEVICE.tasks_created += 1
+        self.channels = []
+        self.ai_channels = FakeChannels(self)
+        self.ao_channels = FakeChannels(self)
+        self.timing = FakeTiming()
+        self.in_stream = self.out_stream = self
+        self.running = False
+        self.buffer = None
+        self.samples = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.channels = None
+
+    def write(self, data, auto_start=False):
+        assert self.timing.samps_per_chan is None and auto_start
+        DEVICE.ao_writes += 1
+        DEVICE.ao[self.channels[0]] = data
+
+    def start(self):
+        assert not self.running
+        self.running = True
+        if self.timing.source is not None:
+            self.samples = []
+            DEVICE.clocked_inputs.append(self)
+        elif self.buffer is not None:
+            # AO sample clock edges
+            for sample in self.buffer.T:
+                DEVICE.ao.update(zip(self.channels, sample))
+                for task in DEVICE.clocked_inputs:
+                    task.samples.append([DEVICE.ao.get(idx, 0.0)
+                                         for idx in task.channels])
+
+    def stop(self):
+        self.running = False
+        if self in DEVICE.clocked_inputs:
+            DEVICE.clocked_inputs.remove(self)
+
+    def wait_until_done(self, timeout):
+        pass
+
+
+class FakeReader:
+
+    def __init__(self, task_in_stream):
+        self.task = task_in_stream
+
+    def read_many_sample(self, data, number_of_samples_per_channel,
+                         timeout):
+        task = self.task
+        if DEVICE.fail_next_read:
+            DEVICE.fail_next_read = False
+            raise TimeoutError('fake timeout')
+        if task.timing.source is None:
+            # sampled on the internal clock, while the outputs are static
+            task.samples = [[DEVICE.ao.get(idx, 0.0) for idx in task.channels]
+                            ] * number_of_samples_per_channel
+        elif len(task.samples) < number_of_samples_per_channel:
+            raise TimeoutError('missed AO sample clock edges')
+        data[...] = np.array(task.samples).T
+        return number_of_samples_per_channel
+
+
+class FakeWriter:
+
+    def __init__(self, task_out_stream, auto_start=None):
+        self.task = task_out_stream
+
+    def write_many_sample(self, data, timeout):
+        assert data.flags['C_CONTIGUOUS'] and data.dtype == np.float64
+        assert data.shape == (len(self.task.channels),
+                              self.task.timing.samps_per_chan)
+        self.task.buffer = data.copy()
+        return data.shape[1]
+
+
+def fake_nidaqmx():
+    nidaqmx = types.ModuleType('nidaqmx')
+    nidaqmx.Task = FakeTask
+    constants = types.ModuleType('nidaqmx.constants')
+    constants.AcquisitionType = Enum('AcquisitionType', 'FINITE CONTINUOUS')
+    constants.TaskMode = Enum('TaskMode', 'TASK_COMMIT TASK_UNRESERVE')
+    constants.LineGrouping = Enum('LineGrouping', 'CHAN_PER_LINE')
+    stream_readers = types.ModuleType('nidaqmx.stream_readers')
+    stream_readers.AnalogMultiChannelReader = FakeReader
+    stream_writers = types.ModuleType('nidaqmx.stream_writers')
+    stream_writers.AnalogMultiChannelWriter = FakeWriter
+    nidaqmx.constants = constants
+    nidaqmx.stream_readers = stream_readers
+    nidaqmx.stream_writers = stream_writers
+    return {'nidaqmx': nidaqmx, 'nidaqmx.constants': constants,
+            'nidaqmx.stream_readers': stream_readers,
+            'nidaqmx.stream_writers': stream_writers}
+
+
+DEVICE = FakeDevice()
+
+
+@pytest.fixture
+def daq(monkeypatch):
+    global DEVICE
+    DEVICE = FakeDevice()
+    for name, module in fake_nidaqmx().items():
+        monkeypatch.setitem(sys.modules, name, module)
+    # import the driver with the fake module and forget it afterwards
+    modules_before = set(sys.modules)
+    from qcodes_contrib_drivers.drivers.NationalInstruments import DAQ
+    instruments = []
+    yield DAQ, instruments
+    for instrument in instruments:
+        instrument.close()
+    for name in set(sys.modules) - modules_before:
+        del sys.modules[name]
+
+
+def test_outputs_keep_task_and_skip_unchanged_writes(daq):
+    DAQ, instruments = daq
+    daq_ao = DAQ.DAQAnalogOutputs('daq_ao', 'Dev1', {'gate': 0, 'bias': 1})
+    instruments.append(daq_ao)
+
+    for voltage in [0.1, 0.1, 0.2, 0.2, 0.2, 0.1]:
+        daq_ao.voltage_gate(voltage)
+        daq_ao.voltage_bias(0.5)
+
+    assert DEVICE.tasks_created == 2
+    assert DEVICE.ao_writes == 4
+    assert DEVICE.ao == {0: 0.1, 1: 0.5}
+
+
+def test_inputs_reuse_task_and_buffer(daq):
+    DAQ, instruments = daq
+    DEVICE.ao.update({0: 0.25, 3: -1.0})
+    daq_ai = DAQ.DAQAnalogInputs('daq_ai', 'Dev1', 1000, {'a': 0, 'b': 3},
+                                 DAQ.nidaqmx.Task(), samples_to_read=100,
+                                 target_points=10)
+    instruments.append(daq_ai)
+
+    for _ in range(10):
+        data = daq_ai.voltage()
+
+    assert DEVICE.tasks_created == 1
+    assert data.shape == (2, 10)
+    np.testing.assert_allclose(data, [[0.25] * 10, [-1.0] * 10])
+
+
+def test_synchronized_sweep(daq):
+    DAQ, instruments = daq
+    daq_ao = DAQ.DAQAnalogOutputs('daq_ao', 'Dev1', {'gate': 0, 'bias': 1})
+    daq_ao.voltage_gate(1.0)
+    daq_sweep = DAQ.DAQSynchronizedSweep(
+        'daq_sweep', 'Dev1', 1e4, ao_channels={'gate': 0, 'bias': 1},
+        ai_channels={'bias_readback': 1, 'gate_readback': 0}, outputs=daq_ao)
+    instruments.extend([daq_sweep, daq_ao])
+    tasks_before = DEVICE.tasks_created
+
+    setpoints = np.array([np.linspace(-1, 1, 1001), np.linspace(0, 0.5, 1001)])
+    for _ in range(3):
+        data = daq_sweep.sweep(setpoints)
+
+    # AI sample k is taken at the update of AO setpoint k
+    np.testing.assert_array_equal(data, setpoints[::-1])
+    assert DEVICE.tasks_created == tasks_before
+    assert daq_sweep._ao_task.timing.configurations == 1
+
+    # the static outputs know the voltages left by the sweep
+    assert daq_ao.voltage_gate.cache() == 1.0
+    writes = DEVICE.ao_writes
+    daq_ao.voltage_gate(1.0)
+    assert DEVICE.ao_writes == writes
+    daq_ao.voltage_bias(0.0)
+    assert DEVICE.ao == {0: 1.0, 1: 0.0}
+
+    data = daq_sweep.sweep(setpoints[:, :11])
+    assert data.shape == (2, 11)
+    assert daq_sweep._ao_task.timing.configurations == 2
+
+
+def test_sweep_reconfigures_on_rate_change(daq):
+    DAQ, instruments = daq
+    daq_sweep = DAQ.DAQSynchronizedSweep(
+        'daq_sweep', 'Dev1', 1e4, ao_channels={'gate': 0},
+        ai_channels={'gate_readback': 0})
+    instruments.append(daq_sweep)
+    setpoints = np.linspace(0, 1, 11)
+
+    daq_sweep.sweep(setpoints)
+    daq_sweep.rate = 2e4
+    daq_sweep.sweep(setpoints)
+
+    assert daq_sweep._ao_task.timing.configurations == 2
+    assert daq_sweep._ao_task.timing.rate == 2e4
+    assert daq_sweep._ai_task.timing.rate == 2e4
+
+
+def test_failed_sweep_does_not_skip_next_write(daq):
+    DAQ, instruments = daq
+    daq_ao = DAQ.DAQAnalogOutputs('daq_ao', 'Dev1', {'gate': 0})
+    daq_sweep = DAQ.DAQSynchronizedSweep(
+        'daq_sweep', 'Dev1', 1e4, ao_channels={'gate': 0},
+        ai_channels={'gate_readback': 0}, outputs=daq_ao)
+    instruments.extend([daq_sweep, daq_ao])
+    daq_ao.voltage_gate(0.5)
+
+    DEVICE.fail_next_read = True
+    with pytest.raises(TimeoutError):
+        daq_sweep.sweep(np.linspace(-1, 1, 11))
+
+    # the output was left somewhere in the sweep
+    assert DEVICE.ao[0] == 1.0
+    daq_ao.voltage_gate(0.5)
+    assert DEVICE.ao[0] == 0.5
@@ -0,0 +1,181 @@
+'''
+Test the NIDLLWrapper core with the NI-RFSG driver and a fake DLL:
+* immutable attributes are read once per session
+* batched attribute reads reuse the buffers of the session
+* DLL calls on a session are serialized
+'''
+import threading
+import time
+
+import pytest
+
+from qcodes_contrib_drivers.drivers.NationalInstruments import dll_wrapper
+from qcodes_contrib_drivers.drivers.NationalInstruments.RFSG import (
+    NIRFSG_ATTR_FREQUENCY, NIRFSG_ATTR_POWER_LEVEL, NI_RFSG)
+
+
+class FakeFunction:
+
+    def __init__(self, dll, name):
+        self.dll = dll
+        self.name = name
+        self.restype = None
+        self.argtypes = None
+
+    def __call__(self, *args):
+        dll = self.dll
+        with dll.lock:
+            dll.calls.append((self.name, args))
+            dll.active += 1
+            if dll.active > 1:
+                dll.concurrent_entries += 1
+        try:
+            # give other threads a chance to enter
+            time.sleep(1e-4)
+            status = getattr(dll, self.name.split('_', 1)[1])(*args)
+        finally:
+            with dll.lock:
+                dll.active -= 1
+        return self.restype(status or 0)
+
+
+class FakeRFSGDLL:
+    """
+    Counts the calls of the niRFSG functions, and how often a function was
+    entered while another one was still running.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = []
+        self.active = 0
+        self.concurrent_entries = 0
+        self.buffers = set()
+        self.attributes = {1050510: b'19.0', 1050512: b'NI PXIe-5654',
+                           1050513: b'National Instruments',
+                           1150026: b'01234567', 1250001: 1e9,
+                           1250002: -10.0}
+
+    def __getattr__(self, name):
+        if not name.startswith('niRFSG_'):
+            raise AttributeError(name)
+        return FakeFunction(self, name)
+
+    def count(self, function):
+        return sum(name == f'niRFSG_{function}' for name, _ in self.calls)
+
+    def init(self, resource, id_query, reset, session_ref):
+        session_ref._obj.value = 42
+
+    def error_message(self, session, error_code, buf):
+        buf.value = b'fake error'
+
+    def _get(self, session, channel, attr, value_ref):
+        self.buffers.add(id(value_ref._obj))
+        value_ref._obj.value = self.attributes[attr.value]
+
+    GetAttributeViBoolean = GetAttributeViInt32 = GetAttributeViReal64 = _get
+
+    def GetAttributeViString(self, session, channel, attr, size, buf):
+        self.buffers.add(id(buf))
+        buf.value = self.attributes[attr.value]
+
+    def _set(self, session, channel, attr, value):
+        self.attributes[attr.value] = value
+
+    SetAttributeViBoolean = SetAttributeViInt32 = SetAttributeViReal64 = _set
+
+    def ConfigureRF(self, session, frequency, power_level):
+        self.attributes[1250001] = frequency.value
+        self.attributes[1250002] = power_level.value
+
+    def Initiate(self, session):
+        pass
+
+    def close(self, session):
+        pass
+
+
+@pytest.fixture
+def rfsg(monkeypatch):
+    dll = FakeRFSGDLL()
+    monkeypatch.setattr(dll_wrapper.ctypes.cdll, 'LoadLibrary',
+                        lambda path: dll)
+    instrument = NI_RFSG('fake_rfsg', resource='PXI1Slot2')
+    yield instrument, dll
+    instrument.close()
+
+
+def test_immutable_attributes_are_cached(rfsg):
+    rfsg, dll = rfsg
+    reads = dll.count('GetAttributeViString')
+
+    for _ in range(10):
+        assert rfsg.IDN() == {'vendor': 'National Instruments',
+                              'model': 'NI PXIe-5654',
+                              'serial': '01234567', 'firmware': '19.0'}
+        rfsg.frequency()
+
+    assert dll.count('GetAttributeViString') == reads == 4
+    # the frequency may change, it is read every time
+    assert dll.count('GetAttributeViReal64') == 10
+
+
+def test_get_attributes_reuses_buffers(rfsg):
+    rfsg, dll = rfsg
+    dll.buffers.clear()
+
+    for _ in range(10):
+        assert rfsg.wrapper.get_attributes(
+            rfsg._handle, [NIRFSG_ATTR_FREQUENCY, NIRFSG_ATTR_POWER_LEVEL]
+        ) == [1e9, -10.0]
+
+    # one ViReal64 buffer of the session
+    assert len(dll.buffers) == 1
+
+    with pytest.raises(ValueError):
+        rfsg.wrapper.get_attributes(
+            rfsg._handle, [dll_wrapper.AttributeWrapper(
+                dll_wrapper.ViAttr(1), dll_wrapper.ViChar)])
+
+
+def test_fake_dll_detects_concurrent_entry(rfsg):
+    rfsg, dll = rfsg
+    unlocked = rfsg.wrapper.Initiate.dll_function
+
+    threads = [threading.Thread(target=lambda: [unlocked(rfsg._handle)
+                                                for _ in range(20)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert dll.concurrent_entries > 0
+
+
+def test_session_calls_are_serialized(rfsg):
+    rfsg, dll = rfsg
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(20):
+                rfsg.frequency(1e9 + n * 1e6 + i)
+                rfsg.power_level(-10.0 - n)
+                rfsg.IDN()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert dll.concurrent_entries == 0
+    # each ConfigureRF follows the read of the value it keeps
+    for n, (name, _) in enumerate(dll.calls):
+        if name == 'niRFSG_ConfigureRF':
+            assert dll.calls[n - 1][0] == 'niRFSG_GetAttributeViReal64'
@@ -0,0 +1,103 @@
+import pytest
+
+from qcodes_contrib_drivers.drivers.OxfordInstruments.IPS120 import \
+    OxfordInstruments_IPS120
+
+
+class IPS120Emulator:
+    """
+    Answers the ISOBUS commands of the driver over GPIB. In the activity
+    "To set point" the field sweeps linearly to the set point, advancing
+    only while the ramp monitor sleeps.
+    """
+
+    def __init__(self):
+        self.field = 0.0
+        self.setpoint = 0.0
+        self.sweeprate = 0.6
+        self.activity = 0
+        self.remote = 2
+        self.queries = []
+
+    @property
+    def sweeping(self):
+        return self.activity == 1 and self.field != self.setpoint
+
+    def status(self):
+        return 'X00A{}C{}H1M0{}P02'.format(self.activity, self.remote,
+                                           int(self.sweeping))
+
+    def ask(self, cmd):
+        self.queries.append(cmd)
+        if cmd == 'X':
+            return self.status()
+        if cmd == 'R7':
+            return 'R{:+.4f}'.format(self.field)
+        if cmd == 'R8':
+            return 'R{:+.4f}'.format(self.setpoint)
+        if cmd == 'R9':
+            return 'R{:+.4f}'.format(self.sweeprate)
+        if cmd.startswith('R'):
+            return 'R+0.0000'
+        if cmd.startswith('A'):
+            self.activity = int(cmd[1:])
+        elif cmd.startswith('C'):
+            self.remote = int(cmd[1:])
+        elif cmd.startswith('J'):
+            self.setpoint = float(cmd[1:])
+        return cmd[0]
+
+    def sleep(self, interval):
+        if self.activity != 1:
+            return
+        step = self.sweeprate / 60 * interval
+        if abs(self.setpoint - self.field) <= step:
+            self.field = self.setpoint
+        elif self.setpoint > self.field:
+            self.field += step
+        else:
+            self.field -= step
+
+
+@pytest.fixture
+def emulator():
+    return IPS120Emulator()
+
+
+@pytest.fixture
+def ips(emulator, monkeypatch):
+    instrument = OxfordInstruments_IPS120('ips120_sim', 'GPIB::9::INSTR',
+                                          use_gpib=True, visalib='@sim')
+    monkeypatch.setattr(instrument, 'ask_raw', emulator.ask)
+    instrument.ramp_monitor.sleep = emulator.sleep
+    yield instrument
+
+    instrument.close()
+
+
+def test_field_and_sweeping(ips, emulator):
+    emulator.field = -1.25
+    emulator.setpoint = 1.0
+    emulator.activity = 1
+
+    assert ips._get_field_and_sweeping() == (-1.25, True)
+    assert ips.mode2() == 'Sweeping'
+
+    emulator.activity = 0
+    assert ips._get_field_and_sweeping() == (-1.25, False)
+    assert ips.mode2() == 'At rest'
+    assert ips.switch_heater() == 'On (switch open)'
+
+
+def test_run_to_field_wait_returns_when_sweep_stops(ips, emulator):
+    ips.sweeprate_field()
+    emulator.queries.clear()
+
+    ips.run_to_field_wait(1.0)
+
+    assert emulator.field == 1.0
+    assert emulator.activity == 1
+    assert ips.field() == 1.0
+    # a sweep of 100 s polled every 0.5 s would take about 200 polls
+    assert 1 < ips.ramp_monitor.polls < 20
+    assert emulator.queries.count('R7') < 25
@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+
+import numpy as np
+import pytest
+
+# needs the oi.DECS<->VISA bridge and its configuration
+Proteox = pytest.importorskip(
+    "qcodes_contrib_drivers.drivers.OxfordInstruments.Proteox")
+
+
+class FakeDECS:
+    """
+    Stand-in for oiDECS with a fake socket. Every command is answered with
+    the number of queries of that command so far, unless ``replies`` holds
+    a fixed answer.
+    """
+    start_telemetry = Proteox.oiDECS.start_telemetry
+    stop_telemetry = Proteox.oiDECS.stop_telemetry
+    ask = Proteox.oiDECS.ask
+
+    def __init__(self):
+        self.name = "decs_sim"
+        self.log = logging.getLogger(__name__)
+        self.telemetry = None
+        self.queries = []
+        self.replies = {}
+        self.queried = threading.Event()
+
+    def _query(self, cmd):
+        self.queries.append(cmd)
+        self.queried.set()
+        return self.replies.get(cmd, str(self.queries.count(cmd)))
+
+
+class FakeClock:
+    """
+    Replaces the time module of the driver.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def decs():
+    instrument = FakeDECS()
+    yield instrument
+
+    instrument.stop_telemetry()
+
+
+def test_ring_buffer_wraparound(decs):
+    telemetry = Proteox.DECSTelemetry(decs, ("get_MC_T", "get_P1_P"),
+                                      buffer_size=4)
+
+    for _ in range(6):
+        telemetry.sample()
+
+    assert telemetry.samples == 6
+    np.testing.assert_array_equal(telemetry.window("get_MC_T", 4),
+                                  [3, 4, 5, 6])
+    np.testing.assert_array_equal(telemetry.window("get_P1_P", 10),
+                                  [3, 4, 5, 6])
+    np.testing.assert_array_equal(telemetry.window("get_MC_T", 2), [5, 6])
+
+
+def test_sample_of_vectors(decs):
+    decs.replies["get_P1_P"] = "[1, 2]"
+    telemetry = Proteox.DECSTelemetry(decs, ("get_MC_T", "get_P1_P"))
+
+    telemetry.sample()
+
+    assert np.isnan(telemetry.window("get_P1_P", 1)).all()
+    assert telemetry.latest("get_P1_P") == "[1, 2]"
+
+
+def test_latest_expires(decs, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(Proteox, "time", clock)
+    telemetry = Proteox.DECSTelemetry(decs, ("get_MC_T",), interval=1.0)
+    assert telemetry.latest("get_MC_T") is None
+
+    telemetry.sample()
+    clock.now += 1.5
+    assert telemetry.latest("get_MC_T") == "1"
+    assert telemetry.latest("get_MC_T", max_age=1) is None
+    clock.now += 1
+    # max_age defaults to twice the interval
+    assert telemetry.latest("get_MC_T") is None
+    assert telemetry.latest("get_OVC_P") is None
+
+
+def test_is_stable(decs):
+    decs.replies["get_MC_T"] = "0.1"
+    telemetry = Proteox.DECSTelemetry(decs, ("get_MC_T",), buffer_size=5)
+
+    for _ in range(4):
+        telemetry.sample()
+    # fewer samples than the window
+    assert not telemetry.is_stable("get_MC_T", 0.1, 1e-3, 1e-3, 5)
+    assert telemetry.is_stable("get_MC_T", 0.1, 1e-3, 1e-3, 4)
+
+    telemetry.sample()
+    assert telemetry.is_stable("get_MC_T", 0.1, 1e-3, 1e-3, 5)
+    assert not telemetry.is_stable("get_MC_T", 0.2, 1e-3, 1e-3, 5)
+
+    # one outlier in the window, until it is overwritten
+    decs.replies["get_MC_T"] = "0.2"
+    telemetry.sample()
+    decs.replies["get_MC_T"] = "0.1"
+    for _ in range(4):
+        telemetry.sample()
+        assert not telemetry.is_stable("get_MC_T", 0.1, 1e-2, 1e-2, 5)
+    telemetry.sample()
+    assert telemetry.is_stable("get_MC_T", 0.1, 1e-2, 1e-2, 5)
+
+
+def test_start_and_stop_telemetry(decs):
+    telemetry = decs.start_telemetry(("get_MC_T",), interval=0.01)
+    assert decs.telemetry is telemetry
+    assert decs.queried.wait(5)
+    assert telemetry.running
+
+    # answered from the telemetry without a query of its own
+    deadline = time.monotonic() + 5
+    while telemetry.samples == 0 and time.monotonic() < deadline:
+        time.sleep(1e-3)
+    queries = len(decs.queries)
+    assert float(decs.ask("get_MC_T")) >= 1
+    assert decs.ask("get_P1_P") == "1"
+    assert decs.queries[queries:].count("get_P1_P") == 1
+
+    # a new telemetry replaces the running one
+    second = decs.start_telemetry(("get_MC_T",), interval=0.01)
+    assert not telemetry.running
+    assert second.running
+
+    decs.stop_telemetry()
+    assert not second.running
+    assert not any(thread.name == "decs_sim_telemetry"
+                   for thread in threading.enumerate())
+    samples = second.samples
+    decs.queried.clear()
+    assert not decs.queried.wait(0.05)
+    assert second.samples == samples
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from qcodes_contrib_drivers.drivers.QDevil.QDAC1 import (
+    parse_status,
+    ramp_2d_plan)
+
+# Channel lines of a `status` response of one board, as read from the
+# instrument (after the version line and the header line)
+RECORDED_STATUS = (
+    '\n'
+    '8\t  0.000000\t\tX 1\t\thi cur\n'
+    '7\t -1.250000\t\tX 1\t\tlo cur\n'
+    '6\t  0.099998\t\tX 0.1\t\tlo cur\n'
+    '5\t  9.990000\t\tX 1\t\thi cur\n'
+    '4\t -0.000003\t\tX 0.1\t\tlo cur\n'
+    '3\t  2.500000\t\tX 1\t\thi cur\n'
+    '2\t-10.000000\t\tX 1\t\thi cur\n'
+    '1\t  0.000001\t\tX 1\t\thi cur\r\n')
+
+
+def status_48_channels():
+    rng = np.random.default_rng(0)
+    voltages = rng.uniform(-10, 10, 48)
+    return voltages, '\n'.join(
+        '{}\t{:10.6f}\t\t{}\t\t{}'.format(
+            chan, voltages[chan - 1], 'X 1' if chan % 3 else 'X 0.1',
+            'hi cur' if chan % 2 else 'lo cur')
+        for chan in range(48, 0, -1))
+
+
+def parse_status_per_line(status):
+    # The per line parsing replaced by parse_status
+    irange_trans = {'hi cur': 1, 'lo cur': 0}
+    vrange_trans = {'X 1': 0, 'X 0.1': 1}
+    result = {}
+    for line in status.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        chanstr, v, _, vrange, _, irange = line.split('\t')
+        result[int(chanstr)] = (float(v), vrange_trans[vrange.strip()],
+                                irange_trans[irange.strip()])
+    return result
+
+
+def test_parse_recorded_status():  # noqa
+    # -----------------------------------------------------------------------
+    chans, voltages, vranges, iranges = parse_status(RECORDED_STATUS)
+    # -----------------------------------------------------------------------
+    assert chans.tolist() == [8, 7, 6, 5, 4, 3, 2, 1]
+    assert voltages.tolist() == [0.0, -1.25, 0.099998, 9.99, -0.000003, 2.5,
+                                 -10.0, 0.000001]
+    assert vranges.tolist() == [0, 0, 1, 0, 1, 0, 0, 0]
+    assert iranges.tolist() == [1, 0, 0, 1, 0, 1, 1, 1]
+
+
+def test_parse_status_matches_per_line_parsing():  # noqa
+    _, status = status_48_channels()
+    expected = parse_status_per_line(status)
+    # -----------------------------------------------------------------------
+    parsed = parse_status(status)
+    # -----------------------------------------------------------------------
+    assert {chan: (v, vrange, irange)
+            for chan, v, vrange, irange in zip(*map(np.ndarray.tolist, parsed))
+            } == expected
+
+
+@pytest.mark.parametrize('status', [
+    '8\t  0.000000\t\tX 10\t\thi cur',
+    '8\t  0.000000\t\tX 1\t\tpA',
+    'Error: unrecognized command',
+])
+def test_parse_status_rejects_unknown_lines(status):  # noqa
+    with pytest.raises(ValueError, match='unrecognized status lines'):
+        parse_status(RECORDED_STATUS + status)
+
+
+def test_parse_status_48_channels():  # noqa
+    voltages, status = status_48_channels()
+    # -----------------------------------------------------------------------
+    chans, parsed_voltages, _, _ = parse_status(status)
+    # -----------------------------------------------------------------------
+    assert sorted(chans.tolist()) == list(range(1, 49))
+    np.testing.assert_allclose(parsed_voltages, voltages[chans - 1],
+                               atol=1e-6)
+
+
+def test_ramp_2d_plan():  # noqa
+    # -----------------------------------------------------------------------
+    plan = ramp_2d_plan(slow_vstart=[0.0], slow_vend=[1.0],
+                        fast_vstart=[-1.0, 0.5], fast_vend=[1.0, 0.0],
+                        step_length_ms=2, slow_steps=10, fast_steps=100)
+    # -----------------------------------------------------------------------
+    assert plan['amplitude'].tolist() == [1.0, 2.0, -0.5]
+    assert plan['offset'].tolist() == [0.0, -1.0, 0.5]
+    assert plan['steps'].tolist() == [10, 100, 100]
+    assert plan['repetitions'].tolist() == [1, 10, 10]
+    assert plan['delay'].tolist() == [200, 2, 2]
+    # All generators finish together
+    assert len(set((plan['steps'] * plan['repetitions']
+                    * plan['delay']).tolist())) == 1
+
+
+def test_ramp_2d_plan_rejects_inconsistent_lists():  # noqa
+    with pytest.raises(ValueError):
+        ramp_2d_plan([0.0], [], [0.0], [1.0], 1, 10, 10)
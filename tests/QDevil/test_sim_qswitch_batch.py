@@ -0,0 +1,58 @@
+import pytest
+from .sim_qswitch_fixtures import qswitch  # noqa
+
+
+def test_batch_merges_into_one_transaction(qswitch):  # noqa
+    qswitch.connect(['14', '15'])
+    qswitch.start_recording_scpi()
+    # -----------------------------------------------------------------------
+    with qswitch.batch():
+        qswitch.ground(['15', '14'])
+        qswitch.breakout('22', '7')
+    # -----------------------------------------------------------------------
+    commands = qswitch.get_recorded_scpi_commands()
+    assert commands == [
+        'clos (@14!0:15!0,22!7)', '*opc?',
+        'open (@22!0,14!9:15!9)', '*opc?']
+
+
+def test_batch_sees_pending_changes(qswitch):  # noqa
+    # -----------------------------------------------------------------------
+    with qswitch.batch():
+        qswitch.connect('15')
+        qswitch.ground('15')
+        with qswitch.batch():
+            qswitch.close_relay(22, 7)
+            qswitch.open_relay(22, 7)
+        commands = qswitch.get_recorded_scpi_commands()
+    # -----------------------------------------------------------------------
+    assert commands == []
+    assert qswitch.get_recorded_scpi_commands() == []
+    assert qswitch.relay_operations.sum() == 0
+
+
+def test_batch_is_discarded_on_error(qswitch):  # noqa
+    # -----------------------------------------------------------------------
+    with pytest.raises(ValueError):
+        with qswitch.batch():
+            qswitch.connect('15')
+            qswitch.breakout('15', 'VNA')
+    # -----------------------------------------------------------------------
+    assert qswitch.get_recorded_scpi_commands() == []
+    qswitch.connect('15')
+    commands = qswitch.get_recorded_scpi_commands()
+    assert commands == ['clos (@15!9)', '*opc?', 'open (@15!0)', '*opc?']
+
+
+def test_relay_operations_are_counted(qswitch):  # noqa
+    # -----------------------------------------------------------------------
+    qswitch.connect(['14', '15'])
+    qswitch.ground(['15', '14'])
+    qswitch.connect('15')
+    # -----------------------------------------------------------------------
+    assert qswitch.relay_statistics() == {
+        'clos_transactions': 3, 'open_transactions': 3,
+        'relays_closed': 5, 'relays_opened': 5}
+    assert qswitch.relay_operations[15 - 1, 9] == 3
+    assert qswitch.relay_operations[14 - 1, 0] == 2
+    assert qswitch.relay_operations.sum() == 10
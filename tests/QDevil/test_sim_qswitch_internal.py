@@ -1,9 +1,10 @@
 import pytest
 from qcodes_contrib_drivers.drivers.QDevil.QSwitch import (
-    _state_diff,
     channel_list_to_state,
     compress_channel_list,
-    expand_channel_list)
+    expand_channel_list,
+    mask_to_state,
+    state_to_mask)
 
 
 @pytest.mark.parametrize(('input', 'output'), [
@@ -46,9 +47,12 @@ def test_channel_list_can_be_packed(input, output):  # noqa
     ([(7,5)], [(1,2)], [(1,2)], [(7,5)]),
     ([(7,5), (3,4)], [(1,2), (3,4)], [(1,2)], [(7,5)]),
 ])
-def test_state_diff(before, after, positive, negative):  # noqa
+def test_mask_diff(before, after, positive, negative):  # noqa
+    initial = state_to_mask(before)
+    target = state_to_mask(after)
     # -----------------------------------------------------------------------
-    pos, neg, _ = _state_diff(before, after)
+    pos = mask_to_state(target & ~initial)
+    neg = mask_to_state(initial & ~target)
     # -----------------------------------------------------------------------
     assert pos == positive
     assert neg == negative
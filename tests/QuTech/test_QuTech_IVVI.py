@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+from pyvisa.resources import SerialInstrument
+
+from qcodes_contrib_drivers.drivers.QuTech.IVVI import IVVI
+
+
+class FakeIVVISerial:
+    """
+    Emulates the D5 module behind the serial port. Every descriptor written
+    is executed and its reply appended to the read buffer, the reads are
+    recorded with the number of bytes the driver waits for.
+    """
+
+    def __init__(self, numdacs=16):
+        # raw 16 bit values, 0x8000 is 0 V for a bipolar dac
+        self.dacs = [0x8000] * numdacs
+        self.writes = []
+        self.reads = []
+        self._buffer = b''
+
+    def attach(self, monkeypatch):
+        monkeypatch.setattr(SerialInstrument, "write_raw",
+                            lambda handle, message: self.write_raw(message))
+        monkeypatch.setattr(IVVI, "read",
+                            lambda ivvi, message_len=None:
+                            self.read(message_len))
+
+    def write_raw(self, message):
+        self.writes.append(message)
+        while message:
+            size = message[0]
+            descriptor, message = message[:size], message[size:]
+            data_out, action = descriptor[2], descriptor[3]
+            if action == 1:
+                self.dacs[descriptor[4] - 1] = int.from_bytes(
+                    descriptor[5:7], 'big')
+                self._buffer += bytes([data_out, 0])
+            elif action == 2:
+                self._buffer += bytes([data_out, 0]) + b''.join(
+                    value.to_bytes(2, 'big') for value in self.dacs)
+            else:
+                self._buffer += bytes([data_out, 0]) + bytes(data_out - 2)
+        return len(message), 0
+
+    def read(self, message_len):
+        self.reads.append(message_len)
+        reply, self._buffer = self._buffer, b''
+        return reply
+
+
+@pytest.fixture(scope="function")
+def ivvi(monkeypatch):
+    serial = FakeIVVISerial()
+    serial.attach(monkeypatch)
+    instrument = IVVI(
+        "ivvi_sim", "ASRL1::INSTR", dac_delay=0,
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:QuTech_IVVI.yaml")
+    instrument.dac_set_sleep(0)
+    serial.writes.clear()
+    serial.reads.clear()
+    yield instrument, serial
+
+    instrument.close()
+
+
+def test_set_dacs_single_transaction(ivvi):
+    ivvi, serial = ivvi
+
+    reply = ivvi.set_dacs({1: 1.0, 3: -0.5})
+
+    assert serial.writes == [
+        bytes([7, 0, 2, 1, 1]) + ivvi._mvoltage_to_bytes(3.0)
+        + bytes([7, 0, 2, 1, 3]) + ivvi._mvoltage_to_bytes(1.5)]
+    assert serial.reads == [4]
+    assert reply == bytes([2, 0, 2, 0])
+    assert serial.dacs[0] == 0xBFFF
+    assert ivvi.dac3.cache.get(get_if_invalid=False) == -0.5
+    assert ivvi._mvoltages[2] == pytest.approx(-0.5, abs=ivvi.dac_quata)
+
+
+def test_set_dacs_skips_setpoints_like_set_dac(ivvi):
+    ivvi, serial = ivvi
+    ivvi.check_setpoints(True)
+    # no dac values known yet
+    ivvi._mvoltages = None
+    ivvi._time_last_update = 0
+    serial.dacs[1] = 0xBFFF
+
+    ivvi.set_dacs({1: 0.5, 2: 1.0})
+
+    # the dac values are read once, dac 2 is already at the setpoint
+    assert [message[3] for message in serial.writes] == [2, 1]
+    assert serial.writes[1] == \
+        bytes([7, 0, 2, 1, 1]) + ivvi._mvoltage_to_bytes(2.5)
+    serial.writes.clear()
+
+    ivvi.set_dacs({1: 0.5, 2: 1.0})
+    ivvi.dac1(0.5)
+    assert serial.writes == []
+
+
+def test_linspace_2d(ivvi):
+    ivvi, serial = ivvi
+    ivvi.set_pol_dacrack('POS', [5, 6, 7, 8], get_all=False)
+
+    x, y = ivvi.linspace_2d('dac1', -100, 100, 8, 5, 500, 502, 16)
+
+    assert x.shape == y.shape == (16, 8)
+    np.testing.assert_array_equal(x[0], ivvi.linspace(-100, 100, 8))
+    np.testing.assert_array_equal(
+        y[:, 0], ivvi.linspace(500, 502, 16, bip=False))
+    assert (x == x[0]).all() and (y.T == y[:, 0]).all()
+    # bipolar dacs are aligned half a step off the unipolar ones
+    assert x[0, 0] / ivvi.dac_quata % 1 == pytest.approx(0.5)
+    assert y[0, 0] / ivvi.dac_quata % 1 == pytest.approx(0, abs=1e-6)
@@ -0,0 +1,156 @@
+import re
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.RohdeSchwarz.ZVL13 import ZVL13
+
+
+class ZVLEmulator:
+    """
+    Replies to the trace queries of the ZVL13 driver in the transfer format
+    set with FORM, and counts the bytes read by the driver. The encoded
+    replies are cached, so that timing the driver measures the decoding.
+    """
+
+    def __init__(self, npts, trace_names=('Trc1', 'Trc2')):
+        rng = np.random.default_rng(0)
+        self.npts = npts
+        self.trace_names = trace_names
+        self.traces = {name: rng.normal(size=2 * npts)
+                       for name in trace_names}
+        self.format = 'ASC'
+        self.bytes_read = 0
+        self.writes = []
+        self._encoded = {}
+        self._out = bytearray()
+
+    def attach(self, instrument):
+        instrument.visa_handle.write = self.write
+        instrument.visa_handle.read = self.read
+        instrument.visa_handle.read_bytes = self.read_bytes
+        instrument.visa_handle.query = lambda cmd: (self.write(cmd),
+                                                    self.read())[1]
+
+    def write(self, cmd):
+        self.writes.append(cmd)
+        replies = []
+        for part in re.split(r';:?', cmd):
+            part = part.strip()
+            if part.startswith(('FORM ', 'FORM:DATA ')):
+                self.format = part.split(' ', 1)[1]
+            elif '?' in part:
+                replies.append(self._reply(part))
+        if replies:
+            self._out += b';'.join(replies) + b'\n'
+        return len(cmd), 0
+
+    def read(self):
+        end = self._out.index(b'\n') + 1
+        return self.read_bytes(end).decode().rstrip('\n')
+
+    def read_bytes(self, count):
+        data = bytes(self._out[:count])
+        del self._out[:count]
+        self.bytes_read += len(data)
+        return data
+
+    def _reply(self, query):
+        match = re.fullmatch(r"CALC:DATA:TRAC\? '(\w+)', \w+", query)
+        if match is not None:
+            name = match.group(1)
+        elif query == 'TRAC? TRACE1':
+            name = 'Trc1'
+        else:
+            catalog = ','.join(f'{n + 1},{name}'
+                               for n, name in enumerate(self.trace_names))
+            return {'CONFigure:TRACe:CATalog?': f"'{catalog}'",
+                    'CONF:CHAN1:STAT?': '1',
+                    'AVER:COUN?': '1',
+                    'CALC:FORM?': 'MLOG'}[query].encode()
+
+        data = self.traces[name]
+        if query.endswith('FDAT') or query.startswith('TRAC?'):
+            data = data[:self.npts]
+        key = (query, self.format)
+        if key not in self._encoded:
+            if self.format.startswith('REAL'):
+                raw = data.astype('<f4').tobytes()
+                length = str(len(raw)).encode()
+                self._encoded[key] = (b'#' + str(len(length)).encode()
+                                      + length + raw)
+            else:
+                self._encoded[key] = ','.join(
+                    f'{v:.12e}' for v in data).encode()
+        return self._encoded[key]
+
+
+@pytest.fixture(scope="function")
+def vna_emulator():
+    instrument = ZVL13(
+        "zvl13_sim", "TCPIP::192.168.0.1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:ZVL13.yaml")
+    emulator = ZVLEmulator(instrument.npts())
+    emulator.attach(instrument)
+    yield instrument, emulator
+
+    instrument.close()
+
+
+def test_binary_trace_matches_ascii(vna_emulator):
+    vna, emulator = vna_emulator
+    ascii_trace = vna.trace.get()
+
+    vna.binary_transfer(True)
+    binary_trace = vna.trace.get()
+
+    assert emulator.format == 'REAL,32'
+    assert binary_trace.dtype == np.float64
+    np.testing.assert_allclose(binary_trace, ascii_trace, rtol=1e-6)
+    np.testing.assert_allclose(binary_trace,
+                               emulator.traces['Trc1'][:emulator.npts],
+                               rtol=1e-6)
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_get_traces_single_query(vna_emulator, binary):
+    vna, emulator = vna_emulator
+    vna.binary_transfer(binary)
+    emulator.writes.clear()
+
+    data = vna.get_traces(force_polar=True)
+
+    trace_queries = [cmd for cmd in emulator.writes if 'CALC:DATA' in cmd]
+    assert len(trace_queries) == 1
+    assert data.dtype.names == ('Trc1', 'Trc2')
+    assert data.shape == (emulator.npts,)
+    expected = emulator.traces['Trc2']
+    np.testing.assert_allclose(data['Trc2'],
+                               expected[0::2] + 1j * expected[1::2],
+                               rtol=1e-6)
+
+
+def test_binary_transfer_reads_fewer_bytes(vna_emulator):
+    """
+    Bytes on the wire of a 10k point complex sweep, in both formats.
+    """
+    vna, emulator = vna_emulator
+    npts = 10001
+    vna.npts.cache.set(npts)
+    emulator.npts = npts
+    emulator.traces = {name: np.random.default_rng(1).normal(size=2 * npts)
+                       for name in emulator.trace_names}
+
+    results = {}
+    for binary in (False, True):
+        vna.binary_transfer(binary)
+        # fill the reply cache of the emulator
+        vna.get_traces(force_polar=True)
+        emulator.bytes_read = 0
+        data = vna.get_traces(force_polar=True)
+        results[binary] = (emulator.bytes_read, data)
+
+    assert results[True][0] < results[False][0] / 4
+    for name in ('Trc1', 'Trc2'):
+        np.testing.assert_allclose(results[True][1][name],
+                                   results[False][1][name], rtol=1e-6)
@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Shamrock import SR750
+
+SHAMROCK_SUCCESS = 20202
+
+
+class FakeShamrockDLL:
+    """
+    Stand-in for ShamrockCIF.dll. The calibration is a linear dispersion
+    around the center wavelength, which is negative for the first pixels.
+    """
+
+    def __init__(self):
+        self.grating = 1
+        self.wavelength = 0.0
+        self.number_pixels = 0
+        self.pixel_width = 0.0
+        self.calls = {}
+
+    def __getattr__(self, name):
+        # functions that only return a status code
+        return lambda *args: self._count(name)
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        return SHAMROCK_SUCCESS
+
+    def ShamrockGetSerialNumber(self, device, serial):
+        serial.value = b'SR-1234'
+        return SHAMROCK_SUCCESS
+
+    def ShamrockGetNumberGratings(self, device, number):
+        number._obj.value = 3
+        return SHAMROCK_SUCCESS
+
+    def ShamrockGetGrating(self, device, grating):
+        grating._obj.value = self.grating
+        return SHAMROCK_SUCCESS
+
+    def ShamrockSetGrating(self, device, grating):
+        self.grating = grating.value
+        return SHAMROCK_SUCCESS
+
+    def ShamrockGetWavelengthLimits(self, device, grating, c_min, c_max):
+        c_min._obj.value = 0.0
+        c_max._obj.value = 1500.0
+        return SHAMROCK_SUCCESS
+
+    def ShamrockGetWavelength(self, device, wavelength):
+        wavelength._obj.value = self.wavelength
+        return SHAMROCK_SUCCESS
+
+    def ShamrockSetWavelength(self, device, wavelength):
+        self.wavelength = wavelength.value
+        return SHAMROCK_SUCCESS
+
+    def ShamrockSetNumberPixels(self, device, number_pixels):
+        self.number_pixels = number_pixels.value
+        return SHAMROCK_SUCCESS
+
+    def ShamrockSetPixelWidth(self, device, width):
+        self.pixel_width = width.value
+        return SHAMROCK_SUCCESS
+
+    def ShamrockGetCalibration(self, device, calibration, number_pixels):
+        self._count('ShamrockGetCalibration')
+        pixels = np.arange(number_pixels.value) - number_pixels.value // 2
+        values = self.wavelength + 0.1 * self.grating * pixels
+        calibration[:] = values.astype(np.float32).tolist()
+        return SHAMROCK_SUCCESS
+
+
+@pytest.fixture(scope="function")
+def spectrometer(monkeypatch):
+    dll = FakeShamrockDLL()
+    shamrock_cif = SR750.ShamrockCIF
+
+    def fake_shamrock_cif(dll_path=None):
+        wrapper = shamrock_cif.__new__(shamrock_cif)
+        wrapper.dll = dll
+        wrapper.verbose = False
+        return wrapper
+
+    monkeypatch.setattr(SR750, "ShamrockCIF", fake_shamrock_cif)
+    instrument = SR750.Shamrock_SR750("shamrock_sim", ccd_number_pixels=512)
+    yield instrument
+
+    instrument.close()
+
+
+def calibration_reads(spectrometer):
+    return spectrometer.ShamrockCIF.dll.calls.get('ShamrockGetCalibration', 0)
+
+
+def test_calibration_array(spectrometer):
+    spectrometer.wavelength.set(10)
+    calibration = spectrometer.calibration.get()
+
+    assert isinstance(calibration, np.ndarray)
+    assert calibration.shape == (512,)
+    # negative wavelengths are clipped
+    assert calibration[0] == 0.0
+    assert calibration[-1] == pytest.approx(10 + 0.1 * 255)
+    assert np.all(calibration >= 0)
+
+
+def test_calibration_is_memoized(spectrometer):
+    spectrometer.wavelength.set(500)
+    first = spectrometer.calibration.get()
+    second = spectrometer.calibration.get()
+
+    assert second is first
+    assert calibration_reads(spectrometer) == 1
+    with pytest.raises(ValueError):
+        first[0] = 0.0
+
+
+@pytest.mark.parametrize("name, value", [('grating', 2),
+                                         ('wavelength', 600),
+                                         ('ccd_number_pixels', 1024),
+                                         ('ccd_pixel_width', 13)])
+def test_calibration_follows_settings(spectrometer, name, value):
+    spectrometer.wavelength.set(500)
+    spectrometer.calibration.get()
+
+    spectrometer.parameters[name].set(value)
+    calibration = spectrometer.calibration.get()
+
+    assert calibration_reads(spectrometer) == 2
+    assert calibration.shape == (spectrometer.ccd_number_pixels.get_latest(),)
+
+    # setting the same value again keeps the calibration
+    spectrometer.parameters[name].set(value)
+    spectrometer.calibration.get()
+    assert calibration_reads(spectrometer) == 2
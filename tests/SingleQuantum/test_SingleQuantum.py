@@ -0,0 +1,100 @@
+import threading
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.SingleQuantum import SingleQuantum
+from qcodes_contrib_drivers.drivers.SingleQuantum.SingleQuantum import SQCounts
+
+
+class FakeSocket:
+    """
+    Stand-in for the TCP socket of the counts port, the tests feed the
+    packets to SQCounts._handle_data directly.
+    """
+
+    def __init__(self, *args):
+        self.address = None
+
+    def connect(self, address):
+        self.address = address
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(scope="function")
+def counts(monkeypatch):
+    monkeypatch.setattr(SingleQuantum.socket, "socket", FakeSocket)
+    sq_counts = SQCounts(CNTS_BUFFER=4)
+    yield sq_counts
+
+    sq_counts.close()
+
+
+def lines(start, stop):
+    return b''.join(b'%d,%d,%d\n' % (t, 10 * t, 100 * t)
+                    for t in range(start, stop))
+
+
+def test_get_latest_before_first_line(counts):
+    assert counts.get_latest(0).shape == (0, 0)
+    with pytest.raises(ValueError):
+        counts.get_latest(1)
+
+
+def test_handle_data_lines_split_over_packets(counts):
+    data = lines(0, 3)
+    counts._handle_data(data[:5])
+    assert counts.n == 0
+    counts._handle_data(data[5:12])
+    counts._handle_data(data[12:])
+
+    np.testing.assert_array_equal(
+        counts.get_latest(3),
+        [[0, 0, 0], [1, 10, 100], [2, 20, 200]])
+    assert counts.statistics()['dropped'] == 0
+
+
+def test_store_drops_invalid_lines(counts):
+    counts._store(b'0,1,2')
+    counts._store(b'1,x,2')
+    counts._store(b'1,2')
+
+    assert counts.n == 1
+    assert counts.dropped == 2
+
+
+def test_ring_buffer_wraparound(counts):
+    counts._handle_data(lines(0, 7))
+
+    latest = counts.get_latest(4)
+    # a contiguous view of the ring buffer, oldest line first
+    assert np.shares_memory(latest, counts.cnts)
+    np.testing.assert_array_equal(latest[:, 0], [3, 4, 5, 6])
+    np.testing.assert_array_equal(counts.get_latest(2)[:, 2], [500, 600])
+    with pytest.raises(ValueError):
+        counts.get_latest(5)
+
+
+def test_get_n_timeout(counts):
+    counts._handle_data(lines(0, 2))
+
+    with pytest.raises(TimeoutError, match="0 of 1"):
+        counts.get_n(1, timeout=0.01)
+
+
+@pytest.mark.parametrize("n", [-1, 5])
+def test_get_n_out_of_range(counts, n):
+    # must raise at once instead of waiting for lines that never fit
+    with pytest.raises(ValueError, match="CNTS_BUFFER=4"):
+        counts.get_n(n)
+
+
+def test_get_n_waits_for_new_lines(counts):
+    counts._handle_data(lines(0, 2))
+    timer = threading.Timer(0.01, counts._handle_data, (lines(2, 5),))
+    timer.start()
+
+    np.testing.assert_array_equal(counts.get_n(3, timeout=5)[:, 0], [2, 3, 4])
+    timer.join()
@@ -0,0 +1,134 @@
+import re
+
+import pytest
+
+from qcodes_contrib_drivers.drivers.StanfordResearchSystems import SIM928
+from qcodes_contrib_drivers.drivers.StanfordResearchSystems.SIM928 import \
+    SIM928 as SIM928Instrument
+
+
+class FakeClock:
+    """
+    Replaces the time module of the driver, sleeping advances the clock
+    instead of waiting.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+class FakeSIM900:
+    """
+    Emulates the SIM900 mainframe forwarding the commands to the voltage
+    sources in its slots. Every write is recorded.
+    """
+
+    def __init__(self, slots):
+        self.volts = {slot: 0.0 for slot in slots}
+        self.messages = []
+        self._replies = {}
+
+    def attach(self, instrument):
+        instrument.visa_handle.write = self.write
+        instrument.visa_handle.query = self.query
+        instrument.visa_handle.read = lambda: ''
+
+    def write(self, message):
+        self.messages.append(message)
+        for cmd in message.split(';'):
+            slot, module_cmd = re.fullmatch(r'SNDT (\d),"(.*)"', cmd).groups()
+            slot = int(slot)
+            if module_cmd == 'VOLT?':
+                self._replies[slot] = f'{self.volts[slot]:.3f}'
+            elif module_cmd.startswith('VOLT '):
+                self.volts[slot] = float(module_cmd[5:])
+        return len(message), 0
+
+    def query(self, message):
+        slot = int(re.fullmatch(r'GETN\? (\d),128', message).group(1))
+        reply = self._replies.pop(slot)
+        return f'#3{len(reply):03d}{reply}'
+
+
+@pytest.fixture(scope="function")
+def sim928(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(SIM928, "time", clock)
+    instrument = SIM928Instrument(
+        "sim928_sim", "GPIB::1::INSTR", slot_names={1: 'gate', 2: 'bias'},
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:SIM928.yaml")
+    mainframe = FakeSIM900(instrument.modules)
+    mainframe.attach(instrument)
+    clock.sleeps.clear()
+    yield instrument, mainframe, clock
+
+    instrument.close()
+
+
+def test_modules_found(sim928):
+    sim928, mainframe, clock = sim928
+
+    assert sim928.modules == [1, 2]
+    assert 'volt_gate' in sim928.parameters
+    assert 'volt_bias_step' in sim928.parameters
+
+
+def test_set_voltages_single_write(sim928):
+    sim928, mainframe, clock = sim928
+
+    sim928.set_voltages({1: 0.5, 'bias': -1.25})
+
+    assert mainframe.messages == ['SNDT 1,"VOLT 0.500";SNDT 2,"VOLT -1.250"']
+    assert mainframe.volts == {1: 0.5, 2: -1.25}
+    assert sim928.volt_gate.cache.get(get_if_invalid=False) == 0.5
+    assert sim928.volt_bias.cache.get(get_if_invalid=False) == -1.25
+    with pytest.raises(KeyError):
+        sim928.set_voltages({3: 0})
+
+
+def test_set_smooth_batches_steps(sim928):
+    sim928, mainframe, clock = sim928
+
+    sim928.set_smooth({'gate': 0.02, 'bias': -0.01})
+
+    # the start voltages are read, then one write per step
+    assert mainframe.messages == [
+        'SNDT 1,"VOLT?"',
+        'SNDT 2,"VOLT?"',
+        'SNDT 1,"VOLT 0.005";SNDT 2,"VOLT -0.005"',
+        'SNDT 1,"VOLT 0.010";SNDT 2,"VOLT -0.010"',
+        'SNDT 1,"VOLT 0.015"',
+        'SNDT 1,"VOLT 0.020"',
+    ]
+    assert mainframe.volts == {1: 0.02, 2: -0.01}
+    assert sim928.volt_gate.cache.get(get_if_invalid=False) == 0.02
+    assert sim928.volt_bias.cache.get(get_if_invalid=False) == -0.01
+    # 100 ms for each answer of a module, one timestep after each step
+    assert clock.sleeps == pytest.approx([0.1] * 2 + [0.05] * 4)
+
+
+def test_set_smooth_paced_by_timeline(sim928, monkeypatch):
+    sim928, mainframe, clock = sim928
+    write = mainframe.write
+
+    def slow_write(message):
+        # every write takes 20 ms
+        clock.now += 0.02
+        return write(message)
+
+    monkeypatch.setattr(sim928.visa_handle, "write", slow_write)
+    sim928.smooth_timestep(0.05)
+
+    sim928.set_smooth({'gate': 0.02})
+
+    # the time spent writing does not add to the ramp duration
+    assert clock.sleeps == pytest.approx([0.1] + [0.03] * 4)
+    assert mainframe.volts[1] == 0.02
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Tektronix.AFG3000 import AFG3000
+
+
+class MockVisaHandle:
+    """
+    Records the commands and the binary blocks written by the driver.
+    """
+
+    def __init__(self):
+        self.writes = []
+        self.bytes_written = 0
+
+    def attach(self, instrument):
+        instrument.visa_handle.write = self.write
+        instrument.visa_handle.write_binary_values = self.write_binary_values
+
+    def write(self, cmd):
+        self.writes.append(cmd)
+        return len(cmd), 0
+
+    def write_binary_values(self, message, values, datatype, is_big_endian,
+                            header_fmt):
+        self.writes.append(message)
+        self.bytes_written += 2 * len(values)
+        return len(values), 0
+
+
+@pytest.fixture(scope="function")
+def afg(mocker):
+    # the initial snapshot queries every parameter, which the sim does not
+    # implement
+    mocker.patch.object(AFG3000, 'snapshot')
+    instrument = AFG3000(
+        "afg_sim", "GPIB::1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:Tektronix_AFG3000.yaml")
+    handle = MockVisaHandle()
+    handle.attach(instrument)
+    yield instrument, handle
+
+    instrument.close()
+
+
+def waveforms(count, points=1000):
+    phases = np.linspace(0, 1, count, endpoint=False)
+    t = np.linspace(0, 1, points)
+    return [0.5 + 0.5 * np.sin(2 * np.pi * (t + phase)) for phase in phases]
+
+
+def test_repeated_upload_is_skipped(afg):
+    afg, handle = afg
+    sine, = waveforms(1)
+
+    afg.upload_waveform(sine, 2)
+    afg.upload_waveform(list(sine), 2)
+
+    assert handle.writes == ['DATA:DEFINE EMEM,1000', 'DATA:DATA EMEM,',
+                             'DATA:COPY USER2,EMEM']
+    assert afg.waveform_cache_statistics == {'hits': 1, 'misses': 1,
+                                             'bytes_saved': 2000}
+
+    # same data to another memory, or other data to the same memory
+    afg.upload_waveform(sine, 3)
+    afg.upload_waveform(1 - sine, 2)
+    assert handle.bytes_written == 6000
+
+
+def test_load_waveform_selects_cached_memory(afg):
+    afg, handle = afg
+    sine, cosine = waveforms(2)
+
+    assert afg.load_waveform(sine) == 1
+    assert afg.load_waveform(cosine, source=2) == 2
+    handle.writes.clear()
+
+    assert afg.load_waveform(sine, source=1) == 1
+    assert handle.writes == ['SOURce1:FUNCtion:SHAPe USER1']
+    assert afg.function_shape1.cache() == 'USER1'
+
+
+def test_least_recently_used_memory_is_replaced(afg):
+    afg, handle = afg
+    shapes = waveforms(5)
+
+    for shape in shapes[:4]:
+        afg.load_waveform(shape)
+    # USER1 is used again, so USER2 is the least recently used
+    assert afg.load_waveform(shapes[0]) == 1
+    assert afg.load_waveform(shapes[4]) == 2
+    assert afg.load_waveform(shapes[1]) == 3
+    assert afg.waveform_cache_statistics['misses'] == 6
+
+    afg.clear_waveform_cache()
+    assert afg.load_waveform(shapes[4]) == 1
+    assert afg.waveform_cache_statistics['misses'] == 7
+
+
+def test_memories_in_use_are_not_replaced(afg):
+    afg, handle = afg
+    shapes = waveforms(7)
+
+    assert afg.load_waveform(shapes[0], source=1) == 1
+    for shape in shapes[1:4]:
+        afg.load_waveform(shape)
+    # USER1 is the least recently used, but source 1 outputs it
+    assert afg.load_waveform(shapes[4], source=2) == 2
+    assert afg.load_waveform(shapes[5]) == 3
+    # a source may replace the memory it outputs itself
+    assert afg.load_waveform(shapes[6], source=2) == 4
+    assert afg.load_waveform(shapes[1], source=2) == 2
+
+    # USER is short for USER1
+    afg.function_shape1('USER')
+    afg.function_shape2('USER3')
+    assert {afg.load_waveform(shape) for shape in shapes[2:5]} == {2, 4}
+
+
+def test_invalid_waveform(afg):
+    afg, handle = afg
+
+    with pytest.raises(ValueError):
+        afg.load_waveform([0.5, 1.5])
+    with pytest.raises(ValueError):
+        afg.upload_waveform([0.5, 0.5], 5)
+    assert handle.writes == []
@@ -0,0 +1,75 @@
+import struct
+
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers.Tektronix.FCA3100 import FCA3100
+
+
+@pytest.fixture(scope="function")
+def fca(mocker):
+    instrument = FCA3100(
+        "fca_sim", "GPIB::1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:Tektronix_FCA3100.yaml")
+    # write, query and query_binary_values of the resource
+    commands = [mocker.spy(instrument.visa_handle, method)
+                for method in ('write', 'query', 'query_binary_values')]
+    yield instrument, commands
+
+    instrument.close()
+
+
+def test_time_array_ascii_blocks(fca):
+    fca, _ = fca
+    assert fca.data_format() == 'ASCII'
+    fca.samples_per_read(2)
+    fca.samples_number(4)
+
+    data = fca.time_array()
+
+    np.testing.assert_array_equal(data, [1.1e-8, 1.9e-8, 1.1e-8, 1.9e-8])
+
+
+def test_time_array_real(fca):
+    fca, commands = fca
+    fca.data_format('REAL')
+    fca.samples_number(3)
+
+    data = fca.time_array()
+
+    expected = [struct.unpack('>d', raw)[0]
+                for raw in (b'>ABCDEFG', b'>BCDEFGH', b'>CDEFGHI')]
+    np.testing.assert_array_equal(data, expected)
+    assert commands[2].call_count == 1
+
+
+def test_time_array_packed_not_supported(fca):
+    fca, commands = fca
+    # set on the front panel or by another program
+    fca.write('FORMat PACKed')
+    assert fca.data_format() == 'PACKED'
+
+    with pytest.raises(ValueError, match="PACKED data format"):
+        fca.time_array()
+    assert not any(call.args[0].startswith('ARM')
+                   for call in commands[0].call_args_list)
+
+
+@pytest.mark.parametrize('data_format', ['ASCII', 'REAL'])
+def test_timestats_read_as_ascii(fca, data_format):
+    fca, commands = fca
+    fca.data_format(data_format)
+    for spy in commands:
+        spy.reset_mock()
+
+    assert fca.timestats() == (1.5e-8, 2e-9, 1.1e-8, 1.9e-8)
+
+    queries = [call.args[0] for call in commands[1].call_args_list]
+    assert 'CALCulate:AVERage:ALL?' in queries
+    formats = [call.args[0] for call in commands[0].call_args_list
+               if call.args[0].startswith('FORMat')]
+    if data_format == 'REAL':
+        assert formats == ['FORMat ASCII', 'FORMat REAL']
+    else:
+        assert formats == []
+    assert fca.data_format() == data_format
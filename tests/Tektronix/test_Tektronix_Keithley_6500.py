@@ -0,0 +1,45 @@
+import pytest
+
+from qcodes_contrib_drivers.drivers.Tektronix.Keithley_6500 import Keithley_6500
+
+
+@pytest.fixture(scope="function")
+def dmm(mocker):
+    instrument = Keithley_6500(
+        "dmm_sim", "GPIB::1::INSTR",
+        pyvisa_sim_file="qcodes_contrib_drivers.sims:Keithley_6500.yaml")
+    # query writes through write as well
+    write = mocker.spy(instrument.visa_handle, "write")
+    yield instrument, write
+
+    instrument.close()
+
+
+def test_scan(dmm):
+    dmm, write = dmm
+
+    dmm.configure_scan({3: 'volt', 2: 'RES', 1: 'VOLT'})
+    readings = dmm.scan()
+
+    assert [call.args[0] for call in write.call_args_list] == [
+        "SENS:FUNC 'VOLT', (@1,3)",
+        "SENS:FUNC 'RES', (@2)",
+        "ROUT:SCAN:CRE (@1,2,3)",
+        "ROUT:SCAN:COUN:SCAN 1",
+        "ROUTe:TERMinals?",
+        "TRAC:CLE",
+        'INIT;*WAI;:TRAC:DATA? 1, 3, "defbuffer1", READ',
+    ]
+    assert readings == (1.5e-3, 1.2e3, -2e-4)
+    assert dmm.scan.names == ('ch1', 'ch2', 'ch3')
+    assert dmm.scan.units == ('V', 'Ohm', 'V')
+
+
+def test_scan_requires_scan_list(dmm):
+    dmm, write = dmm
+
+    with pytest.raises(RuntimeError, match="configure_scan"):
+        dmm.scan()
+    with pytest.raises(ValueError):
+        dmm.configure_scan({1: 'TEMP'})
+    assert write.call_count == 0
@@ -0,0 +1,107 @@
+import pytest
+
+from qcodes_contrib_drivers.drivers.Vaunix.LDA import Vaunix_LDA
+
+SERIAL_NUMBER = 55102
+NUM_CHANNELS = 4
+
+
+class FakeLdaDLL:
+    """
+    Stand-in for VNX_atten64.dll emulating a 4 channel LDA. Attenuations
+    are stored per channel and act on the selected channel.
+    """
+
+    def __init__(self):
+        self.channel = 1
+        self.attenuation = {ch: 0 for ch in range(1, NUM_CHANNELS + 1)}
+        self.set_channel_calls = 0
+
+    def __getattr__(self, name):
+        # getters and setters of settings that are not emulated
+        return lambda *args: 0
+
+    def fnLDA_GetNumDevices(self):
+        return 1
+
+    def fnLDA_GetDevInfo(self, device_refs):
+        device_refs[0] = 1
+
+    def fnLDA_GetSerialNumber(self, ref):
+        return SERIAL_NUMBER
+
+    def fnLDA_GetNumChannels(self, ref):
+        return NUM_CHANNELS
+
+    def fnLDA_GetMaxAttenuationHR(self, ref):
+        return 2000
+
+    def fnLDA_GetModelNameA(self, ref, buf):
+        buf.value = b"LDA-802Q"
+
+    def fnLDA_SetChannel(self, ref, channel):
+        self.set_channel_calls += 1
+        self.channel = channel
+        return 0
+
+    def fnLDA_GetAttenuationHR(self, ref):
+        return self.attenuation[self.channel]
+
+    def fnLDA_SetAttenuationHR(self, ref, value):
+        self.attenuation[self.channel] = value
+        return 0
+
+
+@pytest.fixture(scope="function")
+def lda(monkeypatch):
+    dll = FakeLdaDLL()
+    monkeypatch.setattr(Vaunix_LDA, "_get_dll",
+                        lambda self, dll_path=None: dll)
+    instrument = Vaunix_LDA("lda_sim", serial_number=SERIAL_NUMBER)
+    yield instrument
+
+    instrument.close()
+
+
+def test_attenuation_per_channel(lda):
+    lda.ch2.attenuation(10.5)
+    lda.ch3.attenuation(20)
+    assert lda.ch2.attenuation() == 10.5
+    assert lda.ch3.attenuation() == 20
+    assert lda.dll.attenuation == {1: 0, 2: 210, 3: 400, 4: 0}
+
+
+def test_channel_switched_only_when_needed(lda):
+    calls = lda.dll.set_channel_calls
+    lda.ch2.attenuation(1)
+    lda.ch2.attenuation()
+    lda.ch2.ramp_start()
+    assert lda.dll.set_channel_calls == calls + 1
+
+
+def test_snapshot_switches_once_per_channel(lda):
+    lda.dll.set_channel_calls = 0
+    lda.snapshot(update=True)
+    assert lda.dll.set_channel_calls <= NUM_CHANNELS
+
+
+def test_set_attenuations_orders_switches(lda):
+    lda.ch3.attenuation(5)
+    lda.dll.set_channel_calls = 0
+
+    lda.set_attenuations({1: 1.0, "ch3": 3.0, 4: 4.0})
+
+    assert lda.dll.set_channel_calls == 2
+    assert lda.dll.channel in (1, 4)
+    assert lda.dll.attenuation == {1: 20, 2: 0, 3: 60, 4: 80}
+    assert lda.ch3.attenuation.get_latest() == 3.0
+
+
+def test_unknown_channel_number(lda):
+    lda.ch2.attenuation(1)
+    with pytest.raises(KeyError, match="no channel 5"):
+        lda.select_channel(5)
+    with pytest.raises(KeyError, match="no channel 0"):
+        lda.set_attenuations({1: 1.0, 0: 2.0})
+    assert lda.dll.channel == 2
+    assert lda.dll.attenuation[1] == 0
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from qcodes_contrib_drivers.drivers._ieee_block import (read_ieee_block,
+                                                        read_real32_blocks)
+
+
+class FakeHandle:
+
+    def __init__(self, data, read_termination):
+        self.data = bytearray(data)
+        self.read_termination = read_termination
+
+    def read_bytes(self, count):
+        chunk = bytes(self.data[:count])
+        del self.data[:count]
+        return chunk
+
+
+def block(values):
+    raw = np.asarray(values, dtype='<f4').tobytes()
+    length = str(len(raw)).encode()
+    return b'#' + str(len(length)).encode() + length + raw
+
+
+@pytest.mark.parametrize('termination', ['\n', '\r\n'])
+def test_terminator_is_consumed(termination):
+    term = termination.encode()
+    handle = FakeHandle(block([1.0, 2.5]) + b';' + block([10.0]) + term
+                        + b'next', termination)
+
+    first, second = read_real32_blocks(handle, 2)
+
+    assert first.tolist() == [1.0, 2.5]
+    assert second.tolist() == [10.0]
+    # the reply to the next query is not shifted
+    assert bytes(handle.data) == b'next'
+
+
+def test_data_equal_to_terminator():
+    raw = b'\n\r\n\n'
+    handle = FakeHandle(b'#14' + raw + b'\r\n', '\r\n')
+
+    assert read_ieee_block(handle) == raw
+    assert handle.data == b''
+
+
+def test_not_a_block():
+    with pytest.raises(ValueError):
+        read_ieee_block(FakeHandle(b'1.0,2.0\n', '\n'))
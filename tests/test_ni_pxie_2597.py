@@ -191,3 +191,44 @@ def test_parameters(pxie_2597,
             assert instr.channel() is None
             assert instr.channels.com.connections() == []
             assert ch.connections() == []
+
+
+def test_apply_routes(pxie_2597, mocker):
+    instr = pxie_2597
+    com = instr.channels.com
+    instr.disconnect_all()
+
+    instr.apply_routes([("com", "ch2")])
+    assert com.connections() == ["ch2"]
+
+    connect = mocker.spy(niswitch.Session, "connect")
+    disconnect = mocker.spy(niswitch.Session, "disconnect")
+    instr.apply_routes([(instr.channels.ch4, com)])
+    assert com.connections() == ["ch4"]
+    assert instr.channels.ch2.connections() == []
+    assert connect.call_count == 1
+    assert disconnect.call_count == 1
+
+    # routes that already exist are left untouched
+    instr.apply_routes([("ch4", "com")])
+    assert connect.call_count == 1
+    assert disconnect.call_count == 1
+
+    instr.apply_routes([])
+    assert com.connections() == []
+
+
+def test_connections_are_cached(pxie_2597, mocker):
+    instr = pxie_2597
+    instr.disconnect_all()
+    instr.channels.com.connect_to(instr.channels.ch1)
+
+    can_connect = mocker.spy(niswitch.Session, "can_connect")
+    for ch in instr.channels:
+        ch.connections()
+    assert can_connect.call_count == 0
+
+    instr.invalidate_connections()
+    assert instr.channels.ch1.connections() == ["com"]
+    n = len(instr.channels)
+    assert can_connect.call_count == n * (n - 1) // 2
@@ -0,0 +1,52 @@
+import pytest
+
+from qcodes_contrib_drivers.drivers._ramp_monitor import RampMonitor
+
+
+class FakeRamp:
+    """
+    Linear ramp from 0 to target which advances only while sleeping.
+    """
+
+    def __init__(self, target, rate):
+        self.target = target
+        self.rate = rate
+        self.value = 0.0
+        self.sleeps = []
+
+    def read_state(self):
+        return self.value, self.value != self.target
+
+    def sleep(self, interval):
+        self.sleeps.append(interval)
+        self.value = min(self.value + self.rate * interval, self.target)
+
+
+def test_polls_dense_only_near_target():
+    ramp = FakeRamp(target=1.0, rate=1e-3)
+    monitor = RampMonitor(ramp.read_state, rate=1e-3, min_interval=0.2,
+                          max_interval=3600, sleep=ramp.sleep)
+
+    assert monitor.wait(1.0) == 1.0
+    # a ramp of 1000 s with a fixed interval of 0.2 s would take 5000 polls
+    assert monitor.polls < 100
+    assert ramp.sleeps[0] == pytest.approx(900)
+    assert min(ramp.sleeps) == 0.2
+
+
+def test_max_interval():
+    ramp = FakeRamp(target=1.0, rate=1e-3)
+    monitor = RampMonitor(ramp.read_state, rate=lambda: 1e-3,
+                          max_interval=60, sleep=ramp.sleep)
+
+    monitor.wait(1.0)
+    assert max(ramp.sleeps) == 60
+
+
+def test_tolerance_and_timeout():
+    monitor = RampMonitor(lambda: (0.5, False), rate=0.1, tolerance=0.01,
+                          min_interval=0.01, sleep=lambda interval: None)
+
+    assert monitor.wait(0.505) == 0.5
+    with pytest.raises(TimeoutError):
+        monitor.wait(1.0, timeout=0.05)